@@ -0,0 +1,37 @@
+"""Add full-text search vector to memo
+
+Revision ID: 3b9d41c7e5a2
+Revises: 80e2d79e2ea9
+Create Date: 2025-06-04 14:27:05.902113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9d41c7e5a2'
+down_revision: Union[str, None] = '80e2d79e2ea9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # title/content 로부터 자동 계산되는 검색 컬럼 + GIN 인덱스 (PostgreSQL 전용)
+    # 애플리케이션 시작 시(service/search.py)에도 같은 DDL 을 실행하므로 이미 있으면 건너뜀
+    op.execute(
+        "ALTER TABLE memo ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        "GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(content, '')), 'B')) STORED"
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_memo_search_vector ON memo USING GIN (search_vector)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS ix_memo_search_vector")
+    op.execute("ALTER TABLE memo DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,28 @@
+"""Add (user_id, id) index to memo
+
+Revision ID: 80e2d79e2ea9
+Revises: cf6cc35efcb1
+Create Date: 2025-06-02 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '80e2d79e2ea9'
+down_revision: Union[str, None] = 'cf6cc35efcb1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_memo_user_id_id', 'memo', ['user_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_memo_user_id_id', table_name='memo')
@@ -0,0 +1,31 @@
+"""Add ON DELETE CASCADE to memo.user_id
+
+Revision ID: 9c4e2b7d1f36
+Revises: 5d1f0a7c3e84
+Create Date: 2025-06-09 16:03:22.518904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4e2b7d1f36'
+down_revision: Union[str, None] = '5d1f0a7c3e84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 사용자 삭제 시 DB 에서 메모도 함께 삭제 (기존 외래 키는 이름 없이 생성되어 PostgreSQL 기본 이름 사용)
+    op.drop_constraint('memo_user_id_fkey', 'memo', type_='foreignkey')
+    op.create_foreign_key('memo_user_id_fkey', 'memo', 'users', ['user_id'], ['id'], ondelete='CASCADE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('memo_user_id_fkey', 'memo', type_='foreignkey')
+    op.create_foreign_key('memo_user_id_fkey', 'memo', 'users', ['user_id'], ['id'])
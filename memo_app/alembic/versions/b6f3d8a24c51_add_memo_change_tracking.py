@@ -0,0 +1,44 @@
+"""Add memo change tracking columns
+
+Revision ID: b6f3d8a24c51
+Revises: e2a7c5f90b13
+Create Date: 2025-06-13 15:21:09.640127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6f3d8a24c51'
+down_revision: Union[str, None] = 'e2a7c5f90b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('memo', sa.Column('created_at', sa.DateTime(), nullable=True))
+    op.add_column('memo', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.add_column('memo', sa.Column('change_seq', sa.BigInteger(), nullable=True))
+    op.add_column('users', sa.Column('memo_seq', sa.BigInteger(), server_default='0', nullable=False))
+
+    # 기존 메모: 생성/수정 시각은 마이그레이션 시각, 변경 번호는 메모 ID 로 채움
+    op.execute("UPDATE memo SET created_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP, change_seq = id")
+    op.execute("UPDATE users SET memo_seq = COALESCE((SELECT MAX(memo.change_seq) FROM memo WHERE memo.user_id = users.id), 0)")
+
+    op.alter_column('memo', 'created_at', existing_type=sa.DateTime(), nullable=False)
+    op.alter_column('memo', 'updated_at', existing_type=sa.DateTime(), nullable=False)
+    op.alter_column('memo', 'change_seq', existing_type=sa.BigInteger(), nullable=False)
+    op.create_index('ix_memo_user_id_change_seq', 'memo', ['user_id', 'change_seq'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_memo_user_id_change_seq', table_name='memo')
+    op.drop_column('users', 'memo_seq')
+    op.drop_column('memo', 'change_seq')
+    op.drop_column('memo', 'updated_at')
+    op.drop_column('memo', 'created_at')
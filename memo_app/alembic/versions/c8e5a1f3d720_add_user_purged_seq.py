@@ -0,0 +1,31 @@
+"""Add users.purged_seq for change feed expiry
+
+Revision ID: c8e5a1f3d720
+Revises: f4c81d2a6e57
+Create Date: 2025-06-20 11:08:52.413906
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8e5a1f3d720'
+down_revision: Union[str, None] = 'f4c81d2a6e57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('purged_seq', sa.BigInteger(), server_default='0', nullable=False))
+
+    # 이전에 영구 삭제된 메모는 기록이 없으므로, 기존 커서는 한 번 전체를 다시 동기화하도록 현재 번호로 채움
+    op.execute("UPDATE users SET purged_seq = memo_seq")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'purged_seq')
@@ -0,0 +1,40 @@
+"""Add deleted_at to users and memo
+
+Revision ID: e2a7c5f90b13
+Revises: 9c4e2b7d1f36
+Create Date: 2025-06-11 11:48:30.274615
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a7c5f90b13'
+down_revision: Union[str, None] = '9c4e2b7d1f36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    op.add_column('memo', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    # 삭제되지 않은 메모 조회용 부분 인덱스 + 영구 삭제 대상 조회용 부분 인덱스
+    op.create_index('ix_memo_user_id_id_live', 'memo', ['user_id', 'id'], unique=False,
+                    postgresql_where=sa.text('deleted_at IS NULL'))
+    op.create_index('ix_memo_deleted_at', 'memo', ['deleted_at'], unique=False,
+                    postgresql_where=sa.text('deleted_at IS NOT NULL'))
+    op.create_index('ix_users_deleted_at', 'users', ['deleted_at'], unique=False,
+                    postgresql_where=sa.text('deleted_at IS NOT NULL'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_deleted_at', table_name='users')
+    op.drop_index('ix_memo_deleted_at', table_name='memo')
+    op.drop_index('ix_memo_user_id_id_live', table_name='memo')
+    op.drop_column('memo', 'deleted_at')
+    op.drop_column('users', 'deleted_at')
@@ -0,0 +1,28 @@
+"""Add memo version column
+
+Revision ID: f4c81d2a6e57
+Revises: b6f3d8a24c51
+Create Date: 2025-06-16 10:42:37.218504
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4c81d2a6e57'
+down_revision: Union[str, None] = 'b6f3d8a24c51'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('memo', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('memo', 'version')
@@ -2,15 +2,14 @@ from fastapi import FastAPI, Request, Depends, HTTPException, APIRouter, Backgro
 from sqlalchemy.orm import Session
 from models import User, Memo # 모델 import
 from schemas import UserCreate, UserLogin, MemoCreate, MemoUpdate # 스키마 import
-from dependencies import get_db, get_password_hash, verify_password # 의존성 import
-from fastapi.templating import Jinja2Templates
+from dependencies import get_sync_db as get_db, get_password_hash, verify_password # 의존성 import (레거시 동기 컨트롤러)
 import re
 from email_service import EmailService, EmailServiceBye
 import logging
 from fastapi.responses import RedirectResponse
+from service.templates import templates # 애플리케이션 전역 템플릿
 
 router = APIRouter()
-templates = Jinja2Templates(directory="templates")
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
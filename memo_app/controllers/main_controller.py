@@ -1,8 +1,7 @@
-from fastapi.templating import Jinja2Templates
 from fastapi import FastAPI, Request, Depends, APIRouter
+from service.templates import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="templates")
 
 # 라우트
 @router.get('/')
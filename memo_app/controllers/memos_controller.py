@@ -1,140 +1,410 @@
-from fastapi import Request, Depends, HTTPException, APIRouter
-from sqlalchemy.orm import Session
-from models import User, Memo # 모델 import
-from schemas import MemoCreate, MemoUpdate # 스키마 import
+from fastapi import Request, Response, Depends, HTTPException, APIRouter
+from fastapi.responses import StreamingResponse, HTMLResponse
+from datetime import date
+from sqlalchemy import select, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import User, Memo, utcnow # 모델 import
+from schemas import MemoCreate, MemoUpdate, MemoResponse, MemoPage, MemoBatchRequest, MemoBatchResponse, MemoImportResult, MemoChanges # 스키마 import
 from dependencies import get_db
-from fastapi.templating import Jinja2Templates
+from database import AsyncSessionLocal
+from service.pagination import clamp_limit, encode_cursor, decode_cursor, cursor_id
+from service.search import search_memos
+from service.purge import retention_cutoff
+from service.memo_batch import apply_memo_batch
+from service.memo_export import export_memos, gzip_stream, EXPORT_MEDIA_TYPES
+from service.memo_import import import_memos
+from service.change_feed import reserve_change_seq, fetch_changes, memo_change
+from service.memo_events import memo_events, change_event, RESYNC_EVENT
+from service.etag import memo_etag, parse_if_match, precondition_failed
+from service.user_cache import user_cache, session_cache_key
+from service.templates import templates
+from functools import partial
 import logging
 
 router = APIRouter()
-templates = Jinja2Templates(directory="templates")
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# 사용자 조회
-def get_current_user(request: Request, db: Session) -> User | None:
-    user_id = request.session.get("id")
-    social_id = request.session.get("social_id")
-    provider = request.session.get("provider")
+# 사용자 조회 (캐시 우선, 없으면 DB 조회 후 캐시에 저장)
+async def get_current_user(request: Request, db: AsyncSession) -> User | None:
+    key = session_cache_key(request.session)
+    if key is None:
+        return None
 
-    if user_id:
-        return db.query(User).filter(User.id == user_id).first()
+    user = user_cache.get(key)
+    if user is not None:
+        return user
 
-    if social_id and provider:
-        if provider == "google":
-            return db.query(User).filter(User.google_id == social_id).first()
-        elif provider == "kakao":
-            return db.query(User).filter(User.kakao_id == social_id).first()
-        elif provider == "naver":
-            return db.query(User).filter(User.naver_id == social_id).first()
+    kind, value = key
+    query = select(User).where(User.deleted_at.is_(None))  # 탈퇴한 사용자 제외
+    if kind == "id":
+        user = await db.scalar(query.where(User.id == value))
+    elif kind == "google":
+        user = await db.scalar(query.where(User.google_id == value))
+    elif kind == "kakao":
+        user = await db.scalar(query.where(User.kakao_id == value))
+    elif kind == "naver":
+        user = await db.scalar(query.where(User.naver_id == value))
 
-    return None
+    if user is not None:
+        db.expunge(user)  # 다른 요청의 세션과 공유되지 않도록 분리 후 캐시
+        user_cache.set(key, user)
+
+    return user
 
 # 인증된 사용자
-def get_authenticated_user(request: Request, db: Session = Depends(get_db)) -> User:
-    user = get_current_user(request, db)
+async def get_authenticated_user(request: Request, db: AsyncSession = Depends(get_db)) -> User:
+    user = await get_current_user(request, db)
     if user is None:
         raise HTTPException(status_code=401, detail="Not Authorized")
     return user
 
+# HTML 조각 응답을 원하는 요청 (Accept: text/html)
+def wants_html(request: Request) -> bool:
+    return "text/html" in request.headers.get("accept", "")
+
+# 메모 카드 HTML 조각 (memos.html 과 같은 매크로로 렌더링, 전체 페이지 대신 바뀐 카드만 전송)
+def render_memo_cards(*memos) -> str:
+    memo_card = templates.get_template("_memo_macros.html").module.memo_card
+    return "".join(str(memo_card(memo)) for memo in memos)
+
+# 커서 기반 메모 페이지 조회 ((user_id, id) 부분 인덱스 사용, 삭제된 메모 제외)
+# before 커서가 주어지면 이전 페이지, 아니면 after 커서 이후의 다음 페이지 조회
+async def fetch_memo_page(db: AsyncSession, user_id: int, after: str | None = None, before: str | None = None, limit: int | None = None) -> MemoPage:
+    limit = clamp_limit(limit)
+    query = select(Memo).where(Memo.user_id == user_id, Memo.deleted_at.is_(None))
+
+    if before:
+        query = query.where(Memo.id < cursor_id(before)).order_by(Memo.id.desc())
+    else:
+        if after:
+            query = query.where(Memo.id > cursor_id(after))
+        query = query.order_by(Memo.id.asc())
+
+    # 한 건 더 조회하여 다음 페이지 존재 여부 확인
+    rows = (await db.scalars(query.limit(limit + 1))).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if before:
+        rows.reverse()
+
+    items = [MemoResponse.model_validate(memo) for memo in rows]
+    next_cursor = prev_cursor = None
+    if items:
+        if has_more or before:
+            next_cursor = encode_cursor({"id": items[-1].id})
+        if (has_more and before) or after:
+            prev_cursor = encode_cursor({"id": items[0].id})
+
+    return MemoPage(items=items, next_cursor=next_cursor, prev_cursor=prev_cursor)
+
 # 메모 생성
 @router.post("/memos")
-async def create_memo(memo: MemoCreate, user: User = Depends(get_authenticated_user), db:Session = Depends(get_db)):
+async def create_memo(request: Request, memo: MemoCreate, response: Response, user: User = Depends(get_authenticated_user), db: AsyncSession = Depends(get_db)):
     # 입력 데이터 유효성 검사
     if not memo.title or not memo.content:
         logger.warning("메모 제목 또는 내용이 빈 값입니다.")
         raise HTTPException(status_code=400, detail="Title and content must not be empty")
     
-    new_memo = Memo(user_id=user.id, title = memo.title, content = memo.content)
-    db.add(new_memo)
-    
     try:
-        db.commit()
-        db.refresh(new_memo)
+        # INSERT ... RETURNING 으로 생성된 행을 바로 받음 (commit 후 다시 조회하지 않음)
+        new_memo = await db.scalar(
+            insert(Memo)
+            .values(user_id=user.id, title=memo.title, content=memo.content, change_seq=await reserve_change_seq(db, user.id)) # 변경 번호 발급
+            .returning(Memo)
+        )
+        await db.commit()
+        await memo_events.publish(user.id, memo_change(new_memo)) # 다른 탭/기기에 알림
         logger.info(f"사용자 {user.username}가 새 메모를 생성했습니다: {new_memo.title}")
     except Exception as e:
         logger.error(f"메모 생성 중 오류 발생: {e}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail="메모 생성 실패")
     
-    # 새로 생성된 사용자 정보 반환
+    # 새로 생성된 사용자 정보 반환 (Accept: text/html 이면 메모 카드 HTML 조각)
+    if wants_html(request):
+        return HTMLResponse(render_memo_cards(new_memo), headers={"ETag": memo_etag(new_memo.version)})
+    response.headers["ETag"] = memo_etag(new_memo.version)
     return new_memo
 
+# 메모 일괄 생성/수정/삭제 (한 번의 요청, 한 트랜잭션)
+@router.post("/memos/batch", response_model=MemoBatchResponse)
+async def batch_memos(batch: MemoBatchRequest, user: User = Depends(get_authenticated_user), db: AsyncSession = Depends(get_db)):
+    try:
+        results = await apply_memo_batch(db, user.id, batch.operations)
+        await db.commit()
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"메모 일괄 작업 중 오류 발생: {e}")
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="메모 일괄 작업 실패")
+
+    # 적용된 메모의 변경 내역 알림 (일괄 UPDATE 는 RETURNING 을 지원하지 않아 한 번의 SELECT 로 조회)
+    changed_ids = [result.id for result in results if result.status in (200, 201)]
+    if changed_ids:
+        changed = (await db.scalars(select(Memo).where(Memo.id.in_(changed_ids)).order_by(Memo.change_seq))).all()
+        await memo_events.publish(user.id, *map(memo_change, changed))
+
+    logger.info(f"사용자 {user.username}가 메모 일괄 작업을 요청했습니다: {len(results)}건")
+    return MemoBatchResponse(results=results)
+
 # 메모 조회
 @router.get("/memos")
-async def list_memos(request: Request, db: Session = Depends(get_db)):
-    user = get_current_user(request, db)
+async def list_memos(request: Request, db: AsyncSession = Depends(get_db)):
+    user = await get_current_user(request, db)
 
     if user is None:
         logger.warning("메모 조회 실패: 인증되지 않은 사용자")
         raise HTTPException(status_code=401, detail="Not Authorized")
     
-    memos = db.query(Memo).filter(Memo.user_id == user.id).all()   
+    # 첫 페이지만 렌더링, 이후 페이지는 /memos/page 로 무한 스크롤
+    page = await fetch_memo_page(db, user.id)
     logger.info(f"사용자 {user.username}의 메모를 조회했습니다.")
 
-    # 리스트 내포 사용하여 전체 정보 반환
     return templates.TemplateResponse("memos.html", {
         "request": request, 
-        "memos": memos,
+        "memos": page.items,
+        "next_cursor": page.next_cursor,
         "username": user.username, # 사용자 이름 추가
         "user_info": user # 사용자 정보
         }) 
 
+# 메모 페이지 조회 (무한 스크롤용 JSON)
+@router.get("/memos/page", response_model=MemoPage)
+async def list_memos_page(after: str | None = None, before: str | None = None, limit: int | None = None,
+                          user: User = Depends(get_authenticated_user), db: AsyncSession = Depends(get_db)):
+    return await fetch_memo_page(db, user.id, after=after, before=before, limit=limit)
+
+# 메모 페이지 조회 (무한 스크롤용 HTML 조각), 다음/이전 페이지 커서는 응답 헤더로 전달
+@router.get("/memos/page/fragment", response_class=HTMLResponse)
+async def list_memos_page_fragment(after: str | None = None, before: str | None = None, limit: int | None = None,
+                                   user: User = Depends(get_authenticated_user), db: AsyncSession = Depends(get_db)):
+    page = await fetch_memo_page(db, user.id, after=after, before=before, limit=limit)
+    headers = {}
+    if page.next_cursor:
+        headers["X-Next-Cursor"] = page.next_cursor
+    if page.prev_cursor:
+        headers["X-Prev-Cursor"] = page.prev_cursor
+    return HTMLResponse(render_memo_cards(*page.items), headers=headers)
+
+# 메모 변경 내역 조회 (since 커서 이후 생성/수정/삭제된 메모만 반환)
+@router.get("/memos/changes", response_model=MemoChanges)
+async def list_memo_changes(since: str | None = None, limit: int | None = None,
+                            user: User = Depends(get_authenticated_user), db: AsyncSession = Depends(get_db)):
+    return await fetch_changes(db, user.id, since=since, limit=limit)
+
+# 재연결 시 놓친 변경 (SSE 메시지 목록), 스트림이 구독을 시작한 뒤 호출되며 조회가 끝나면 세션을 닫음
+async def missed_memo_events(user_id: int, last_seq: int) -> list[str]:
+    async with AsyncSessionLocal() as db:
+        try:
+            missed = await fetch_changes(db, user_id, since=encode_cursor({"seq": last_seq}))
+        except HTTPException as e:
+            if e.status_code != 410:
+                raise
+            return [RESYNC_EVENT] # 놓친 삭제가 이미 영구 삭제됨, 목록을 다시 불러옴
+    return [RESYNC_EVENT] if missed.has_more else [change_event(change) for change in missed.items]
+
+# 메모 실시간 알림 (Server-Sent Events), 생성/수정/삭제/복구 시 변경 내역 전송
+# 재연결 시 브라우저가 보내는 Last-Event-ID(마지막 change_seq) 이후의 변경을 먼저 전송
+# 연결이 오래 유지되므로 get_db 의존성을 쓰지 않고, 인증용 세션은 스트림 시작 전에 닫음
+@router.get("/memos/events")
+async def memo_event_stream(request: Request):
+    async with AsyncSessionLocal() as db:
+        user = await get_current_user(request, db)
+    if user is None:
+        raise HTTPException(status_code=401, detail="Not Authorized")
+
+    replay = None
+    last_event_id = request.headers.get("last-event-id", "")
+    if last_event_id.isdigit():
+        replay = partial(missed_memo_events, user.id, int(last_event_id))
+
+    return StreamingResponse(
+        memo_events.stream(user.id, replay),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}, # 프록시 버퍼링 방지
+    )
+
+# 메모 검색 (전문 검색 인덱스 사용, 관련도 순)
+# 관련도 순 정렬은 키셋 커서를 만들기 어려우므로 offset 커서 사용
+@router.get("/memos/search", response_model=MemoPage)
+async def search_memo(q: str, cursor: str | None = None, limit: int | None = None,
+                      user: User = Depends(get_authenticated_user), db: AsyncSession = Depends(get_db)):
+    limit = clamp_limit(limit)
+    offset = decode_cursor(cursor).get("offset", 0) if cursor else 0
+    if not isinstance(offset, int) or offset < 0:
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+
+    # 한 건 더 조회하여 다음 페이지 존재 여부 확인
+    rows = await search_memos(db, user.id, q, offset=offset, limit=limit + 1)
+    logger.info(f"사용자 {user.username}가 메모를 검색했습니다: {q}")
+
+    return MemoPage(
+        items=[MemoResponse.model_validate(memo) for memo in rows[:limit]],
+        next_cursor=encode_cursor({"offset": offset + limit}) if len(rows) > limit else None,
+        prev_cursor=encode_cursor({"offset": max(offset - limit, 0)}) if offset > 0 else None,
+    )
+
+# 메모 내보내기 (ndjson / csv / json, gzip=true 이면 압축 파일)
+@router.get("/memos/export")
+async def export_memo(format: str = "ndjson", gzip: bool = False, user: User = Depends(get_authenticated_user)):
+    if format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="지원하지 않는 형식입니다. (ndjson, csv, json)")
+
+    filename = f"memos-{date.today():%Y%m%d}.{format}"
+    body = export_memos(user.id, format)
+    media_type = EXPORT_MEDIA_TYPES[format]
+    if gzip:
+        body = gzip_stream(body)
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    logger.info(f"사용자 {user.username}가 메모를 내보냅니다: {filename}")
+    return StreamingResponse(body, media_type=media_type, headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+# 메모 가져오기 (요청 본문으로 NDJSON / CSV 업로드, Content-Encoding: gzip 지원)
+@router.post("/memos/import", response_model=MemoImportResult)
+async def import_memo(request: Request, format: str | None = None,
+                      user: User = Depends(get_authenticated_user), db: AsyncSession = Depends(get_db)):
+    # 형식을 지정하지 않으면 Content-Type 으로 판단
+    if format is None:
+        format = "csv" if "csv" in request.headers.get("content-type", "") else "ndjson"
+    if format not in ("ndjson", "csv"):
+        raise HTTPException(status_code=400, detail="지원하지 않는 형식입니다. (ndjson, csv)")
+    gzipped = request.headers.get("content-encoding", "").lower() == "gzip"
+
+    try:
+        result = await import_memos(db, user.id, request.stream(), format, gzipped=gzipped)
+        await db.commit()
+    except HTTPException:
+        await db.rollback()
+        raise
+    except Exception as e:
+        logger.error(f"메모 가져오기 중 오류 발생: {e}")
+        await db.rollback()
+        raise HTTPException(status_code=500, detail="메모 가져오기 실패")
+
+    if result.imported:
+        await memo_events.publish_resync(user.id) # 대량 추가: 열린 화면은 목록을 다시 불러옴
+    logger.info(f"사용자 {user.username}가 메모 {result.imported}개를 가져왔습니다.")
+    return result
+
+# 메모 한 건 조회 (HTML 조각), 다른 탭/기기에서 추가된 메모를 목록에 넣을 때 사용
+@router.get("/memos/{memo_id}/fragment", response_class=HTMLResponse)
+async def memo_fragment(memo_id: int, user: User = Depends(get_authenticated_user), db: AsyncSession = Depends(get_db)):
+    db_memo = await db.scalar(select(Memo).where(Memo.id == memo_id, Memo.user_id == user.id, Memo.deleted_at.is_(None)))
+    if db_memo is None:
+        raise HTTPException(status_code=404, detail="Memo를 찾을 수 없습니다.")
+    return HTMLResponse(render_memo_cards(db_memo), headers={"ETag": memo_etag(db_memo.version)})
+
 # 메모 수정
 @router.put("/memos/{memo_id}")
-async def update_memo(request:Request, memo_id: int, memo: MemoUpdate, db: Session = Depends(get_db)):
-    user = get_current_user(request, db)
+async def update_memo(request:Request, response: Response, memo_id: int, memo: MemoUpdate, db: AsyncSession = Depends(get_db)):
+    user = await get_current_user(request, db)
 
     if user is None:
         logger.warning("메모 수정 실패: 인증되지 않은 사용자")
         raise HTTPException(status_code=401, detail="Not Authorized")
-   
-    db_memo = db.query(Memo).filter(Memo.id == memo_id).first()
-    if db_memo is None:
-        logger.warning(f"메모 수정 실패: 메모 ID {memo_id}를 찾을 수 없습니다.")
-        return {"error": "User를 찾을 수 없습니다."}
-    
-    # 사용자 정보 업데이트
-    if memo.title is not None:
-        db_memo.title = memo.title
-    if memo.content is not None:
-        db_memo.content = memo.content
 
+    expected_version = parse_if_match(request.headers.get("if-match"))
+
+    # 수정할 값 (버전은 DB 에서 1 증가)
+    values = {field: getattr(memo, field) for field in ("title", "content") if getattr(memo, field) is not None}
+    conditions = [Memo.id == memo_id, Memo.user_id == user.id, Memo.deleted_at.is_(None)]
+    if expected_version is not None:
+        conditions.append(Memo.version == expected_version)
+
+    # 조건부 UPDATE ... RETURNING 한 번으로 확인과 수정 (행을 미리 읽거나 잠그지 않음)
     try:
-        db.commit()
-        db.refresh(db_memo)
+        values["change_seq"] = await reserve_change_seq(db, user.id) # 변경 번호 발급
+        db_memo = await db.scalar(
+            update(Memo).where(*conditions).values(**values, version=Memo.version + 1).returning(Memo)
+            .execution_options(synchronize_session=False)
+        )
+        if db_memo is None:
+            await db.rollback()
+            current_version = await db.scalar(select(Memo.version).where(*conditions[:3]))
+            if current_version is not None:
+                logger.warning(f"메모 수정 실패: 메모 ID {memo_id} 버전 불일치 (요청 {expected_version}, 현재 {current_version})")
+                raise precondition_failed(current_version)
+            logger.warning(f"메모 수정 실패: 메모 ID {memo_id}를 찾을 수 없습니다.")
+            return {"error": "User를 찾을 수 없습니다."}
+        await db.commit()
+        await memo_events.publish(user.id, memo_change(db_memo))
         logger.info(f"사용자 {user.username}가 메모 ID {memo_id}를 수정했습니다.")
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"메모 수정 중 오류 발생: {e}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail="메모 수정 실패")
-    
+
+    if wants_html(request):
+        return HTMLResponse(render_memo_cards(db_memo), headers={"ETag": memo_etag(db_memo.version)})
+    response.headers["ETag"] = memo_etag(db_memo.version)
     return db_memo
 
 # 메모 삭제
 @router.delete("/memos/{memo_id}")
-async def delete_memo(request:Request, memo_id: int, db: Session = Depends(get_db)):
-    user = get_current_user(request, db)
+async def delete_memo(request:Request, memo_id: int, db: AsyncSession = Depends(get_db)):
+    user = await get_current_user(request, db)
 
     if user is None:
         logger.warning("메모 삭제 실패: 인증되지 않은 사용자")
         raise HTTPException(status_code=401, detail="Not Authorized")
-    
-    db_memo = db.query(Memo).filter(Memo.id == memo_id, Memo.user_id == user.id).first()
-    if db_memo is None:
-        logger.warning(f"매모 삭제 실패: 메모 ID {memo_id}를 찾을 수 없습니다.")
-        return {"error": "Memo를 찾을 수 없습니다."}
-    
-    db.delete(db_memo)
-    
+
+    expected_version = parse_if_match(request.headers.get("if-match"))
+    conditions = [Memo.id == memo_id, Memo.user_id == user.id, Memo.deleted_at.is_(None)]
+    if expected_version is not None:
+        conditions.append(Memo.version == expected_version)
+
+    # 삭제 시각만 기록 (보관 기간 내 복구 가능, 이후 삭제 워커가 영구 삭제)
     try:
-        db.commit()
+        db_memo = await db.scalar(
+            update(Memo)
+            .where(*conditions)
+            .values(deleted_at=utcnow(), version=Memo.version + 1, change_seq=await reserve_change_seq(db, user.id))
+            .returning(Memo)
+            .execution_options(synchronize_session=False)
+        )
+        if db_memo is None:
+            await db.rollback()
+            current_version = await db.scalar(select(Memo.version).where(*conditions[:3]))
+            if current_version is not None:
+                logger.warning(f"메모 삭제 실패: 메모 ID {memo_id} 버전 불일치 (요청 {expected_version}, 현재 {current_version})")
+                raise precondition_failed(current_version)
+            logger.warning(f"매모 삭제 실패: 메모 ID {memo_id}를 찾을 수 없습니다.")
+            return {"error": "Memo를 찾을 수 없습니다."}
+        await db.commit()
+        await memo_events.publish(user.id, memo_change(db_memo))
         logger.info(f"사용자 {user.username}가 메모 ID {memo_id}를 삭제했습니다.")
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"메모 삭제 중 에러 발생: {e}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail="메모 삭제 실패")
     
-    return {"message": "Memo가 삭제되었습니다."}
\ No newline at end of file
+    return {"message": "Memo가 삭제되었습니다."}
+
+# 삭제한 메모 복구 (보관 기간 내)
+@router.post("/memos/{memo_id}/restore")
+async def restore_memo(memo_id: int, user: User = Depends(get_authenticated_user), db: AsyncSession = Depends(get_db)):
+    db_memo = await db.scalar(
+        update(Memo)
+        .where(Memo.id == memo_id, Memo.user_id == user.id, Memo.deleted_at >= retention_cutoff())
+        .values(deleted_at=None, version=Memo.version + 1, change_seq=await reserve_change_seq(db, user.id))
+        .returning(Memo)
+        .execution_options(synchronize_session=False)
+    )
+    if db_memo is None:
+        logger.warning(f"메모 복구 실패: 메모 ID {memo_id}를 복구할 수 없습니다.")
+        raise HTTPException(status_code=404, detail="복구할 수 있는 메모가 없습니다.")
+
+    await db.commit()
+    await memo_events.publish(user.id, memo_change(db_memo))
+    logger.info(f"사용자 {user.username}가 메모 ID {memo_id}를 복구했습니다.")
+    return {"message": "Memo가 복구되었습니다."}
@@ -1,19 +1,24 @@
 from fastapi import Request, Depends, HTTPException, APIRouter, BackgroundTasks
-from sqlalchemy.orm import Session
-from models import User, Memo # 모델 import
+from sqlalchemy import select, update, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import User, utcnow # 모델 import
 from schemas import UserCreate, UserLogin, UserUpdate # 스키마 import
-from dependencies import get_db, get_password_hash, verify_password # 의존성 import
-from fastapi.templating import Jinja2Templates
+from dependencies import get_db # 의존성 import
 import re
-from service.email_service import send_bye_email, send_welcome_email, send_username_email, generate_temp_pw, send_temp_pw_email, update_user_password, send_changed_pw_email
+from service.email_service import generate_temp_pw, update_user_password
+from service.outbox import enqueue_email
 import logging
 from service.email_class import EmailRequest, UsernameEmailRequest
-from passlib.context import CryptContext
+from service.password_service import password_hasher
+from service.rate_limit import rate_limiter
 from oauth.unlink_services import social_unlink_task
+from service.user_cache import user_cache
+from service.purge import retention_cutoff, restore_deleted_user
+from service.upsert import insert_if_absent, insert_or_update
 
 
 router = APIRouter()
-templates = Jinja2Templates(directory="templates")
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -30,7 +35,7 @@ password_regex = re.compile(r"""
 
 # 회원 가입
 @router.post("/signup")
-async def signup(signup_data: UserCreate, background_tasks: BackgroundTasks, db: Session=Depends(get_db)):
+async def signup(signup_data: UserCreate, db: AsyncSession=Depends(get_db)):
     logger.info(f"회원 가입 요청: 사용자 이름 {signup_data.username}, 이메일: {signup_data.email}")
 
     # ID 규칙 확인: 영어 소문자와 숫자만 허용
@@ -48,35 +53,40 @@ async def signup(signup_data: UserCreate, background_tasks: BackgroundTasks, db:
         logger.warning("비밀번호가 일치하지 않습니다.")
         raise HTTPException(status_code=400, detail="비밀번호가 서로 일치하지 않습니다.")
     
-    # username 중복 확인
-    existing_user = db.query(User).filter(User.username == signup_data.username).first()
-    if existing_user:
-        logger.warning(f"회원 가입 실패: 이미 존재하는 사용자 이름: {signup_data.username}")
-        raise HTTPException(status_code=400, detail="이미 존재하는 사용자 이름 입니다.")
-    
     # 모든 조건 만족 시
-    hashed_password = get_password_hash(signup_data.password) # 비밀번호 해시 기능
-    new_user = User(username=signup_data.username, email=signup_data.email, hashed_password=hashed_password)
-    db.add(new_user)
-    logger.info(f"{new_user.username} 사용자가 데이터베이스에 추가 되었습니다.")
-    
+    hashed_password = await password_hasher.hash(signup_data.password) # 비밀번호 해시 기능 (전용 스레드 풀)
+
+    # username 중복 확인 + 사용자 추가를 한 문장으로 (INSERT ... ON CONFLICT DO NOTHING RETURNING)
     try:
-        db.commit()
-        logger.info("데이터베이스에 새로운 사용자가 추가되었습니다.")
+        new_user_id = await insert_if_absent(
+            db, User,
+            {"username": signup_data.username, "email": signup_data.email, "hashed_password": hashed_password},
+            index_elements=[User.username], returning=User.id,
+        )
+        if new_user_id is None:
+            await db.rollback()
+            logger.warning(f"회원 가입 실패: 이미 존재하는 사용자 이름: {signup_data.username}")
+            raise HTTPException(status_code=400, detail="이미 존재하는 사용자 이름 입니다.")
+        enqueue_email(db, "welcome", signup_data.email) # 환영 이메일 (사용자 추가와 같은 트랜잭션으로 저장)
+        await db.commit()
+        logger.info(f"{signup_data.username} 사용자가 데이터베이스에 추가 되었습니다.")
+    except HTTPException:
+        raise
+    except IntegrityError:
+        # username 외의 유일 제약 위반 (이메일 중복)
+        await db.rollback()
+        logger.warning(f"회원 가입 실패: 이미 사용 중인 이메일: {signup_data.email}")
+        raise HTTPException(status_code=400, detail="이미 사용 중인 이메일 입니다.")
     except Exception as e:
-        db.rollback() # 에러 발생 시 롤백
+        await db.rollback() # 에러 발생 시 롤백
         logger.error(f"회원 가입 오류: {e}") # 에러 내용 출력
         raise HTTPException(status_code=500, detail="회원 가입 실패. 다시 시도해 주세요.")
-    db.refresh(new_user)
-
-    # 백그라운드 작업 등록
-    background_tasks.add_task(send_welcome_email, new_user.email)
-    logger.info(f"회원가입 후 사용자 {new_user.username}에게 환영 이메일 발송")
+    logger.info(f"회원가입 후 사용자 {signup_data.username}에게 환영 이메일 발송 예약")
 
     return {"message": "회원가입을 성공하였습니다. 이메일을 확인해 주세요."}
 
 # 소셜 로그인 후 사용자 정보 처리
-def create_or_update_social_user(db: Session, user_info: dict, provider: str, request: Request, access_token: str):
+async def create_or_update_social_user(db: AsyncSession, user_info: dict, provider: str, request: Request, access_token: str):
     logger.info(f"소셜 로그인 처리 시작: 제공자 {provider}, 사용자 정보 {user_info}")
 
     # provider 별로 ID 및 이름 필드 설정
@@ -93,37 +103,37 @@ def create_or_update_social_user(db: Session, user_info: dict, provider: str, re
         logger.error("이메일 또는 소셜 ID가 제공되지 않았습니다.")
         raise ValueError('email 또는 소셜 ID가 제공되지 않았습니다.')
     
-    # 기존 사용자 조회: 소셜 ID 우선, 없으면 이메일 검색 (선택사항)
-    user = db.query(User).filter(getattr(User, social_id_field) == social_id_value).first()
-    if not user:
-        user = db.query(User).filter(User.email == user_info['email']).first()
-
-    if not user:
-        # 신규 사용자 생성
-        user = User(
-            username=user_info.get('username'),
-            email=user_info['email'],
-        )
-        setattr(user, social_id_field, social_id_value)
-        db.add(user)
-        logger.info(f"신규 사용자 생성: {user_info['email']} (소셜 ID: {social_id_value})")
-    else:
-        # 기존 사용자 정보 업데이트
-        user.username = user_name or user.username  # 이름이 없으면 업데이트 하지 않음
-        user.email = user_info['email'] # 이메일 업데이트
-        setattr(user, social_id_field, social_id_value)
-        db.merge(user)  # 업데이트 후 세션에 반영
-        logger.info(f"기존 사용자 업데이트: {user.email} (소셜 ID: {social_id_value})")
+    social_id_column = getattr(User, social_id_field)
+    # 기존 사용자 정보 업데이트 값 (이름이 없으면 업데이트 하지 않음, 탈퇴 후 보관 기간 내 다시 로그인한 경우 계정 복구)
+    changes = {
+        "username": func.coalesce(user_name, User.username),
+        "email": user_info['email'],
+        "deleted_at": None,
+    }
     try:
-        db.commit()
+        # 1. 소셜 ID 로 연동된 사용자 업데이트 (UPDATE ... RETURNING, 재로그인은 이 한 문장으로 처리)
+        user = await db.scalar(
+            update(User).where(social_id_column == social_id_value).values(**changes).returning(User)
+            .execution_options(synchronize_session=False)
+        )
+        if user is None:
+            # 2. 없으면 신규 생성, 같은 이메일의 사용자가 있으면 소셜 ID 연동 (INSERT ... ON CONFLICT (email) DO UPDATE RETURNING)
+            user = await insert_or_update(
+                db, User,
+                {"username": user_info.get('username'), "email": user_info['email'], social_id_field: social_id_value},
+                index_elements=[User.email], set_={**changes, social_id_field: social_id_value}, returning=User,
+            )
+            logger.info(f"신규 사용자 생성 또는 이메일로 소셜 계정 연동: {user_info['email']} (소셜 ID: {social_id_value})")
+        else:
+            logger.info(f"기존 사용자 업데이트: {user.email} (소셜 ID: {social_id_value})")
+        await db.commit()
+        user_cache.invalidate(user.id) # 소셜 계정 연동 정보 변경 반영
         logger.info(f"사용자 정보 저장 성공: {user.email}")
     except Exception as e:
-        db.rollback() # 에러 발생 시 롤백
+        await db.rollback() # 에러 발생 시 롤백
         logger.error(f"사용자 정보 저장 실패: {e}")
         raise HTTPException(status_code=500, detail="사용자 정보를 저장하는 중 오류가 발생했습니다.")
 
-    db.refresh(user)
-
     # 사용자 정보 저장 후 세션에 사용자 정보 저장
     request.session['id'] = user.id
     request.session['username'] = user.username
@@ -135,16 +145,34 @@ def create_or_update_social_user(db: Session, user_info: dict, provider: str, re
 
 # 로그인
 @router.post("/login")
-async def login(request: Request, signin_data: UserLogin, db: Session=Depends(get_db)):
+async def login(request: Request, signin_data: UserLogin, db: AsyncSession=Depends(get_db)):
     logger.info(f"로그인 시도: 사용자 이름 {signin_data.username}")
+    await rate_limiter.check(request, "login", signin_data.username) # 비밀번호 검증 전 요청 제한
 
-    user = db.query(User).filter(User.username == signin_data.username).first()
+    user = await db.scalar(select(User).where(User.username == signin_data.username))
 
     if not user:
         logger.warning(f"로그인 실패: 사용자 {signin_data.username}이 존재하지 않음.")
         raise HTTPException(status_code=401, detail="사용자가 존재하지 않습니다.")  # 사용자 존재하지 않음
 
-    if user and verify_password(signin_data.password, user.hashed_password):
+    verified, new_hash = await password_hasher.verify_and_update(signin_data.password, user.hashed_password)
+    if verified:
+        # 해시 설정이 바뀐 경우 새 설정으로 저장 (실패해도 로그인은 진행)
+        if new_hash:
+            user.hashed_password = new_hash
+            try:
+                await db.commit()
+                user_cache.invalidate(user.id)
+                logger.info(f"사용자 {user.username}의 비밀번호 해시를 새 설정으로 갱신했습니다.")
+            except Exception as e:
+                await db.rollback()
+                logger.warning(f"비밀번호 해시 갱신 실패: {e}")
+
+        # 탈퇴 처리된 계정 (보관 기간 내 /users/restore 로 복구 가능)
+        if user.deleted_at is not None:
+            logger.warning(f"로그인 실패: 사용자 {user.username}은 탈퇴 처리된 계정입니다.")
+            raise HTTPException(status_code=403, detail="탈퇴 처리된 계정입니다. 계정 복구 후 로그인해 주세요.")
+
         request.session["username"] = user.username
         request.session["id"] = user.id
         logger.info(f"사용자 {user.username} 로그인 성공")
@@ -155,62 +183,60 @@ async def login(request: Request, signin_data: UserLogin, db: Session=Depends(ge
 
 # 아이디 찾기 (이메일로 발송)
 @router.post("/send-username")
-async def find_id(req: EmailRequest, db:Session=Depends(get_db)):
+async def find_id(request: Request, req: EmailRequest, db: AsyncSession=Depends(get_db)):
     email = req.email
     logger.info(f"사용자 이름 요청: 이메일 {email}")
+    await rate_limiter.check(request, "send-username", email) # 이메일 발송 전 요청 제한
 
-    user = db.query(User).filter(User.email == email).first()
+    user = await db.scalar(select(User).where(User.email == email, User.deleted_at.is_(None)))
 
     if user is None:
         logger.warning(f"사용자 이름 요청 실패: 해당 이메일로 등록된 사용자가 없습니다. 이메일: {email}")
         raise HTTPException(status_code=404, detail="해당 이메일로 등록된 사용자가 없습니다.")
     
-    # 사용자 이름 이메일 발송
+    # 사용자 이름 이메일 발송 예약 (발송 워커가 전송)
     try:
-        send_username_email(email=email, username=user.username)
-        logger.info(f"사용자 이름 {user.username}을 {email}로 성공적으로 전송했습니다.")
+        enqueue_email(db, "find_id", email, username=user.username)
+        await db.commit()
+        logger.info(f"사용자 이름 {user.username}을 {email}로 발송 예약했습니다.")
     except Exception as e:
-        logger.error(f"이메일 전송 실패: {e}")
+        await db.rollback()
+        logger.error(f"이메일 발송 예약 실패: {e}")
         raise HTTPException(status_code=500, detail="이메일 전송에 실패했습니다. 다시 시도해 주세요")
     
     return {"success": True, "message": "사용자 이름이 이메일로 발송되었습니다."}
 
 # 임시 비밀번호 이메일 발송
 @router.post("/reset-password")
-async def reset_password(req: UsernameEmailRequest, db: Session = Depends(get_db)):
+async def reset_password(request: Request, req: UsernameEmailRequest, db: AsyncSession = Depends(get_db)):
     username = req.username
     email = req.email
     logger.info(f"비밀번호 재설정 요청: 아이디 {username}, 이메일 {email}")
+    await rate_limiter.check(request, "reset-password", email) # 비밀번호 해시, 이메일 발송 전 요청 제한
 
-    user = db.query(User).filter(User.username ==  username, User.email == email).first()
-
-    if user is None:
-        logger.warning(f"비밀번호 재설정 실패: 일치하는 정보가 없습니다. 아이디: {username}, 이메일:{email}")
-        raise HTTPException(status_code=404, detail="일치하는 정보가 없습니다.")
-    
     # 임시비밀번호 생성 및 DB 업데이트
     temp_password = generate_temp_pw() # 임시 비밀번호 생성
 
-    # 비밀번호 DB 업데이트
+    # 사용자 확인 + 비밀번호 DB 업데이트를 한 문장으로, 임시비밀번호 이메일 발송 예약 (같은 트랜잭션)
     try:
-        update_user_password(db, user, temp_password)
+        enqueue_email(db, "temp_pw", email, username=username, temp_password=temp_password)
+        user = await update_user_password(db, temp_password, User.username == username, User.email == email, User.deleted_at.is_(None))
+    except HTTPException:
+        raise
     except:
-        logger.error(f"사용자 ID {user.username}에 대한 비밀번호 업데이트에 실패하였습니다.")
+        logger.error(f"사용자 ID {username}에 대한 비밀번호 업데이트에 실패하였습니다.")
         raise HTTPException(status_code=500, detail="비밀번호 업데이트에 실패하였습니다.")
+
+    if user is None:
+        logger.warning(f"비밀번호 재설정 실패: 일치하는 정보가 없습니다. 아이디: {username}, 이메일:{email}")
+        raise HTTPException(status_code=404, detail="일치하는 정보가 없습니다.")
    
-    # 임시비밀번호 이메일 발송
-    try:
-        send_temp_pw_email(email=email, username=username, temp_password=temp_password)
-        logger.info(f"임시 비밀번호를 {email}로 성공적으로 전송했습니다.")
-    except Exception as e:
-        logger.error(f"이메일 전송 실패: {e}")
-        raise HTTPException(status_code=500, detail="이메일 전송에 실패했습니다. 다시 시도해 주세요")
-    
+    logger.info(f"임시 비밀번호를 {email}로 발송 예약했습니다.")
     return {"success": True, "message": "임시비밀번호가 이메일로 발송되었습니다."}
 
 # 비밀번호 변경
 @router.put("/change_pw")
-async def update_password(req: UserUpdate, db: Session = Depends(get_db)):
+async def update_password(req: UserUpdate, db: AsyncSession = Depends(get_db)):
     username = req.username
     current_password = req.current_password  # 현재 비밀번호
     new_password = req.new_password  # 새로운 비밀번호
@@ -218,15 +244,14 @@ async def update_password(req: UserUpdate, db: Session = Depends(get_db)):
 
     logger.info(f"비밀번호 변경 요청: 아이디 {username}")
 
-    user = db.query(User).filter(User.username == username).first()
+    user = await db.scalar(select(User).where(User.username == username, User.deleted_at.is_(None)))
 
     if user is None:
         logger.warning(f"비밀번호 변경 실패: 사용자 ID {username}가 존재하지 않습니다.")
         raise HTTPException(status_code=404, detail="사용자가 존재하지 않습니다.")
 
     # 현재 비밀번호 확인
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-    if not pwd_context.verify(current_password, user.hashed_password):
+    if not await password_hasher.verify(current_password, user.hashed_password):
         logger.warning(f"비밀번호 변경 실패: 현재 비밀번호가 일치하지 않습니다.")
         raise HTTPException(status_code=403, detail="현재 비밀번호가 일치하지 않습니다.")
     
@@ -245,22 +270,17 @@ async def update_password(req: UserUpdate, db: Session = Depends(get_db)):
         logger.warning("비밀번호 변경 실패: 비밀번호 규칙 위반.")
         raise HTTPException(status_code=400, detail="비밀번호는 최소 10자 이상이며, 대문자, 소문자, 숫자 및 특수문자가 포함되어야 합니다.")
 
-    # 비밀번호 업데이트 처리
-    update_user_password(db, user, new_password)  # 기존 함수를 호출하여 비밀번호 업데이트
+    # 비밀번호 업데이트 처리 + 비밀번호 변경 안내 이메일 발송 예약 (같은 트랜잭션)
+    enqueue_email(db, "changed_pw", user.email, username=username)
+    await update_user_password(db, new_password, User.id == user.id)  # 기존 함수를 호출하여 비밀번호 업데이트
 
-    # 비밀번호 변경 안내 이메일 발송
-    try:
-        send_changed_pw_email(email=user.email, username=username)
-        logger.info(f"비밀번호 변경 안내 이메일을 {user.email}로 성공적으로 전송했습니다.")
-    except Exception as e:
-        logger.error(f"이메일 전송 실패: {e}")
-        raise HTTPException(status_code=500, detail="이메일 전송에 실패했습니다. 다시 시도해 주세요")
+    logger.info(f"비밀번호 변경 안내 이메일을 {user.email}로 발송 예약했습니다.")
 
     return {"success": True, "message": "비밀번호가 성공적으로 변경되었습니다."}
 
 # 회원 탈퇴
 @router.delete("/users/{id}")
-async def delete_user(request: Request, id: int, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+async def delete_user(request: Request, id: int, background_tasks: BackgroundTasks, db: AsyncSession = Depends(get_db)):
     logger.info(f"회원 탈퇴 요청: 사용자 ID {id}")
 
     user_id = request.session.get("id") # 사용자 ID
@@ -272,58 +292,81 @@ async def delete_user(request: Request, id: int, background_tasks: BackgroundTas
         raise HTTPException(status_code=401, detail="Not Authorized")
 
     # 사용자를 user_id 또는 social_id로 조회
-    user_query = db.query(User)
+    user_query = select(User)
 
     if user_id is not None:
-        user_query = user_query.filter(User.id == user_id)
+        user_query = user_query.where(User.id == user_id)
 
     if social_id is not None:
         if provider == "google":
-            user_query = user_query.filter(User.google_id == social_id)
+            user_query = user_query.where(User.google_id == social_id)
         elif provider == "kakao":
-            user_query = user_query.filter(User.kakao_id == social_id)
+            user_query = user_query.where(User.kakao_id == social_id)
         elif provider == "naver":
-            user_query = user_query.filter(User.naver_id == social_id)
+            user_query = user_query.where(User.naver_id == social_id)
         else:
             logger.warning("지원하지 않는 소셜 로그인 제공자입니다.")
             raise HTTPException(status_code=403, detail="Unsupported Social Provider")
 
-    user = user_query.first()
+    user = await db.scalar(user_query.where(User.deleted_at.is_(None)))
 
     if user is None:
         logger.error(f"사용자 찾기 실패: ID {user_id} 또는 {social_id}에 대한 사용자가 존재하지 않음.")
         raise HTTPException(status_code=404, detail="User를 찾을 수 없습니다.")
 
-    # 사용자가 작성한 모든 메모 삭제
-    memos = db.query(Memo).filter(Memo.user_id == user_id).all()
-    logger.info(f"{len(memos)}개의 메모를 삭제합니다.")
-    for memo in memos:
-        db.delete(memo)
-
-    # 사용자 정보 삭제
-    db.delete(user)
-
     try:
-        db.commit()
+        # 탈퇴 시각만 기록 (보관 기간 내 복구 가능, 이후 삭제 워커가 사용자와 메모를 영구 삭제)
+        # + 탈퇴 안내 이메일 발송 예약 (같은 트랜잭션)
+        user.deleted_at = utcnow()
+        enqueue_email(db, "bye", user.email)
+        await db.commit()
+        user_cache.invalidate(user.id) # 삭제된 사용자 캐시 제거
         
         # 소셜 로그인 연동 해제
         access_token = request.session.get("access_token")
         if access_token and provider:
             background_tasks.add_task(social_unlink_task, provider, access_token)
-        logger.info(f"사용자 ID {user_id}가 성공적으로 삭제되었습니다.")
+        logger.info(f"사용자 ID {user.id}가 성공적으로 삭제되었습니다.")
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"회원 탈퇴 오류: {e}")  # 에러 내용 출력
         raise HTTPException(status_code=500, detail="회원 탈퇴에 실패하였습니다. 다시 시도해 주세요.")
 
     # 세션 비우기
     request.session.clear()
 
-    # 탈퇴 안내 이메일 발송
-    background_tasks.add_task(send_bye_email, user.email)
-
     # 탈퇴 성공 응답 리턴
-    logger.info(f"회원 탈퇴 완료: 사용자 ID {user_id}에게 탈퇴 안내 이메일 발송")
+    logger.info(f"회원 탈퇴 완료: 사용자 ID {user_id}에게 탈퇴 안내 이메일 발송 예약")
     return {"success": True, "message": "회원 탈퇴가 완료되었습니다."}
 
+# 탈퇴한 계정 복구 (보관 기간 내, 아이디/비밀번호 확인 후 로그인)
+@router.post("/users/restore")
+async def restore_user(request: Request, signin_data: UserLogin, db: AsyncSession = Depends(get_db)):
+    logger.info(f"계정 복구 요청: 사용자 이름 {signin_data.username}")
+    await rate_limiter.check(request, "login", signin_data.username) # 비밀번호 검증 전 요청 제한
+
+    user = await db.scalar(select(User).where(User.username == signin_data.username, User.deleted_at >= retention_cutoff()))
+
+    if user is None or not await password_hasher.verify(signin_data.password, user.hashed_password):
+        logger.warning(f"계정 복구 실패: 사용자 {signin_data.username}")
+        raise HTTPException(status_code=404, detail="복구할 수 있는 계정이 없습니다.")
+
+    try:
+        # 조건부 UPDATE 로 복구 (그 사이 삭제 워커가 영구 삭제한 계정은 복구하지 않음)
+        restored = await restore_deleted_user(db, user.id)
+        await db.commit()
+        user_cache.invalidate(user.id)
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"계정 복구 오류: {e}")
+        raise HTTPException(status_code=500, detail="계정 복구에 실패하였습니다. 다시 시도해 주세요.")
+
+    if not restored:
+        logger.warning(f"계정 복구 실패: 사용자 {signin_data.username} 영구 삭제됨")
+        raise HTTPException(status_code=404, detail="복구할 수 있는 계정이 없습니다.")
+
+    request.session["username"] = user.username
+    request.session["id"] = user.id
+    logger.info(f"사용자 {user.username} 계정 복구 및 로그인 성공")
+    return {"success": True, "message": "계정이 복구되었습니다."}
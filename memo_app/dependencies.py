@@ -1,10 +1,24 @@
+import os
 from passlib.context import CryptContext
-from database import SessionLocal
+from database import SessionLocal, AsyncSessionLocal
+
+# 비밀번호 해시 설정
+# PASSWORD_SCHEMES 의 첫 번째 방식으로 새 해시를 만들고, 나머지는 기존 해시 검증용 (예: "argon2,bcrypt")
+# BCRYPT_ROUNDS 는 calibrate 명령으로 서버 성능에 맞게 산정 (python -m service.password_calibration)
+PASSWORD_SCHEMES = [scheme.strip() for scheme in os.getenv("PASSWORD_SCHEMES", "bcrypt").split(",") if scheme.strip()]
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
 
 # passlib을 사용한 사용자 인증
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# 설정이 바뀌면 기존 해시는 deprecated 로 판단되어 로그인 시 새 설정으로 다시 해시됨
+pwd_context = CryptContext(schemes=PASSWORD_SCHEMES, deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+
+# 비동기 DB 세션 (요청 처리용)
+async def get_db():
+    async with AsyncSessionLocal() as db:
+        yield db
 
-def get_db():
+# 동기 DB 세션 (스크립트, 워커 등 이벤트 루프 밖에서 사용)
+def get_sync_db():
     db = SessionLocal()
     try:
         yield db
@@ -15,4 +29,4 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
\ No newline at end of file
+    return pwd_context.verify(plain_password, hashed_password)
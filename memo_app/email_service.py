@@ -1,4 +1,4 @@
-import smtplib
+from service.mail_transport import mail_transport
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from dotenv import load_dotenv
@@ -12,7 +12,6 @@ class EmailService:
             receiver_email: str,
     ):
         sender_email = os.getenv('EMAIL_ADDRESS')
-        password = os.getenv('EMAIL_PASSWORD')
 
         message = MIMEMultipart()
         message["From"] = sender_email
@@ -22,9 +21,7 @@ class EmailService:
         body = "메모 앱 서비스를 이용해 주셔서 감사합니다."
         message.attach(MIMEText(body, "plain"))
 
-        with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
-            server.login(sender_email, password)
-            server.send_message(message)
+        mail_transport.send(message) # 공유 SMTP 연결 풀로 전송
 
 class EmailServiceBye:
     def send_email(
@@ -32,7 +29,6 @@ class EmailServiceBye:
             receiver_email: str,
     ):
         sender_email = os.getenv('EMAIL_ADDRESS')
-        password = os.getenv('EMAIL_PASSWORD')
 
         message = MIMEMultipart()
         message["From"] = sender_email
@@ -42,6 +38,4 @@ class EmailServiceBye:
         body = "그동안 메모 앱 서비스를 이용해 주셔서 감사합니다."
         message.attach(MIMEText(body, "plain"))
 
-        with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
-            server.login(sender_email, password)
-            server.send_message(message)
\ No newline at end of file
+        mail_transport.send(message) # 공유 SMTP 연결 풀로 전송
\ No newline at end of file
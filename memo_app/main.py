@@ -1,17 +1,49 @@
-from fastapi import FastAPI, Request
-from fastapi.templating import Jinja2Templates
+from fastapi import FastAPI, Request, Depends
 from sqlalchemy import create_engine
 from controllers.users_controller import router as users_router  # USER 컨트롤러 라우터 import
 from controllers.memos_controller import router as memos_router  # Memo 컨트롤러 라우터 import
 from oauth.unlink_services import router as unlink_router # 소셜 연동 해제 라우터 import
-from database import Base, engine # 데이터베이스 설정 import
+from database import Base, async_engine, get_pool_stats # 데이터베이스 설정 import
+from service.search import setup_search_index # 전문 검색 인덱스 설정 import
+from service.user_cache import user_cache # 사용자 캐시 import
+from service.password_service import password_hasher # 비밀번호 해시 서비스 import
+from service.outbox import outbox_stats # 이메일 발송 대기열 import
+from service.http_client import oauth_http # 소셜 로그인 HTTP 클라이언트 import
+from service.google_id_token import google_key_cache # 구글 서명 키 캐시 import
+from service.memo_events import memo_events # 메모 실시간 알림 import
+from service.static_assets import static_assets # 정적 파일 (CSS/JS) import
+from service.templates import templates # 애플리케이션 전역 템플릿 import
+from service.compression import CompressionMiddleware # 응답 압축 미들웨어 import
+from dependencies import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.middleware.sessions import SessionMiddleware
 from oauth import google, kakao, naver
 import logging
 from fastapi.responses import HTMLResponse
+from contextlib import asynccontextmanager
+
+# 애플리케이션 시작/종료 시 처리
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 데이터베이스 테이블 생성
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(setup_search_index)
+    # 소셜 로그인 제공자 호출용 HTTP 클라이언트 생성 (연결 재사용)
+    await oauth_http.start()
+    # 템플릿 미리 컴파일 (첫 요청의 컴파일 지연 제거)
+    templates.precompile()
+    # 메모 실시간 알림 브로커 시작 (공유 백엔드 사용 시 구독 시작)
+    await memo_events.start()
+    yield
+    await memo_events.close()
+    await oauth_http.close()
+    # 커넥션 풀 정리
+    await async_engine.dispose()
+    password_hasher.shutdown()
 
 # FastAPI 애플리케이션 생성
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 app.add_middleware(
     SessionMiddleware, 
     secret_key="your-secret-key",
@@ -20,16 +52,16 @@ app.add_middleware(
     https_only=False, # 로컬 환경에서 HTTPS가 아니라면, 브라우저가 Secure 속성이 있는 쿠키를 저장하지 않을 수 있으므로, https_only=False
     session_cookie="session",
 )
+# HTML/JSON 응답 압축 (br/gzip)
+app.add_middleware(CompressionMiddleware)
 
-templates = Jinja2Templates(directory="templates")
+# 정적 파일 (해시가 붙은 CSS/JS, 미리 압축한 gzip/br 제공)
+app.mount("/static", static_assets, name="static")
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)  # 로깅 레벨 설정 (DEBUG, INFO, WARNING, ERROR, CRITICAL)
 logger = logging.getLogger(__name__)
 
-# 템플릿 디렉터리 설정
-templates = Jinja2Templates(directory="templates")
-
 # 라우터 포함
 app.include_router(users_router, tags=["users"])  # USERS 라우터 포함
 app.include_router(memos_router, tags=["memos"])  # MEMOS 라우터 포함
@@ -38,9 +70,6 @@ app.include_router(google.router) # Google OAuth2 라우터 포함
 app.include_router(kakao.router) # KAKAO OAuth2 라우터 포함
 app.include_router(naver.router) # NAVER OAuth2 라우터 포함
 
-# 데이터베이스 테이블 생성
-Base.metadata.create_all(bind=engine)
-
 # 홈페이지
 @app.get('/')
 async def read_root(request: Request):
@@ -70,4 +99,44 @@ async def read_find_id(request: Request):
 @app.get("/change_pw", response_class=HTMLResponse)
 async def read_change_pw(request: Request):
     logger.info("비밀번호 변경 페이지 요청 수신")
-    return templates.TemplateResponse('change_pw.html', {"request": request})
\ No newline at end of file
+    return templates.TemplateResponse('change_pw.html', {"request": request})
+
+# DB 커넥션 풀 현황 (워커 수 / max_connections 산정용)
+@app.get("/health/db-pool")
+async def db_pool_stats():
+    return get_pool_stats()
+
+# 로그인 사용자 캐시 현황 (적중률 확인용)
+@app.get("/health/user-cache")
+async def user_cache_stats():
+    return user_cache.stats()
+
+# 비밀번호 해시 작업 현황 (대기열 길이, 처리 시간)
+@app.get("/health/password-hasher")
+async def password_hasher_stats():
+    return password_hasher.stats()
+
+# 이메일 발송 대기열 현황 (상태별 건수, 가장 오래된 대기 건)
+@app.get("/health/outbox")
+async def email_outbox_stats(db: AsyncSession = Depends(get_db)):
+    return await outbox_stats(db)
+
+# 소셜 로그인 제공자 호출 현황 (제공자별 응답 시간)
+@app.get("/health/oauth-http")
+async def oauth_http_stats():
+    return {**oauth_http.stats(), "google_keys": google_key_cache.stats()}
+
+# 메모 실시간 알림 구독/발행 현황
+@app.get("/health/memo-events")
+async def memo_events_stats():
+    return memo_events.stats()
+
+# 템플릿 컴파일/렌더링 시간
+@app.get("/health/templates")
+async def templates_stats():
+    return templates.stats()
+
+# 정적 파일 현황 (파일 수, 압축 전후 크기)
+@app.get("/health/static")
+async def static_stats():
+    return static_assets.stats()
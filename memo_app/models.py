@@ -1,8 +1,13 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey, Index, DateTime, Text, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 from database import Base
 
+# 현재 UTC 시각 (DB 에는 timezone 없이 저장)
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
 # 사용자 모델 정의
 class User(Base):
     __tablename__ = 'users'
@@ -13,13 +18,50 @@ class User(Base):
     google_id = Column(String(100), unique=True, index=True, nullable=True)  # 구글 계정의 고유 ID
     kakao_id = Column(String(100), unique=True, index=True, nullable=True) # 카카오 계정의 고유 ID
     naver_id = Column(String(100), unique=True, index=True, nullable=True) # 네이버 계정의 고유 ID
+    deleted_at = Column(DateTime, nullable=True)  # 탈퇴 시각 (보관 기간이 지나면 삭제 워커가 삭제)
+    memo_seq = Column(BigInteger, nullable=False, default=0, server_default='0')  # 마지막으로 발급한 메모 변경 번호
+    purged_seq = Column(BigInteger, nullable=False, default=0, server_default='0')  # 영구 삭제된 메모의 마지막 변경 번호 (이보다 이전 커서는 변경 내역 만료)
+
+    __table_args__ = (
+        Index('ix_users_deleted_at', 'deleted_at', postgresql_where=text('deleted_at IS NOT NULL'), sqlite_where=text('deleted_at IS NOT NULL')),  # 삭제 대상 조회용
+    )
 
 # Memo 모델 정의
 class Memo(Base):
     __tablename__ = 'memo'
     id = Column(Integer, primary_key=True, index=True)  # 정수형, PK 설정
-    user_id = Column(Integer, ForeignKey('users.id'))  # 사용자 참조 추가
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'))  # 사용자 참조 추가 (사용자 삭제 시 메모도 삭제)
     title = Column(String(100), nullable=False)  # 제목
     content = Column(String(1000), nullable=False)  # 내용
+    deleted_at = Column(DateTime, nullable=True)  # 삭제 시각 (보관 기간 내 복구 가능)
+    created_at = Column(DateTime, nullable=False, default=utcnow)
+    updated_at = Column(DateTime, nullable=False, default=utcnow, onupdate=utcnow)
+    change_seq = Column(BigInteger, nullable=False, default=0)  # 사용자별 변경 번호 (생성/수정/삭제/복구 시 증가)
+    version = Column(Integer, nullable=False, default=1, server_default='1')  # 메모 버전 (수정할 때마다 1 증가, ETag 로 전달)
+
+    user = relationship("User")  # 사용자와의 관계 설정
+
+    __table_args__ = (
+        Index('ix_memo_user_id_id', 'user_id', 'id'),  # 사용자별 복합 인덱스 (외래 키, 탈퇴 사용자 메모 삭제용)
+        Index('ix_memo_user_id_id_live', 'user_id', 'id', postgresql_where=text('deleted_at IS NULL'), sqlite_where=text('deleted_at IS NULL')),  # 삭제되지 않은 메모 조회용 부분 인덱스
+        Index('ix_memo_user_id_change_seq', 'user_id', 'change_seq'),  # 변경 내역 조회용
+        Index('ix_memo_deleted_at', 'deleted_at', postgresql_where=text('deleted_at IS NOT NULL'), sqlite_where=text('deleted_at IS NOT NULL')),  # 삭제 대상 조회용
+    )
+
+# 이메일 발송 대기열 (사용자 변경과 같은 트랜잭션으로 저장, 별도 워커가 발송)
+class EmailOutbox(Base):
+    __tablename__ = 'email_outbox'
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(30), nullable=False)  # 이메일 종류 (welcome, bye, find_id, temp_pw, changed_pw)
+    recipient = Column(String(200), nullable=False)  # 받는 사람
+    payload = Column(Text, nullable=True)  # 본문에 필요한 값 (JSON), 발송 후 삭제
+    status = Column(String(20), nullable=False, default='pending')  # pending, sent, failed
+    attempts = Column(Integer, nullable=False, default=0)  # 발송 시도 횟수
+    next_attempt_at = Column(DateTime, nullable=False, default=utcnow)  # 다음 발송 시도 시각
+    last_error = Column(String(500), nullable=True)  # 마지막 실패 사유
+    created_at = Column(DateTime, nullable=False, default=utcnow)
+    sent_at = Column(DateTime, nullable=True)
 
-    user = relationship("User")  # 사용자와의 관계 설정  
\ No newline at end of file
+    __table_args__ = (
+        Index('ix_email_outbox_status_next_attempt_at', 'status', 'next_attempt_at'),  # 발송 대상 조회용
+    )
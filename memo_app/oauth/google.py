@@ -1,10 +1,10 @@
 import os
-import httpx
 from fastapi import APIRouter, Request, Depends, HTTPException
 from dotenv import load_dotenv
-from fastapi.templating import Jinja2Templates
 from dependencies import get_db
-from sqlalchemy.orm import Session
+from service.http_client import oauth_http
+from service.google_id_token import verify_id_token, IdTokenError, GoogleKeysUnavailable
+from sqlalchemy.ext.asyncio import AsyncSession
 from controllers.users_controller import create_or_update_social_user
 from fastapi.responses import RedirectResponse
 import secrets
@@ -12,7 +12,6 @@ import logging
 
 load_dotenv()
 router = APIRouter()
-templates = Jinja2Templates(directory="templates")
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -46,7 +45,7 @@ async def login(request: Request):
     return RedirectResponse(url=auth_url)
 
 @router.get("/auth/google/callback")
-async def callback(request: Request, db: Session = Depends(get_db)):  # get_db() 사용
+async def callback(request: Request, db: AsyncSession = Depends(get_db)):  # get_db() 사용
     code = request.query_params.get("code")
     state = request.query_params.get("state")
     session_state = request.session.get("oauth_state")
@@ -57,55 +56,68 @@ async def callback(request: Request, db: Session = Depends(get_db)):  # get_db()
         logger.warning("State Mismatch")
         raise HTTPException(status_code=400, detail="Invalid OAuth State")
     
-    async with httpx.AsyncClient() as client:
-        token_res = await client.post(GOOGLE_TOKEN_URL, data={
-            'code': code,
-            'client_id': CLIENT_ID,
-            'client_secret': CLIENT_SECRET,
-            'redirect_uri': REDIRECT_URI,
-            'grant_type': 'authorization_code',
-        }) # 'state': state, 구글 토큰에 요청 불가
-        
-        if token_res.status_code != 200:
-            logger.error(f"Token 요청 실패: {token_res.status_code}: {token_res.text}")
-            return {"error": "Failed to retrieve token"}
-
-        token_data = token_res.json()
-        access_token = token_data.get("access_token")
-
-        # 사용자 정보 요청
-        userinfo_res = await client.get(GOOGLE_USERINFO_URL, headers={
+    token_res = await oauth_http.post("google", GOOGLE_TOKEN_URL, data={
+        'code': code,
+        'client_id': CLIENT_ID,
+        'client_secret': CLIENT_SECRET,
+        'redirect_uri': REDIRECT_URI,
+        'grant_type': 'authorization_code',
+    }) # 'state': state, 구글 토큰에 요청 불가
+    
+    if token_res.status_code != 200:
+        logger.error(f"Token 요청 실패: {token_res.status_code}: {token_res.text}")
+        return {"error": "Failed to retrieve token"}
+
+    token_data = token_res.json()
+    access_token = token_data.get("access_token")
+
+    # id_token 을 캐시된 구글 서명 키로 검증 (userinfo 요청 생략)
+    user_info_raw = None
+    id_token = token_data.get("id_token")
+    if id_token:
+        try:
+            claims = await verify_id_token(id_token, audience=CLIENT_ID)
+            user_info_raw = {"id": claims["sub"], "name": claims.get("name"), "email": claims.get("email")}
+        except GoogleKeysUnavailable as e:
+            logger.warning(f"{e}, 사용자 정보 API 로 대체")
+        except IdTokenError as e:
+            logger.error(f"id_token 검증 실패: {e}")
+            return {"error": "Invalid id_token"}
+
+    # id_token 이 없거나 서명 키를 가져올 수 없는 경우 사용자 정보 요청
+    if user_info_raw is None:
+        userinfo_res = await oauth_http.get("google", GOOGLE_USERINFO_URL, headers={
             'Authorization': f'Bearer {access_token}'
         })
 
         if userinfo_res.status_code != 200:
             logger.error(f"사용자 정보 요청 실패: {userinfo_res.text}")
             return {"error": "Failed to retrieve user information"}
-
-        # 사용자 정보 처리
         user_info_raw = userinfo_res.json()
-        google_id = str(user_info_raw.get("id"))
-        username = user_info_raw.get("name") or "User" # 이름이 없을 경우 기본값 설정
-        email = user_info_raw.get("email")
-
-        # 필수 정보 확인
-        if not google_id or not username:
-            logger.error(f"유효하지 않은 사용자 정보: {user_info_raw}")
-            return {"error": "Invalid user info"}
-        
-        user_info = {
-            "username" : username,  
-            "email" : email,
-            "google_id" : google_id,
-        }
-
-        user = create_or_update_social_user(db, user_info, provider='google', request=request, access_token=access_token)
-        # 로그인 후 세션에 정보 저장
-        request.session["id"] = user.id  # 일반 사용자 ID
-        request.session["username"] = user.username
-        request.session["social_id"] = user_info["google_id"]  # 소셜 ID
-        request.session["provider"] = 'google'  # 소셜 로그인 제공자
-        request.session['access_token'] = access_token
+
+    # 사용자 정보 처리
+    google_id = str(user_info_raw.get("id"))
+    username = user_info_raw.get("name") or "User" # 이름이 없을 경우 기본값 설정
+    email = user_info_raw.get("email")
+
+    # 필수 정보 확인
+    if not google_id or not username:
+        logger.error(f"유효하지 않은 사용자 정보: {user_info_raw}")
+        return {"error": "Invalid user info"}
+    
+    user_info = {
+        "username" : username,  
+        "email" : email,
+        "google_id" : google_id,
+    }
+
+    user = await create_or_update_social_user(db, user_info, provider='google', request=request, access_token=access_token)
+    # 로그인 후 세션에 정보 저장
+    request.session["id"] = user.id  # 일반 사용자 ID
+    request.session["username"] = user.username
+    request.session["social_id"] = user_info["google_id"]  # 소셜 ID
+    request.session["provider"] = 'google'  # 소셜 로그인 제공자
+    request.session['access_token'] = access_token
 
     # 로그인 성공 후 메모 페이지로 이동
     return RedirectResponse(url="/memos")
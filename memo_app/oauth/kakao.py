@@ -1,10 +1,9 @@
 import os
-import httpx
 from fastapi import APIRouter, Request, Depends, HTTPException
 from dotenv import load_dotenv
-from fastapi.templating import Jinja2Templates
 from dependencies import get_db
-from sqlalchemy.orm import Session
+from service.http_client import oauth_http
+from sqlalchemy.ext.asyncio import AsyncSession
 from controllers.users_controller import create_or_update_social_user
 from fastapi.responses import RedirectResponse
 import secrets
@@ -12,7 +11,6 @@ import logging
 
 load_dotenv()
 router = APIRouter()
-templates = Jinja2Templates(directory="templates")
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -43,7 +41,7 @@ async def login(request: Request):
     return RedirectResponse(url=auth_url)
 
 @router.get("/kakao/login/callback")
-async def callback(request: Request, db: Session = Depends(get_db)):  # get_db() 사용
+async def callback(request: Request, db: AsyncSession = Depends(get_db)):  # get_db() 사용
     code = request.query_params.get("code")
     state = request.query_params.get("state")
     session_state = request.session.get("oauth_state")
@@ -54,57 +52,56 @@ async def callback(request: Request, db: Session = Depends(get_db)):  # get_db()
         logger.warning("State Mismatch")
         raise HTTPException(status_code=400, detail="Invalid OAuth State")
     
-    async with httpx.AsyncClient() as client:
-        token_res = await client.post(KAKAO_TOKEN_URL, data={
-            'code': code,
-            'client_id': CLIENT_ID,
-            'client_secret': CLIENT_SECRET,
-            'redirect_uri': REDIRECT_URI,
-            'grant_type': 'authorization_code',
-            'state': state,
-        })
-        
-        if token_res.status_code != 200:
-            logger.error(f"Token 요청 실패: {token_res.status_code}: {token_res.text}")
-            return {"error": "Failed to retrieve token"}
-
-        token_data = token_res.json()
-        access_token = token_data.get("access_token")
-
-        # 사용자 정보 요청
-        userinfo_res = await client.get(KAKAO_USERINFO_URL, headers={
-            'Authorization': f'Bearer {access_token}'
-        })
-
-        if userinfo_res.status_code != 200:
-            logger.error(f"사용자 정보 요청 실패: {userinfo_res.text}")
-            return {"error": "Failed to retrieve user information"}
-
-        # 사용자 정보 처리
-        user_info_raw = userinfo_res.json()
-        kakao_id = str(user_info_raw.get("id"))
-        nickname = user_info_raw.get("properties", {}).get("nickname") or "User"
-        email = user_info_raw.get("kakao_account", {}).get("email")
-
-        # 필수 정보 확인
-        if not kakao_id or not nickname:
-            logger.error(f"유효하지 않은 사용자 정보: {user_info_raw}")
-            return {"error": "Invalid user info"}
-
-        user_info = {
-            "username": nickname,
-            "email": email,
-            "kakao_id": kakao_id, # 문자열로 형변환
-        }
-
-        user = create_or_update_social_user(db, user_info, provider='kakao', request=request, access_token=access_token)
-
-        # 로그인 후 세션에 정보 저장
-        request.session["id"] = user.id  # 일반 사용자 ID
-        request.session["username"] = user.username
-        request.session["social_id"] = user_info["kakao_id"]  # 소셜 ID
-        request.session["provider"] = 'kakao'  # 소셜 로그인 제공자
-        request.session['access_token'] = access_token
+    token_res = await oauth_http.post("kakao", KAKAO_TOKEN_URL, data={
+        'code': code,
+        'client_id': CLIENT_ID,
+        'client_secret': CLIENT_SECRET,
+        'redirect_uri': REDIRECT_URI,
+        'grant_type': 'authorization_code',
+        'state': state,
+    })
+    
+    if token_res.status_code != 200:
+        logger.error(f"Token 요청 실패: {token_res.status_code}: {token_res.text}")
+        return {"error": "Failed to retrieve token"}
+
+    token_data = token_res.json()
+    access_token = token_data.get("access_token")
+
+    # 사용자 정보 요청
+    userinfo_res = await oauth_http.get("kakao", KAKAO_USERINFO_URL, headers={
+        'Authorization': f'Bearer {access_token}'
+    })
+
+    if userinfo_res.status_code != 200:
+        logger.error(f"사용자 정보 요청 실패: {userinfo_res.text}")
+        return {"error": "Failed to retrieve user information"}
+
+    # 사용자 정보 처리
+    user_info_raw = userinfo_res.json()
+    kakao_id = str(user_info_raw.get("id"))
+    nickname = user_info_raw.get("properties", {}).get("nickname") or "User"
+    email = user_info_raw.get("kakao_account", {}).get("email")
+
+    # 필수 정보 확인
+    if not kakao_id or not nickname:
+        logger.error(f"유효하지 않은 사용자 정보: {user_info_raw}")
+        return {"error": "Invalid user info"}
+
+    user_info = {
+        "username": nickname,
+        "email": email,
+        "kakao_id": kakao_id, # 문자열로 형변환
+    }
+
+    user = await create_or_update_social_user(db, user_info, provider='kakao', request=request, access_token=access_token)
+
+    # 로그인 후 세션에 정보 저장
+    request.session["id"] = user.id  # 일반 사용자 ID
+    request.session["username"] = user.username
+    request.session["social_id"] = user_info["kakao_id"]  # 소셜 ID
+    request.session["provider"] = 'kakao'  # 소셜 로그인 제공자
+    request.session['access_token'] = access_token
 
     # 로그인 성공 후 메모 페이지로 이동
     return RedirectResponse(url="/memos")
\ No newline at end of file
@@ -1,10 +1,9 @@
 import os
-import httpx
 from fastapi import APIRouter, Request, Depends, HTTPException
 from dotenv import load_dotenv
-from fastapi.templating import Jinja2Templates
 from dependencies import get_db
-from sqlalchemy.orm import Session
+from service.http_client import oauth_http
+from sqlalchemy.ext.asyncio import AsyncSession
 from controllers.users_controller import create_or_update_social_user
 from fastapi.responses import RedirectResponse
 import secrets
@@ -12,7 +11,6 @@ import logging
 
 load_dotenv()
 router = APIRouter()
-templates = Jinja2Templates(directory="templates")
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -43,7 +41,7 @@ async def login(request: Request):
     return RedirectResponse(url=auth_url, status_code=302) # 일시 리디렉션
 
 @router.get("/naver/login/callback")
-async def callback(request: Request, db: Session = Depends(get_db)):
+async def callback(request: Request, db: AsyncSession = Depends(get_db)):
     code = request.query_params.get("code")
     state = request.query_params.get("state")
     session_state = request.session.get("oauth_state")
@@ -54,62 +52,61 @@ async def callback(request: Request, db: Session = Depends(get_db)):
         logger.warning("State Mismatch")
         raise HTTPException(status_code=400, detail="Invalid OAuth State")
 
-    async with httpx.AsyncClient() as client:
-        # 액세스 토큰 요청
-        token_res = await client.post(NAVER_TOKEN_URL, data={
-            'code': code,
-            'client_id': CLIENT_ID,
-            'client_secret': CLIENT_SECRET,
-            'redirect_uri': REDIRECT_URI,
-            'grant_type': 'authorization_code',
-            'state': state,
-        })
-
-        if token_res.status_code != 200:
-            logger.error(f"Token 요청 실패: {token_res.status_code}, 내용: {token_res.text}")
-            return RedirectResponse(url="/login?error=token")
-
-        token_data = token_res.json()
-        access_token = token_data.get("access_token")
-
-        if not access_token:
-            logger.error(f"access_token 없음. 응답 내용: {token_data}")
-            return RedirectResponse(url="/login?error=no_token")
-
-        # 사용자 정보 요청
-        userinfo_res = await client.get(NAVER_USERINFO_URL, headers={
-            'Authorization': f'Bearer {access_token}'
-        })
-
-        if userinfo_res.status_code != 200:
-            logger.error(f"사용자 정보 요청 실패: {userinfo_res.text}")
-            return RedirectResponse(url="/login?error=userinfo")
-
-        user_info_raw = userinfo_res.json()
-        naver_response = user_info_raw.get("response", {})
-
-        if not naver_response.get("email") or not naver_response.get("id"):
-            logger.error(f"유효하지 않은 사용자 정보: {naver_response}")
-            return RedirectResponse(url="/login?error=invalid_user")
-
-        # 사용자 정보 정리
-        user_info = {
-            "username": naver_response.get("name") or "User",
-            "email": naver_response.get("email"),
-            "naver_id": naver_response.get("id")
-        }
-
-        # DB에 유저 저장 또는 업데이트
-        user = create_or_update_social_user(db, user_info, provider='naver', request=request, access_token=access_token)
-
-        # 세션에 로그인 정보 저장
-        request.session["id"] = user.id
-        request.session["username"] = user.username
-        request.session["social_id"] = user_info["naver_id"]
-        request.session["provider"] = 'naver'
-        request.session['access_token'] = access_token
-
-        logger.info(f"소셜 로그인 성공: {user.username}")
+    # 액세스 토큰 요청
+    token_res = await oauth_http.post("naver", NAVER_TOKEN_URL, data={
+        'code': code,
+        'client_id': CLIENT_ID,
+        'client_secret': CLIENT_SECRET,
+        'redirect_uri': REDIRECT_URI,
+        'grant_type': 'authorization_code',
+        'state': state,
+    })
+
+    if token_res.status_code != 200:
+        logger.error(f"Token 요청 실패: {token_res.status_code}, 내용: {token_res.text}")
+        return RedirectResponse(url="/login?error=token")
+
+    token_data = token_res.json()
+    access_token = token_data.get("access_token")
+
+    if not access_token:
+        logger.error(f"access_token 없음. 응답 내용: {token_data}")
+        return RedirectResponse(url="/login?error=no_token")
+
+    # 사용자 정보 요청
+    userinfo_res = await oauth_http.get("naver", NAVER_USERINFO_URL, headers={
+        'Authorization': f'Bearer {access_token}'
+    })
+
+    if userinfo_res.status_code != 200:
+        logger.error(f"사용자 정보 요청 실패: {userinfo_res.text}")
+        return RedirectResponse(url="/login?error=userinfo")
+
+    user_info_raw = userinfo_res.json()
+    naver_response = user_info_raw.get("response", {})
+
+    if not naver_response.get("email") or not naver_response.get("id"):
+        logger.error(f"유효하지 않은 사용자 정보: {naver_response}")
+        return RedirectResponse(url="/login?error=invalid_user")
+
+    # 사용자 정보 정리
+    user_info = {
+        "username": naver_response.get("name") or "User",
+        "email": naver_response.get("email"),
+        "naver_id": naver_response.get("id")
+    }
+
+    # DB에 유저 저장 또는 업데이트
+    user = await create_or_update_social_user(db, user_info, provider='naver', request=request, access_token=access_token)
+
+    # 세션에 로그인 정보 저장
+    request.session["id"] = user.id
+    request.session["username"] = user.username
+    request.session["social_id"] = user_info["naver_id"]
+    request.session["provider"] = 'naver'
+    request.session['access_token'] = access_token
+
+    logger.info(f"소셜 로그인 성공: {user.username}")
 
     # 로그인 성공 후 메모 페이지로 이동
     return RedirectResponse(url="/memos")
\ No newline at end of file
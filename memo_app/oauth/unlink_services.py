@@ -1,20 +1,18 @@
 import os
-import httpx
 from fastapi import APIRouter, Request, Depends, HTTPException
 from dotenv import load_dotenv
-from fastapi.templating import Jinja2Templates
 from dependencies import get_db
+from service.http_client import oauth_http
 import logging
 
 load_dotenv()
 router = APIRouter()
-templates = Jinja2Templates(directory="templates")
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# 구글 연결 해제
+# 구글 연결 해제 (토큰 폐기는 여러 번 요청해도 결과가 같으므로 재시도 허용)
 @router.post("/unlink/google")
 async def google_unlink(access_token: str):
     url = f"https://oauth2.googleapis.com/revoke?token={access_token}"
@@ -22,8 +20,7 @@ async def google_unlink(access_token: str):
         "Content-Type": "application/x-www-form-urlencoded"
     }
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, headers=headers)
+    response = await oauth_http.post("google", url, headers=headers, idempotent=True)
 
     logger.info(f"Google 응답: {response.status_code} - {response.text}")
     
@@ -37,8 +34,7 @@ async def kakao_unlink(access_token: str):
         "Authorization": f"Bearer {access_token}"
     }
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, headers=headers)
+    response = await oauth_http.post("kakao", url, headers=headers, idempotent=True)
 
     logger.info(f"Kakao 응답: {response.status_code} - {response.text}")
     
@@ -62,8 +58,7 @@ async def naver_unlink(access_token: str):
 
     headers = {"Content-Type": "application/x-www-form-urlencoded"}
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, headers=headers)
+    response = await oauth_http.post("naver", url, headers=headers, data=data, idempotent=True) # 토큰 삭제 요청 파라미터 전달
 
     logger.info(f"Naver 응답: {response.status_code} - {response.text}")
     
@@ -85,10 +80,12 @@ async def social_unlink_task(provider: str, access_token):
             logger.warning(f"지원하지 않는 제공자: {provider}, 연결 해제 생략.")
             result = None
     
-        if result and result.status_code == 200:
+        if result is None:
+            return
+        if result["status"] == 200:
             logger.info(f"{provider} 연결 해제 성공")
         else:
-            logger.warning(f"{provider} 연동 해제 실패: {result.status_code} - {result.text}")
+            logger.warning(f"{provider} 연동 해제 실패: {result['status']} - {result['text']}")
     except Exception as e:
         logger.error(f"{provider} 연동 해제 중 에러 발생: {e}")
     
\ No newline at end of file
@@ -0,0 +1,51 @@
+import os
+import time
+import signal
+import logging
+from database import SessionLocal, Base, engine
+from service.outbox import process_batch
+from service.mail_transport import mail_transport
+
+# 이메일 발송 워커 (웹 서버와 별도 프로세스로 실행)
+# 실행: python outbox_worker.py
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", "2"))  # 대기열이 비었을 때 조회 간격(초)
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+running = True
+
+# 종료 신호 수신 시 현재 배치까지만 처리하고 종료
+def stop(signum, frame):
+    global running
+    logger.info("종료 신호 수신, 현재 작업 완료 후 종료합니다.")
+    running = False
+
+def main():
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    Base.metadata.create_all(bind=engine, tables=[Base.metadata.tables["email_outbox"]])
+    logger.info("이메일 발송 워커 시작")
+
+    while running:
+        db = SessionLocal()
+        try:
+            processed = process_batch(db)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"이메일 대기열 처리 중 오류 발생: {e}")
+            processed = 0
+        finally:
+            db.close()
+
+        # 대기열이 비어 있으면 잠시 대기, 남아 있으면 바로 다음 배치 처리
+        if processed == 0:
+            time.sleep(OUTBOX_POLL_INTERVAL)
+
+    mail_transport.close()
+    logger.info("이메일 발송 워커 종료")
+
+if __name__ == "__main__":
+    main()
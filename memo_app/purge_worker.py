@@ -0,0 +1,44 @@
+import os
+import signal
+import asyncio
+import logging
+from database import AsyncSessionLocal, async_engine
+from service.purge import purge_memos, purge_users, DELETE_RETENTION_DAYS
+
+# 삭제된 메모/탈퇴한 사용자 영구 삭제 워커 (웹 서버와 별도 프로세스로 실행)
+# 실행: python purge_worker.py
+PURGE_INTERVAL = float(os.getenv("PURGE_INTERVAL", "3600"))  # 삭제 작업 실행 간격(초)
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+async def main():
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    # 종료 신호 수신 시 현재 작업 이후 종료
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    logger.info(f"삭제 워커 시작 (보관 기간 {DELETE_RETENTION_DAYS}일)")
+    while not stop.is_set():
+        async with AsyncSessionLocal() as db:
+            try:
+                memos = await purge_memos(db)
+                users = await purge_users(db)
+                if memos or users:
+                    logger.info(f"영구 삭제 완료: 메모 {memos}개, 사용자 {users}명")
+            except Exception as e:
+                await db.rollback()
+                logger.error(f"영구 삭제 중 오류 발생: {e}")
+
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=PURGE_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+    await async_engine.dispose()
+    logger.info("삭제 워커 종료")
+
+if __name__ == "__main__":
+    asyncio.run(main())
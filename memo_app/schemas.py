@@ -1,5 +1,6 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import Optional, List, Literal
 
 # 회원 가입 시 데이터 검증
 class UserCreate(BaseModel):
@@ -28,4 +29,68 @@ class MemoCreate(BaseModel):
 # BaseModel 상속받아 메모 수정 정의하는 클래스
 class MemoUpdate(BaseModel):
     title: Optional[str] = None # 문자열 타입, None 값 가능
-    content: Optional[str] = None # 문자열 타입, None 값 가능
\ No newline at end of file
+    content: Optional[str] = None # 문자열 타입, None 값 가능
+
+# 메모 응답 데이터
+class MemoResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True) # ORM 객체에서 바로 변환
+
+    id: int
+    user_id: Optional[int] = None
+    title: str
+    content: str
+    version: int # 메모 버전 (If-Match 헤더로 전달)
+
+# 커서 기반 페이지 응답
+class MemoPage(BaseModel):
+    items: List[MemoResponse]
+    next_cursor: Optional[str] = None # 다음 페이지 커서 (없으면 마지막 페이지)
+    prev_cursor: Optional[str] = None # 이전 페이지 커서 (없으면 첫 페이지)
+
+# 메모 일괄 작업 (생성/수정/삭제)
+class MemoBatchOperation(BaseModel):
+    op: Literal["create", "update", "delete"]
+    id: Optional[int] = None # 수정/삭제할 메모 ID
+    title: Optional[str] = None
+    content: Optional[str] = None
+    version: Optional[int] = None # 수정/삭제 시 기대하는 버전 (다르면 412)
+
+class MemoBatchRequest(BaseModel):
+    operations: List[MemoBatchOperation]
+
+# 작업별 결과 (요청 순서와 동일)
+class MemoBatchResult(BaseModel):
+    index: int
+    op: str
+    id: Optional[int] = None # 생성/수정/삭제된 메모 ID
+    version: Optional[int] = None # 작업 후 메모 버전
+    status: int # HTTP 상태 코드와 같은 의미 (201 생성, 200 성공, 400 잘못된 요청, 404 없음, 412 버전 불일치)
+    error: Optional[str] = None
+
+class MemoBatchResponse(BaseModel):
+    results: List[MemoBatchResult]
+
+# 메모 가져오기 결과
+class MemoImportError(BaseModel):
+    line: int # 업로드 파일의 줄 번호
+    error: str
+
+class MemoImportResult(BaseModel):
+    imported: int # 저장된 메모 수
+    failed: int # 오류로 건너뛴 행 수
+    errors: List[MemoImportError] # 오류 목록 (최대 100건)
+
+# 메모 변경 내역 (증분 동기화)
+class MemoChange(BaseModel):
+    id: int
+    change_seq: int # 사용자별 변경 번호
+    version: int
+    deleted: bool # 삭제된 메모 (title, content 없음)
+    title: Optional[str] = None
+    content: Optional[str] = None
+    updated_at: datetime
+
+class MemoChanges(BaseModel):
+    items: List[MemoChange]
+    next_since: str # 다음 조회 시 since 로 전달할 커서
+    has_more: bool # 아직 받지 않은 변경이 남아 있는지 여부
@@ -0,0 +1,76 @@
+import logging
+from fastapi import HTTPException
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import User, Memo
+from schemas import MemoChange, MemoChanges
+from service.pagination import clamp_limit, encode_cursor, decode_cursor, cursor_seq
+
+logger = logging.getLogger(__name__)
+
+# 메모 변경 내역 (증분 동기화)
+# 메모를 생성/수정/삭제/복구할 때마다 사용자별 변경 번호(change_seq)를 새로 발급하고,
+# 클라이언트는 마지막으로 받은 번호 이후의 변경만 조회
+#
+# 번호는 users.memo_seq 를 UPDATE ... RETURNING 으로 증가시켜 발급
+# 같은 사용자의 쓰기는 이 행 잠금으로 직렬화되므로, 커밋 순서와 번호 순서가 같아 조회 중 누락이 생기지 않음
+
+# 변경 번호 count 개 예약, 예약한 범위의 첫 번호 반환 (first, first + 1, ..., first + count - 1)
+async def reserve_change_seq(db: AsyncSession, user_id: int, count: int = 1) -> int:
+    last = await db.scalar(
+        update(User).where(User.id == user_id).values(memo_seq=User.memo_seq + count).returning(User.memo_seq)
+    )
+    return last - count + 1
+
+# 메모 한 건의 변경 내역 (실시간 알림과 같은 형식)
+def memo_change(memo: Memo) -> MemoChange:
+    return MemoChange(
+        id=memo.id,
+        change_seq=memo.change_seq,
+        version=memo.version,
+        deleted=memo.deleted_at is not None,
+        title=None if memo.deleted_at else memo.title,  # 삭제된 메모는 ID 만 전달
+        content=None if memo.deleted_at else memo.content,
+        updated_at=memo.updated_at,
+    )
+
+# since 커서 이후의 변경 내역 ((user_id, change_seq) 인덱스 사용)
+# 커서가 없으면 처음부터 전체 조회 (삭제된 메모 제외), 조회 시작 시점의 발급 번호(until)까지만 나누어 전달하고
+# 마지막 페이지에서 until 을 일반 커서로 넘겨 그 이후 변경(삭제 포함)은 증분 조회로 받음
+# 일반 커서가 영구 삭제 기록(users.purged_seq)보다 이전이면 410 (처음부터 다시 조회해야 함)
+async def fetch_changes(db: AsyncSession, user_id: int, since: str | None = None, limit: int | None = None) -> MemoChanges:
+    limit = clamp_limit(limit)
+    query = select(Memo).where(Memo.user_id == user_id)
+    cursor = decode_cursor(since) if since else {"seq": 0, "full": True}
+    seq = cursor_seq(since) if since else 0
+    full = cursor.get("full") is True
+
+    if full:
+        # 전체 조회 중에는 삭제된 메모를 건너뛰므로 영구 삭제와 무관 (만료 확인 안 함)
+        until = cursor.get("until")
+        if until is None:
+            until = await db.scalar(select(User.memo_seq).where(User.id == user_id)) or 0
+        if not isinstance(until, int) or until < seq:
+            raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+        query = query.where(Memo.change_seq > seq, Memo.change_seq <= until, Memo.deleted_at.is_(None))
+    else:
+        # 커서 이후에 삭제된 메모가 이미 영구 삭제되었으면 삭제 알림을 줄 수 없으므로 전체를 다시 불러오도록 410 반환
+        purged_seq = await db.scalar(select(User.purged_seq).where(User.id == user_id)) or 0
+        if seq < purged_seq:
+            raise HTTPException(status_code=410, detail="변경 내역이 만료되었습니다. 전체 메모를 다시 불러와 주세요.")
+        query = query.where(Memo.change_seq > seq)
+
+    rows = (await db.scalars(query.order_by(Memo.change_seq).limit(limit + 1))).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    items = [memo_change(memo) for memo in rows]
+    last_seq = rows[-1].change_seq if rows else seq
+    if not full:
+        next_cursor = {"seq": last_seq}
+    elif has_more:
+        next_cursor = {"seq": last_seq, "until": until, "full": True}
+    else:
+        next_cursor = {"seq": until}  # 전체 조회 완료, 이후는 증분 조회
+
+    return MemoChanges(items=items, next_since=encode_cursor(next_cursor), has_more=has_more)
@@ -0,0 +1,109 @@
+import zlib
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli  # 선택 사항: 설치되어 있으면 br 압축 사용
+except ImportError:
+    brotli = None
+
+# 동적 응답(HTML/JSON) 압축 미들웨어 (br > gzip)
+# 스트리밍 응답은 청크마다 flush 하여 압축 중에도 바로 전송
+# 이미 압축된 응답(정적 파일 압축본, gzip 내보내기)과 실시간 알림(SSE)은 그대로 전달
+EXCLUDED_CONTENT_TYPES = ("text/event-stream", "application/gzip", "application/x-gzip", "application/zip", "image/", "font/")
+
+class GZipCompressor:
+    content_encoding = "gzip"
+
+    def __init__(self, level: int):
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31: gzip 헤더 포함
+
+    def compress(self, body: bytes, more_body: bool) -> bytes:
+        data = self.compressor.compress(body)
+        return data + self.compressor.flush(zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH)
+
+class BrotliCompressor:
+    content_encoding = "br"
+
+    def __init__(self, quality: int):
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, body: bytes, more_body: bool) -> bytes:
+        data = self.compressor.process(body)
+        return data + (self.compressor.flush() if more_body else self.compressor.finish())
+
+# 요청 한 건의 send 를 감싸 응답 본문 압축 (compressor 가 없으면 Vary 헤더만 추가)
+# 첫 본문 메시지를 받을 때까지 시작 메시지를 보류하고, 헤더와 본문 크기를 보고 압축 여부 결정
+class CompressionResponder:
+    def __init__(self, app: ASGIApp, minimum_size: int, compressor=None):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compressor = compressor
+        self.send: Send = None
+        self.initial_message: Message | None = None
+        self.excluded = False  # 이미 압축되었거나 압축하지 않는 형식
+        self.compressing = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_with_compression)
+
+    async def send_with_compression(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            self.initial_message = message
+            headers = Headers(raw=message["headers"])
+            self.excluded = "content-encoding" in headers or headers.get("content-type", "").startswith(EXCLUDED_CONTENT_TYPES)
+            return
+
+        if self.initial_message is not None:
+            initial_message, self.initial_message = self.initial_message, None
+            if message_type == "http.response.body" and not self.excluded:
+                message = self.start_body(initial_message, message)
+            await self.send(initial_message)
+        elif self.compressing and message_type == "http.response.body":
+            more_body = message.get("more_body", False)
+            message = {**message, "body": self.compressor.compress(message.get("body", b""), more_body)}
+        await self.send(message)
+
+    # 첫 본문 메시지: 한 번에 오는 작은 응답은 그대로, 그 외에는 헤더 수정 후 압축 시작
+    def start_body(self, initial_message: Message, message: Message) -> Message:
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if len(body) < self.minimum_size and not more_body:
+            return message
+
+        headers = MutableHeaders(raw=initial_message["headers"])
+        headers.add_vary_header("Accept-Encoding")
+        if self.compressor is None:
+            return message
+
+        self.compressing = True
+        body = self.compressor.compress(body, more_body)
+        headers["Content-Encoding"] = self.compressor.content_encoding
+        if more_body:
+            del headers["Content-Length"]  # 스트리밍 응답: 압축 후 길이를 미리 알 수 없음
+        else:
+            headers["Content-Length"] = str(len(body))
+        return {**message, "body": body}
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = 500, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size  # 이보다 작은 응답은 압축하지 않음
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality  # 동적 응답은 압축 속도 우선 (정적 파일은 미리 최고 압축)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        if brotli is not None and "br" in accept_encoding:
+            compressor = BrotliCompressor(self.brotli_quality)
+        elif "gzip" in accept_encoding:
+            compressor = GZipCompressor(self.gzip_level)
+        else:
+            compressor = None
+        await CompressionResponder(self.app, self.minimum_size, compressor)(scope, receive, send)
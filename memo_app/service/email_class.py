@@ -1,10 +1,10 @@
-import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from dotenv import load_dotenv
 import os
 from pydantic import BaseModel
 import logging
+from service.mail_transport import mail_transport
 
 load_dotenv()
 
@@ -18,7 +18,6 @@ class EmailServiceWelcome:
             receiver_email: str,
     ):
         sender_email = os.getenv('EMAIL_ADDRESS')
-        password = os.getenv('EMAIL_PASSWORD')
 
         message = MIMEMultipart("alternative")
         message["From"] = sender_email
@@ -39,12 +38,11 @@ class EmailServiceWelcome:
 
         message.attach(MIMEText(html_body, "html"))
         try:
-            with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
-                server.login(sender_email, password)
-                server.send_message(message)
+            mail_transport.send(message) # 공유 SMTP 연결 풀로 전송
             logger.info(f"회원가입 이메일이 {receiver_email}로 성공적으로 전송되었습니다.")
         except Exception as e:
             logger.error(f"이메일 전송 실패: {e}")
+            raise # 발송 워커에서 재시도할 수 있도록 전달
 
 # 회원 탈퇴 이메일
 class EmailServiceBye:
@@ -53,7 +51,6 @@ class EmailServiceBye:
             receiver_email: str,
     ):
         sender_email = os.getenv('EMAIL_ADDRESS')
-        password = os.getenv('EMAIL_PASSWORD')
 
         message = MIMEMultipart("alternative")
         message["From"] = sender_email
@@ -75,12 +72,11 @@ class EmailServiceBye:
         message.attach(MIMEText(html_body, "html"))
 
         try:
-            with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
-                server.login(sender_email, password)
-                server.send_message(message)
+            mail_transport.send(message) # 공유 SMTP 연결 풀로 전송
             logger.info(f"탈퇴 안내 이메일이 {receiver_email}로 성공적으로 전송되었습니다.")
         except Exception as e:
             logger.error(f"이메일 전송 실패: {e}")
+            raise # 발송 워커에서 재시도할 수 있도록 전달
 
 # 아이디 찾기 이메일
 class EmailServiceFindId:
@@ -90,7 +86,6 @@ class EmailServiceFindId:
             username: str,
     ):
         sender_email = os.getenv('EMAIL_ADDRESS')
-        password = os.getenv('EMAIL_PASSWORD')
 
         message = MIMEMultipart("alternative")
         message["From"] = sender_email
@@ -110,12 +105,11 @@ class EmailServiceFindId:
         message.attach(MIMEText(html_body, "html"))
 
         try:
-            with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
-                server.login(sender_email, password)
-                server.send_message(message)
+            mail_transport.send(message) # 공유 SMTP 연결 풀로 전송
             logger.info(f"아이디가 {receiver_email}로 성공적으로 전송되었습니다.")
         except Exception as e:
             logger.error(f"이메일 전송 실패: {e}")
+            raise # 발송 워커에서 재시도할 수 있도록 전달
 
 class EmailRequest(BaseModel):
     email: str
@@ -129,7 +123,6 @@ class EmailServiceSendTempPW:
         temp_password: str,
     ):
         sender_email = os.getenv('EMAIL_ADDRESS')
-        password = os.getenv('EMAIL_PASSWORD')
 
         message = MIMEMultipart("alternative")
         message["From"] = sender_email
@@ -151,12 +144,11 @@ class EmailServiceSendTempPW:
         message.attach(MIMEText(html_body, "html"))
 
         try:
-            with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
-                server.login(sender_email, password)
-                server.send_message(message)
+            mail_transport.send(message) # 공유 SMTP 연결 풀로 전송
             logger.info(f"임시 비밀번호가 {receiver_email}로 성공적으로 전송되었습니다.")
         except Exception as e:
             logger.error(f"이메일 전송 실패: {e}")
+            raise # 발송 워커에서 재시도할 수 있도록 전달
 
 class UsernameEmailRequest(BaseModel):
     username: str
@@ -170,7 +162,6 @@ class EmailServiceSendNewPW:
         username: str,
     ):
         sender_email = os.getenv('EMAIL_ADDRESS')
-        password = os.getenv('EMAIL_PASSWORD')
 
         message = MIMEMultipart("alternative")  # <-- 중요! HTML을 포함하려면 "alternative"로 설정
         message["From"] = sender_email
@@ -191,9 +182,8 @@ class EmailServiceSendNewPW:
         message.attach(MIMEText(html_body, "html"))  # HTML 형식으로 첨부
 
         try:
-            with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
-                server.login(sender_email, password)
-                server.send_message(message)
-            print(f"이메일이 {receiver_email}로 성공적으로 전송되었습니다.")
+            mail_transport.send(message) # 공유 SMTP 연결 풀로 전송
+            logger.info(f"비밀번호 변경 안내 이메일이 {receiver_email}로 성공적으로 전송되었습니다.")
         except Exception as e:
-            print(f"이메일 전송 실패: {e}")
\ No newline at end of file
+            logger.error(f"이메일 전송 실패: {e}")
+            raise # 발송 워커에서 재시도할 수 있도록 전달
\ No newline at end of file
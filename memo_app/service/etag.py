@@ -0,0 +1,24 @@
+from fastapi import HTTPException
+
+# 메모 버전 ETag (낙관적 동시성 제어)
+# 수정 요청에 If-Match 로 마지막으로 받은 ETag 를 보내면, 그 사이 다른 곳에서 수정된 경우 412 반환
+
+def memo_etag(version: int) -> str:
+    return f'"{version}"'
+
+# If-Match 헤더에서 버전 추출 (헤더가 없거나 "*" 이면 None: 버전 확인 없이 수정)
+def parse_if_match(value: str | None) -> int | None:
+    if value is None or value.strip() == "*":
+        return None
+    tag = value.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    tag = tag.strip('"')
+    if not tag.isdigit():
+        raise HTTPException(status_code=400, detail="잘못된 If-Match 헤더입니다.")
+    return int(tag)
+
+# 버전 불일치 (다른 곳에서 먼저 수정됨), 현재 ETag 함께 반환
+def precondition_failed(current_version: int) -> HTTPException:
+    return HTTPException(status_code=412, detail="다른 곳에서 메모가 수정되었습니다. 새로고침 후 다시 시도해 주세요.",
+                         headers={"ETag": memo_etag(current_version)})
@@ -0,0 +1,132 @@
+import re
+import time
+import asyncio
+import logging
+import jwt
+import httpx
+from fastapi import HTTPException
+from service.http_client import oauth_http
+
+logger = logging.getLogger(__name__)
+
+# 구글 id_token 로컬 검증
+# 로그인마다 userinfo API 를 호출하는 대신, 캐시한 구글 서명 키(JWKS)로 id_token 서명을 직접 확인
+GOOGLE_DISCOVERY_URL = "https://accounts.google.com/.well-known/openid-configuration"
+GOOGLE_ISSUERS = ("https://accounts.google.com", "accounts.google.com")
+DEFAULT_MAX_AGE = 3600  # Cache-Control 이 없을 때 캐시 유지 시간(초)
+MIN_REFRESH_INTERVAL = 60  # 알 수 없는 kid 로 인한 강제 갱신 최소 간격(초), 위조 토큰으로 키 조회가 반복되지 않도록
+CLOCK_SKEW = 60  # exp/iat 검증 시 허용 오차(초)
+
+class IdTokenError(Exception):
+    pass
+
+# 구글 키를 가져오지 못한 경우 (토큰 문제가 아니므로 userinfo API 로 대체 가능)
+class GoogleKeysUnavailable(IdTokenError):
+    pass
+
+# Cache-Control 헤더의 max-age (초)
+def cache_max_age(headers, default: int = DEFAULT_MAX_AGE) -> int:
+    cache_control = headers.get("cache-control", "")
+    if "no-store" in cache_control or "no-cache" in cache_control:
+        return 0
+    match = re.search(r"max-age=(\d+)", cache_control)
+    return int(match.group(1)) if match else default
+
+# 구글 discovery 문서 / JWKS 캐시
+class GoogleKeyCache:
+    def __init__(self, discovery_url: str = GOOGLE_DISCOVERY_URL, http=oauth_http):
+        self.discovery_url = discovery_url
+        self.http = http
+        self._jwks_uri = None
+        self._jwks_uri_expires = 0.0
+        self._keys = {}  # kid -> PyJWK
+        self._keys_expires = 0.0
+        self._last_refresh = 0.0
+        self._lock = asyncio.Lock()
+        self.refreshes = 0
+
+    async def _fetch(self, url: str) -> tuple[dict, int]:
+        try:
+            response = await self.http.get("google", url)
+        except (httpx.HTTPError, HTTPException) as e:
+            # 연결 실패, 제한 시간 초과, 회로 차단기 열림
+            raise GoogleKeysUnavailable(f"구글 키 조회 실패: {e!r}")
+        if response.status_code != 200:
+            raise GoogleKeysUnavailable(f"구글 키 조회 실패: {response.status_code}")
+        return response.json(), cache_max_age(response.headers)
+
+    async def _jwks_url(self) -> str:
+        if self._jwks_uri is None or time.monotonic() >= self._jwks_uri_expires:
+            document, max_age = await self._fetch(self.discovery_url)
+            self._jwks_uri = document["jwks_uri"]
+            self._jwks_uri_expires = time.monotonic() + max_age
+        return self._jwks_uri
+
+    async def _refresh(self):
+        jwks, max_age = await self._fetch(await self._jwks_url())
+        keys = {}
+        for data in jwks.get("keys", []):
+            try:
+                keys[data["kid"]] = jwt.PyJWK(data)
+            except (KeyError, jwt.PyJWKError) as e:
+                logger.warning(f"사용할 수 없는 구글 서명 키 무시: {e}")
+        self._keys = keys
+        self._keys_expires = time.monotonic() + max_age
+        self._last_refresh = time.monotonic()
+        self.refreshes += 1
+        logger.info(f"구글 서명 키 갱신: {len(keys)}개, {max_age}초 캐시")
+
+    # kid 에 해당하는 서명 키, 캐시 만료 또는 알 수 없는 kid 인 경우 갱신
+    async def get_key(self, kid: str) -> jwt.PyJWK:
+        now = time.monotonic()
+        if now < self._keys_expires and kid in self._keys:
+            return self._keys[kid]
+
+        async with self._lock:
+            # 대기하는 동안 다른 요청이 갱신했을 수 있음
+            now = time.monotonic()
+            expired = now >= self._keys_expires
+            if expired or (kid not in self._keys and now - self._last_refresh >= MIN_REFRESH_INTERVAL):
+                await self._refresh()
+
+        if kid not in self._keys:
+            raise IdTokenError(f"알 수 없는 서명 키: {kid}")
+        return self._keys[kid]
+
+    def stats(self) -> dict:
+        return {
+            "keys": list(self._keys),
+            "expires_in": max(0, round(self._keys_expires - time.monotonic())),
+            "refreshes": self.refreshes,
+        }
+
+# id_token 서명/발급자/대상/만료 검증 후 클레임 반환
+async def verify_id_token(id_token: str, audience: str, key_cache: GoogleKeyCache = None) -> dict:
+    key_cache = key_cache or google_key_cache
+    try:
+        header = jwt.get_unverified_header(id_token)
+    except jwt.InvalidTokenError as e:
+        raise IdTokenError(f"잘못된 id_token 형식: {e}")
+
+    if header.get("alg") != "RS256" or not header.get("kid"):
+        raise IdTokenError(f"지원하지 않는 id_token 헤더: {header}")
+
+    key = await key_cache.get_key(header["kid"])
+    try:
+        claims = jwt.decode(
+            id_token,
+            key.key,
+            algorithms=["RS256"],
+            audience=audience,
+            leeway=CLOCK_SKEW,
+            options={"require": ["iss", "sub", "aud", "exp", "iat"]},
+        )
+    except jwt.InvalidTokenError as e:
+        raise IdTokenError(f"id_token 검증 실패: {e}")
+
+    if claims["iss"] not in GOOGLE_ISSUERS:
+        raise IdTokenError(f"잘못된 발급자: {claims['iss']}")
+    return claims
+
+# 애플리케이션 전역 구글 서명 키 캐시
+google_key_cache = GoogleKeyCache()
@@ -0,0 +1,238 @@
+import os
+import time
+import random
+import asyncio
+import logging
+import importlib.util
+from collections import deque
+import httpx
+from fastapi import HTTPException
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# 소셜 로그인 제공자 호출용 공유 HTTP 클라이언트
+# 요청마다 클라이언트를 만들면 매번 TCP/TLS 연결을 새로 맺으므로, 애플리케이션 수명 동안 연결을 재사용
+HTTP2_ENABLED = os.getenv("OAUTH_HTTP2", "true").lower() in ("1", "true", "yes")
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None  # HTTP/2 사용 시 h2 패키지 필요
+LATENCY_SAMPLES = 500  # 제공자별로 보관할 최근 응답 시간 수
+RETRY_STATUSES = (429, 502, 503, 504)  # 재시도할 응답 코드
+
+# 제공자별 설정 (환경 변수: OAUTH_{제공자}_TIMEOUT, OAUTH_{제공자}_CONNECT_TIMEOUT, OAUTH_{제공자}_MAX_CONNECTIONS ...)
+def provider_config(provider: str, timeout: float, connect_timeout: float, max_connections: int) -> dict:
+    prefix = f"OAUTH_{provider.upper()}_"
+    return {
+        "timeout": float(os.getenv(prefix + "TIMEOUT", str(timeout))),  # 읽기/쓰기 타임아웃(초)
+        "connect_timeout": float(os.getenv(prefix + "CONNECT_TIMEOUT", str(connect_timeout))),  # 연결 타임아웃(초)
+        "max_connections": int(os.getenv(prefix + "MAX_CONNECTIONS", str(max_connections))),  # 최대 동시 연결 수
+        "keepalive_expiry": float(os.getenv(prefix + "KEEPALIVE_EXPIRY", "60")),  # 유휴 연결 유지 시간(초)
+        "deadline": float(os.getenv(prefix + "DEADLINE", str(timeout + 3))),  # 재시도를 포함한 전체 호출 제한 시간(초)
+        "retries": int(os.getenv(prefix + "RETRIES", "2")),  # 멱등 요청 재시도 횟수
+        "retry_backoff": float(os.getenv(prefix + "RETRY_BACKOFF", "0.2")),  # 재시도 기본 대기 시간(초), 시도마다 2배
+        "failure_threshold": int(os.getenv(prefix + "FAILURE_THRESHOLD", "5")),  # 연속 실패 시 차단기 열림
+        "reset_timeout": float(os.getenv(prefix + "RESET_TIMEOUT", "30")),  # 차단 후 시험 호출까지 대기 시간(초)
+    }
+
+PROVIDERS = {
+    "google": provider_config("google", timeout=5, connect_timeout=3, max_connections=20),
+    "kakao": provider_config("kakao", timeout=5, connect_timeout=3, max_connections=20),
+    "naver": provider_config("naver", timeout=5, connect_timeout=3, max_connections=20),
+}
+
+# 제공자별 응답 시간 기록
+class LatencyStats:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.samples = deque(maxlen=LATENCY_SAMPLES)  # 최근 응답 시간(밀리초)
+
+    def record(self, elapsed_ms: float, error: bool = False):
+        self.requests += 1
+        if error:
+            self.errors += 1
+        self.samples.append(elapsed_ms)
+
+    def summary(self) -> dict:
+        ordered = sorted(self.samples)
+        percentile = lambda p: round(ordered[min(len(ordered) - 1, int(len(ordered) * p))], 1) if ordered else None
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "p50_ms": percentile(0.5),
+            "p95_ms": percentile(0.95),
+            "max_ms": round(ordered[-1], 1) if ordered else None,
+        }
+
+# 제공자별 회로 차단기
+# closed: 정상 호출, open: 호출 없이 즉시 실패, half_open: 시험 호출 1건만 허용
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0  # 연속 실패 횟수
+        self.opened_at = 0.0
+        self.trips = 0
+        self._probing = False
+
+    # 호출 가능 여부 확인
+    def allow(self) -> bool:
+        if self.state == "closed":
+            return True
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = "half_open"
+        if self.state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self):
+        self.state = "closed"
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._probing = False
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                self.trips += 1
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    # 다시 호출할 수 있을 때까지 남은 시간(초)
+    def retry_after(self) -> float:
+        return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+    def stats(self) -> dict:
+        return {"state": self.state, "consecutive_failures": self.failures, "trips": self.trips}
+
+# 제공자 호출 실패 (차단기 열림, 제한 시간 초과, 재시도 후에도 연결 실패)
+def provider_unavailable(provider: str, retry_after: float) -> HTTPException:
+    return HTTPException(status_code=503, detail=f"{provider} 로그인 서비스가 응답하지 않습니다. 잠시 후 다시 시도해 주세요.",
+                         headers={"Retry-After": str(max(1, round(retry_after)))})
+
+class OAuthHttpClients:
+    def __init__(self, providers: dict = PROVIDERS):
+        self.providers = providers
+        self._clients = {}
+        self._latency = {name: LatencyStats() for name in providers}
+        self._breakers = {
+            name: CircuitBreaker(config["failure_threshold"], config["reset_timeout"])
+            for name, config in providers.items()
+        }
+        self.http2 = HTTP2_ENABLED and HTTP2_AVAILABLE
+
+    def _create(self, provider: str) -> httpx.AsyncClient:
+        config = self.providers[provider]
+        return httpx.AsyncClient(
+            http2=self.http2,  # 제공자가 지원하면 HTTP/2 (ALPN 협상), 아니면 HTTP/1.1 keep-alive
+            timeout=httpx.Timeout(config["timeout"], connect=config["connect_timeout"]),
+            limits=httpx.Limits(
+                max_connections=config["max_connections"],
+                max_keepalive_connections=config["max_connections"],
+                keepalive_expiry=config["keepalive_expiry"],
+            ),
+        )
+
+    # 애플리케이션 시작 시 제공자별 클라이언트 생성
+    async def start(self):
+        if HTTP2_ENABLED and not HTTP2_AVAILABLE:
+            logger.warning("h2 패키지가 없어 HTTP/1.1 로 동작합니다.")
+        for provider in self.providers:
+            if provider not in self._clients:
+                self._clients[provider] = self._create(provider)
+
+    # 애플리케이션 종료 시 연결 정리
+    async def close(self):
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+    def client(self, provider: str) -> httpx.AsyncClient:
+        if provider not in self._clients:
+            # lifespan 밖에서 호출된 경우 (스크립트 등) 필요할 때 생성
+            self._clients[provider] = self._create(provider)
+        return self._clients[provider]
+
+    # 단일 요청 + 응답 시간/차단기 기록
+    async def _attempt(self, provider: str, method: str, url: str, **kwargs) -> httpx.Response:
+        breaker = self._breakers[provider]
+        if not breaker.allow():
+            raise provider_unavailable(provider, breaker.retry_after())
+
+        start = time.perf_counter()
+        try:
+            response = await self.client(provider).request(method, url, **kwargs)
+        except (httpx.HTTPError, asyncio.CancelledError):
+            # 제한 시간 초과로 취소된 경우도 실패로 기록
+            self._latency[provider].record((time.perf_counter() - start) * 1000, error=True)
+            breaker.record_failure()
+            raise
+        failed = response.status_code >= 500 or response.status_code == 429
+        self._latency[provider].record((time.perf_counter() - start) * 1000, error=failed)
+        if failed:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    # 제공자 API 호출
+    # 전체 제한 시간(deadline) 안에서, 멱등 요청은 연결 오류/일시적 오류 응답 시 지수 백오프 + 지터로 재시도
+    async def request(self, provider: str, method: str, url: str, idempotent: bool | None = None, **kwargs) -> httpx.Response:
+        config = self.providers[provider]
+        if idempotent is None:
+            idempotent = method in ("GET", "HEAD")  # 인가 코드 교환 등 POST 는 기본적으로 재시도하지 않음
+        attempts = 1 + (config["retries"] if idempotent else 0)
+        deadline = time.monotonic() + config["deadline"]
+
+        try:
+            async with asyncio.timeout(config["deadline"]):
+                for attempt in range(attempts):
+                    last = attempt == attempts - 1
+                    try:
+                        response = await self._attempt(provider, method, url, **kwargs)
+                    except httpx.TransportError as e:
+                        if last:
+                            logger.error(f"{provider} 호출 실패 ({attempt + 1}회 시도): {e!r}")
+                            raise provider_unavailable(provider, self._breakers[provider].retry_after())
+                        logger.warning(f"{provider} 호출 실패, 재시도: {e!r}")
+                    else:
+                        if last or response.status_code not in RETRY_STATUSES:
+                            return response
+                        logger.warning(f"{provider} 응답 {response.status_code}, 재시도")
+
+                    # 지수 백오프 + 전체 지터, 제한 시간을 넘기면 재시도하지 않음
+                    delay = random.uniform(0, config["retry_backoff"] * (2 ** attempt))
+                    if time.monotonic() + delay >= deadline:
+                        raise provider_unavailable(provider, 1)
+                    await asyncio.sleep(delay)
+        except TimeoutError:
+            logger.error(f"{provider} 호출 제한 시간 초과 ({config['deadline']}초): {method} {url}")
+            raise provider_unavailable(provider, self._breakers[provider].retry_after())
+
+    async def get(self, provider: str, url: str, **kwargs) -> httpx.Response:
+        return await self.request(provider, "GET", url, **kwargs)
+
+    async def post(self, provider: str, url: str, **kwargs) -> httpx.Response:
+        return await self.request(provider, "POST", url, **kwargs)
+
+    def stats(self) -> dict:
+        return {
+            "http2": self.http2,
+            "providers": {
+                name: {
+                    **self._latency[name].summary(),
+                    "circuit": self._breakers[name].stats(),
+                    "timeout": config["timeout"],
+                    "max_connections": config["max_connections"],
+                    "open": name in self._clients,
+                }
+                for name, config in self.providers.items()
+            },
+        }
+
+# 애플리케이션 전역 OAuth HTTP 클라이언트
+oauth_http = OAuthHttpClients()
@@ -0,0 +1,154 @@
+import os
+import time
+import socket
+import smtplib
+import logging
+import threading
+from email.message import Message
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# SMTP 서버 설정 (로컬 테스트 시 aiosmtpd 등으로 교체 가능: SMTP_HOST=localhost SMTP_PORT=8025 SMTP_USE_SSL=false)
+SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "465"))
+SMTP_USE_SSL = os.getenv("SMTP_USE_SSL", "true").lower() in ("1", "true", "yes")  # SMTPS (465)
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "false").lower() in ("1", "true", "yes")  # 평문 연결 후 STARTTLS (587)
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", "10"))  # 소켓 타임아웃(초)
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", "4"))  # 동시에 유지할 최대 연결 수
+SMTP_IDLE_TIMEOUT = float(os.getenv("SMTP_IDLE_TIMEOUT", "60"))  # 유휴 연결 유지 시간(초), 서버가 끊기 전에 정리
+
+# 연결이 끊어져 재연결이 필요한 오류
+# (SMTPException 은 OSError 의 하위 클래스이므로 OSError 전체가 아닌 연결 오류만 지정)
+# DATA 를 보낸 뒤의 오류는 서버가 이미 메일을 받았을 수 있으므로 재발송하지 않음 (중복 발송 방지)
+RECONNECT_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, ConnectionError, socket.timeout)
+
+# DATA 명령 시작 여부를 기록하는 SMTP 연결
+class DataTrackingMixin:
+    data_started = False
+
+    def data(self, msg):
+        self.data_started = True
+        return super().data(msg)
+
+class SMTPConnection(DataTrackingMixin, smtplib.SMTP):
+    pass
+
+class SMTPSSLConnection(DataTrackingMixin, smtplib.SMTP_SSL):
+    pass
+
+# 인증된 SMTP 연결을 재사용하는 메일 전송 풀
+# 발송 워커 또는 스레드 풀에서 동시에 호출될 수 있으므로 스레드 안전하게 구현
+class SMTPTransport:
+    def __init__(self, host: str = SMTP_HOST, port: int = SMTP_PORT, use_ssl: bool = SMTP_USE_SSL,
+                 starttls: bool = SMTP_STARTTLS, pool_size: int = SMTP_POOL_SIZE, idle_timeout: float = SMTP_IDLE_TIMEOUT,
+                 timeout: float = SMTP_TIMEOUT, username: str | None = None, password: str | None = None):
+        self.host = host
+        self.port = port
+        self.use_ssl = use_ssl
+        self.starttls = starttls
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.username = username if username is not None else os.getenv("EMAIL_ADDRESS")
+        self.password = password if password is not None else os.getenv("EMAIL_PASSWORD")
+        self._idle = []  # [(연결, 마지막 사용 시각)]
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(pool_size)  # 동시 연결 수 제한
+        self.sent = 0
+        self.connections_opened = 0
+        self.reconnects = 0
+
+    # 새 연결 생성 (TLS + 로그인)
+    def _connect(self) -> smtplib.SMTP:
+        if self.use_ssl:
+            conn = SMTPSSLConnection(self.host, self.port, timeout=self.timeout)
+        else:
+            conn = SMTPConnection(self.host, self.port, timeout=self.timeout)
+            if self.starttls:
+                conn.starttls()
+        if self.username and self.password:
+            conn.login(self.username, self.password)
+        self.connections_opened += 1
+        logger.info(f"SMTP 연결 생성: {self.host}:{self.port}")
+        return conn
+
+    # 유휴 연결 재사용, 없거나 오래된 경우 새로 연결
+    def _acquire(self) -> smtplib.SMTP:
+        now = time.monotonic()
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                conn, last_used = self._idle.pop()
+            if now - last_used <= self.idle_timeout:
+                return conn
+            self._close(conn)
+        return self._connect()
+
+    def _release(self, conn: smtplib.SMTP):
+        with self._lock:
+            self._idle.append((conn, time.monotonic()))
+
+    @staticmethod
+    def _close(conn: smtplib.SMTP):
+        try:
+            conn.quit()
+        except Exception:
+            conn.close()
+
+    # 메일 전송, 메일을 보내기 전(DATA 이전)에 연결이 끊어진 경우에만 한 번 재연결 후 재시도
+    def send(self, message: Message):
+        with self._slots:
+            for attempt in range(2):
+                conn = self._acquire() if attempt == 0 else self._connect()
+                conn.data_started = False
+                try:
+                    conn.send_message(message)
+                except smtplib.SMTPRecipientsRefused:
+                    # 수신자 거부 (예: 550): 연결은 정상이므로 재사용, 재발송하지 않음
+                    self._release(conn)
+                    raise
+                except RECONNECT_ERRORS as e:
+                    conn.close()
+                    if attempt == 0 and not conn.data_started:
+                        self.reconnects += 1
+                        logger.warning(f"SMTP 연결 끊김, 재연결 후 재시도: {e}")
+                        continue
+                    raise
+                except smtplib.SMTPResponseException as e:
+                    # 421: 서버가 연결 종료 예정 -> 재연결, 그 외 응답 오류는 연결 재사용 가능
+                    if e.smtp_code == 421 and attempt == 0:
+                        conn.close()
+                        self.reconnects += 1
+                        continue
+                    self._release(conn)
+                    raise
+                except Exception:
+                    conn.close()
+                    raise
+                self._release(conn)
+                self.sent += 1
+                return
+
+    # 모든 유휴 연결 종료 (애플리케이션 종료 시)
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self._close(conn)
+
+    def stats(self) -> dict:
+        return {
+            "host": f"{self.host}:{self.port}",
+            "pool_size": self.pool_size,
+            "idle_connections": len(self._idle),
+            "sent": self.sent,
+            "connections_opened": self.connections_opened,
+            "reconnects": self.reconnects,
+        }
+
+# 애플리케이션 전역 메일 전송 풀
+mail_transport = SMTPTransport()
@@ -0,0 +1,108 @@
+import os
+import logging
+import itertools
+from fastapi import HTTPException
+from sqlalchemy import select, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import Memo, utcnow
+from schemas import MemoBatchOperation, MemoBatchResult
+from service.change_feed import reserve_change_seq
+
+logger = logging.getLogger(__name__)
+
+# 메모 일괄 작업 (한 트랜잭션, 작업 종류별 일괄 SQL)
+MAX_BATCH_OPERATIONS = int(os.getenv("MEMO_BATCH_MAX_OPERATIONS", "500"))  # 요청 1건당 최대 작업 수
+MAX_TITLE_LENGTH = Memo.title.type.length
+MAX_CONTENT_LENGTH = Memo.content.type.length
+
+# 제목/내용 길이 검사, 문제가 있으면 오류 메시지 반환
+def validate_fields(op: MemoBatchOperation) -> str | None:
+    if op.title is not None and len(op.title) > MAX_TITLE_LENGTH:
+        return f"제목은 {MAX_TITLE_LENGTH}자 이하여야 합니다."
+    if op.content is not None and len(op.content) > MAX_CONTENT_LENGTH:
+        return f"내용은 {MAX_CONTENT_LENGTH}자 이하여야 합니다."
+    return None
+
+# 일괄 작업 적용, 작업별 결과 반환 (commit 은 호출한 쪽에서 수행)
+# 잘못된 작업은 해당 작업만 실패로 표시하고 나머지는 적용
+async def apply_memo_batch(db: AsyncSession, user_id: int, operations: list[MemoBatchOperation]) -> list[MemoBatchResult]:
+    if len(operations) > MAX_BATCH_OPERATIONS:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {MAX_BATCH_OPERATIONS}개의 작업만 요청할 수 있습니다.")
+
+    results: list[MemoBatchResult | None] = [None] * len(operations)
+    creates, updates, deletes = [], [], []  # (요청 순서, 작업)
+    targets = set()
+
+    # 1. 작업별 입력 검사
+    for index, op in enumerate(operations):
+        fail = lambda status, error: MemoBatchResult(index=index, op=op.op, id=op.id, status=status, error=error)
+        error = validate_fields(op)
+        if error:
+            results[index] = fail(400, error)
+        elif op.op == "create":
+            if not op.title or not op.content:
+                results[index] = fail(400, "제목과 내용을 입력해 주세요.")
+            else:
+                creates.append((index, op))
+        elif op.id is None:
+            results[index] = fail(400, "메모 ID가 필요합니다.")
+        elif op.op == "update" and op.title is None and op.content is None:
+            results[index] = fail(400, "수정할 내용이 없습니다.")
+        elif op.id in targets:
+            results[index] = fail(400, "같은 메모에 대한 작업이 중복되었습니다.")
+        else:
+            targets.add(op.id)
+            (updates if op.op == "update" else deletes).append((index, op))
+
+    # 2. 수정/삭제 대상 소유 여부와 버전 확인 (한 번의 SELECT ... FOR UPDATE, 확인 후 커밋까지 다른 수정 차단)
+    if targets:
+        owned = dict((await db.execute(
+            select(Memo.id, Memo.version)
+            .where(Memo.id.in_(targets), Memo.user_id == user_id, Memo.deleted_at.is_(None))
+            .with_for_update()
+        )).all())
+        for index, op in updates + deletes:
+            if op.id not in owned:
+                results[index] = MemoBatchResult(index=index, op=op.op, id=op.id, status=404, error="Memo를 찾을 수 없습니다.")
+            elif op.version is not None and op.version != owned[op.id]:
+                results[index] = MemoBatchResult(index=index, op=op.op, id=op.id, status=412, error="다른 곳에서 메모가 수정되었습니다.")
+        updates = [(index, op) for index, op in updates if results[index] is None]
+        deletes = [(index, op) for index, op in deletes if results[index] is None]
+
+    # 적용할 작업 수만큼 변경 번호를 한 번에 예약
+    count = len(creates) + len(updates) + len(deletes)
+    next_seq = itertools.count(await reserve_change_seq(db, user_id, count)) if count else None
+
+    # 수정/삭제 대상 버전 증가 (한 번의 UPDATE)
+    changed = [op.id for _, op in updates + deletes]
+    if changed:
+        await db.execute(
+            update(Memo).where(Memo.id.in_(changed)).values(version=Memo.version + 1).execution_options(synchronize_session=False)
+        )
+
+    # 3. 생성: 다중 행 INSERT ... RETURNING (요청 순서대로 ID 반환)
+    if creates:
+        rows = [{"user_id": user_id, "title": op.title, "content": op.content, "change_seq": next(next_seq)} for _, op in creates]
+        new_ids = (await db.scalars(insert(Memo).returning(Memo.id, sort_by_parameter_order=True), rows)).all()
+        for (index, op), memo_id in zip(creates, new_ids):
+            results[index] = MemoBatchResult(index=index, op=op.op, id=memo_id, version=1, status=201)
+
+    # 4. 수정: 기본 키 기준 일괄 UPDATE (변경할 컬럼 조합별로 executemany)
+    if updates:
+        rows = [
+            {"id": op.id, "change_seq": next(next_seq), **{field: getattr(op, field) for field in ("title", "content") if getattr(op, field) is not None}}
+            for _, op in updates
+        ]
+        await db.execute(update(Memo), rows)
+        for index, op in updates:
+            results[index] = MemoBatchResult(index=index, op=op.op, id=op.id, version=owned[op.id] + 1, status=200)
+
+    # 5. 삭제: 기본 키 기준 일괄 UPDATE 로 삭제 시각 기록 (메모마다 다른 변경 번호)
+    if deletes:
+        now = utcnow()
+        await db.execute(update(Memo), [{"id": op.id, "deleted_at": now, "change_seq": next(next_seq)} for _, op in deletes])
+        for index, op in deletes:
+            results[index] = MemoBatchResult(index=index, op=op.op, id=op.id, version=owned[op.id] + 1, status=200)
+
+    logger.info(f"사용자 ID {user_id} 메모 일괄 작업: 생성 {len(creates)}, 수정 {len(updates)}, 삭제 {len(deletes)}")
+    return results
@@ -0,0 +1,228 @@
+import os
+import json
+import random
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable
+from schemas import MemoChange
+
+logger = logging.getLogger(__name__)
+
+# 메모 실시간 알림 (Server-Sent Events)
+# 메모가 생성/수정/삭제/복구되면 같은 사용자의 열린 탭/기기로 변경 내역(MemoChange)을 전송
+# 워커가 여러 개면 Redis Pub/Sub 백엔드로 다른 워커의 구독자에게도 전달
+MEMO_EVENTS_REDIS_URL = os.getenv("MEMO_EVENTS_REDIS_URL")  # 설정 시 워커 간 공유 (redis 패키지 필요)
+MEMO_EVENTS_CHANNEL = os.getenv("MEMO_EVENTS_CHANNEL", "memo-events")
+MEMO_EVENTS_HEARTBEAT = float(os.getenv("MEMO_EVENTS_HEARTBEAT", "15"))  # 연결 유지용 주석 전송 간격(초)
+MEMO_EVENTS_QUEUE_SIZE = int(os.getenv("MEMO_EVENTS_QUEUE_SIZE", "100"))  # 구독자별 대기 이벤트 수
+MEMO_EVENTS_RETRY_MS = 3000  # 연결이 끊긴 경우 브라우저 재연결 간격
+MEMO_EVENTS_RECONNECT_BASE = float(os.getenv("MEMO_EVENTS_RECONNECT_BASE", "0.5"))  # Redis 재연결 기본 대기 시간(초), 실패마다 2배
+MEMO_EVENTS_RECONNECT_MAX = float(os.getenv("MEMO_EVENTS_RECONNECT_MAX", "30"))  # Redis 재연결 최대 대기 시간(초)
+
+# SSE 메시지 (발행 시 한 번만 직렬화하고 모든 구독자가 공유)
+def format_event(event: str, data: str, event_id: int | None = None) -> str:
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")  # 재연결 시 Last-Event-ID 로 돌아옴 (change_seq)
+    lines.extend(f"data: {line}" for line in data.splitlines() or [""])
+    return "\n".join(lines) + "\n\n"
+
+def change_event(change: MemoChange) -> str:
+    return format_event("memo", change.model_dump_json(), change.change_seq)
+
+# 메시지의 이벤트 ID (change_seq), 없으면 None
+def event_seq(message: str) -> int | None:
+    for line in message.split("\n", 2)[:2]:
+        if line.startswith("id: "):
+            return int(line[4:])
+    return None
+
+# 놓친 변경이 너무 많거나 큐가 넘친 경우: 클라이언트가 목록을 다시 불러오도록 알림
+RESYNC_EVENT = format_event("resync", "{}")
+
+# 인메모리 백엔드 (워커 단위, 발행 즉시 같은 워커의 구독자에게 전달)
+class MemoryBackend:
+    async def start(self, dispatch: Callable[[int, str], None], resync_all: Callable[[], None]):
+        self.dispatch = dispatch
+
+    async def publish(self, user_id: int, message: str):
+        self.dispatch(user_id, message)
+
+    async def close(self):
+        pass
+
+# Redis 백엔드 (워커/서버 간 공유), 모든 워커가 하나의 채널을 구독하고 자기 구독자에게만 전달
+# 구독 연결이 끊기면 대기 시간을 늘려 가며 다시 구독하고, 끊긴 동안의 알림은 받을 수 없으므로
+# 재연결 후 이 워커의 모든 구독자에게 resync 알림 (목록을 다시 불러옴)
+class RedisBackend:
+    def __init__(self, client, channel: str = MEMO_EVENTS_CHANNEL):
+        self.client = client  # redis.asyncio.Redis 호환 클라이언트
+        self.channel = channel
+        self.reconnects = 0
+        self._task = None
+
+    async def start(self, dispatch: Callable[[int, str], None], resync_all: Callable[[], None]):
+        pubsub = await self._subscribe()  # 시작 시에는 바로 구독 (설정 오류는 서버 시작 시 드러나도록)
+        self._task = asyncio.create_task(self._run(pubsub, dispatch, resync_all))
+
+    async def _subscribe(self):
+        pubsub = self.client.pubsub()
+        try:
+            await pubsub.subscribe(self.channel)
+        except BaseException:
+            await pubsub.aclose()
+            raise
+        return pubsub
+
+    async def _run(self, pubsub, dispatch, resync_all):
+        while True:
+            try:
+                await self._listen(pubsub, dispatch)
+                logger.warning("메모 알림 구독이 종료되었습니다. 다시 구독합니다.")
+            except Exception as e:
+                logger.warning(f"메모 알림 구독 연결 끊김: {e}")
+            finally:
+                await asyncio.gather(pubsub.aclose(), return_exceptions=True)
+
+            pubsub = await self._reconnect()
+            self.reconnects += 1
+            resync_all()  # 끊긴 동안 놓친 알림이 있을 수 있음
+
+    # 구독이 될 때까지 재시도 (지수 백오프 + 지터)
+    async def _reconnect(self):
+        attempt = 0
+        while True:
+            delay = min(MEMO_EVENTS_RECONNECT_BASE * (2 ** attempt), MEMO_EVENTS_RECONNECT_MAX)
+            await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+            try:
+                pubsub = await self._subscribe()
+                logger.info(f"메모 알림 다시 구독 ({attempt + 1}번째 시도)")
+                return pubsub
+            except Exception as e:
+                attempt += 1
+                logger.warning(f"메모 알림 다시 구독 실패 ({attempt}번째): {e}")
+
+    async def _listen(self, pubsub, dispatch):
+        async for item in pubsub.listen():
+            if item.get("type") != "message":
+                continue
+            try:
+                payload = json.loads(item["data"])
+                dispatch(payload["user_id"], payload["message"])
+            except Exception as e:
+                logger.error(f"메모 알림 수신 처리 실패: {e}")
+
+    async def publish(self, user_id: int, message: str):
+        await self.client.publish(self.channel, json.dumps({"user_id": user_id, "message": message}))
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        await self.client.aclose()
+
+# 설정에 따라 백엔드 생성
+def create_backend():
+    if MEMO_EVENTS_REDIS_URL:
+        import redis.asyncio as redis  # 공유 백엔드 사용 시에만 필요
+        return RedisBackend(redis.from_url(MEMO_EVENTS_REDIS_URL))
+    return MemoryBackend()
+
+class MemoEventBroker:
+    def __init__(self, backend=None):
+        self.backend = backend or create_backend()
+        self._subscribers: dict[int, set[asyncio.Queue]] = {}  # user_id -> 연결별 큐
+        self.published = 0
+        self.delivered = 0
+        self.overflowed = 0
+
+    # 다른 백엔드로 교체 (테스트, 공유 저장소 사용 시)
+    def set_backend(self, backend):
+        self.backend = backend
+
+    async def start(self):
+        await self.backend.start(self.dispatch, self.resync_all)
+
+    async def close(self):
+        await self.backend.close()
+
+    # 같은 워커의 구독자에게 전달 (느린 구독자는 큐를 비우고 resync 알림)
+    def dispatch(self, user_id: int, message: str):
+        for queue in self._subscribers.get(user_id, ()):
+            try:
+                queue.put_nowait(message)
+                self.delivered += 1
+            except asyncio.QueueFull:
+                self.overflowed += 1
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(RESYNC_EVENT)
+
+    # 같은 워커의 모든 구독자에게 resync 알림 (공유 백엔드 재연결 후)
+    def resync_all(self):
+        for user_id in list(self._subscribers):
+            self.dispatch(user_id, RESYNC_EVENT)
+
+    # 변경 내역 발행 (commit 후 호출, 실패해도 요청은 성공 처리)
+    async def publish(self, user_id: int, *changes: MemoChange):
+        try:
+            for change in changes:
+                await self.backend.publish(user_id, change_event(change))
+                self.published += 1
+        except Exception as e:
+            logger.error(f"메모 알림 발행 실패: 사용자 ID {user_id}: {e}")
+
+    async def publish_resync(self, user_id: int):
+        try:
+            await self.backend.publish(user_id, RESYNC_EVENT)
+            self.published += 1
+        except Exception as e:
+            logger.error(f"메모 알림 발행 실패: 사용자 ID {user_id}: {e}")
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: int) -> AsyncIterator[asyncio.Queue]:
+        queue = asyncio.Queue(maxsize=MEMO_EVENTS_QUEUE_SIZE)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            subscribers = self._subscribers.get(user_id)
+            subscribers.discard(queue)
+            if not subscribers:
+                del self._subscribers[user_id]
+
+    # SSE 응답 본문: 구독을 먼저 시작한 뒤 놓친 변경(replay) 조회/전송, 이후 새 이벤트 (연결이 끊기면 Starlette 가 취소)
+    # 조회와 구독 사이에 커밋된 변경은 양쪽에 모두 있을 수 있으므로 이미 보낸 change_seq 이하는 건너뜀
+    async def stream(self, user_id: int, replay: Callable[[], Awaitable[list[str]]] | None = None) -> AsyncIterator[str]:
+        async with self.subscribe(user_id) as queue:
+            yield f"retry: {MEMO_EVENTS_RETRY_MS}\n\n"
+            replayed_seq = 0
+            if replay is not None:
+                for message in await replay():
+                    replayed_seq = max(replayed_seq, event_seq(message) or 0)
+                    yield message
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=MEMO_EVENTS_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"  # 프록시가 유휴 연결을 끊지 않도록
+                    continue
+                seq = event_seq(message)
+                if seq is not None and seq <= replayed_seq:
+                    continue
+                yield message
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__,
+            "users": len(self._subscribers),
+            "connections": sum(len(queues) for queues in self._subscribers.values()),
+            "published": self.published,
+            "delivered": self.delivered,
+            "overflowed": self.overflowed,
+            "reconnects": getattr(self.backend, "reconnects", 0),
+        }
+
+# 애플리케이션 전역 메모 알림 브로커
+memo_events = MemoEventBroker()
@@ -0,0 +1,82 @@
+import io
+import os
+import csv
+import json
+import zlib
+import logging
+from typing import AsyncIterator
+from sqlalchemy import select
+from database import AsyncSessionLocal
+from models import Memo
+
+logger = logging.getLogger(__name__)
+
+# 메모 내보내기 (서버 측 커서로 조금씩 읽어 바로 전송, 메모 수와 무관하게 메모리 사용량 일정)
+EXPORT_BATCH_SIZE = int(os.getenv("MEMO_EXPORT_BATCH_SIZE", "1000"))  # 커서에서 한 번에 가져올 행 수
+EXPORT_FIELDS = ("id", "title", "content")
+
+# 형식별 응답 Content-Type
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "json": "application/json",
+}
+
+# 사용자의 메모를 배치 단위로 조회 (요청 의존성 세션은 응답 전송 전에 닫히므로 별도 세션 사용)
+async def stream_memo_batches(user_id: int, batch_size: int = EXPORT_BATCH_SIZE) -> AsyncIterator[list]:
+    query = (
+        select(Memo.id, Memo.title, Memo.content)
+        .where(Memo.user_id == user_id, Memo.deleted_at.is_(None))
+        .order_by(Memo.id)
+        .execution_options(yield_per=batch_size)  # 서버 측 커서 (stream_results)
+    )
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(query)
+        async for rows in result.partitions():
+            yield rows
+
+# 배치 하나를 형식에 맞는 문자열로 변환
+def format_ndjson(rows, first: bool) -> str:
+    return "".join(json.dumps(dict(zip(EXPORT_FIELDS, row)), ensure_ascii=False) + "\n" for row in rows)
+
+def format_csv(rows, first: bool) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if first:
+        buffer.write("\ufeff")  # 엑셀에서 한글이 깨지지 않도록 BOM 추가
+        writer.writerow(EXPORT_FIELDS)
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+def format_json(rows, first: bool) -> str:
+    items = ",\n".join(json.dumps(dict(zip(EXPORT_FIELDS, row)), ensure_ascii=False) for row in rows)
+    return items if first else ",\n" + items
+
+FORMATTERS = {"ndjson": format_ndjson, "csv": format_csv, "json": format_json}
+
+# 내보내기 본문 생성
+async def export_memos(user_id: int, export_format: str) -> AsyncIterator[bytes]:
+    formatter = FORMATTERS[export_format]
+    first = True
+    count = 0
+
+    if export_format == "json":
+        yield b"[\n"
+    async for rows in stream_memo_batches(user_id):
+        yield formatter(rows, first).encode("utf-8")
+        first = False
+        count += len(rows)
+    if export_format == "json":
+        yield b"\n]\n"
+    elif export_format == "csv" and first:
+        yield format_csv([], True).encode("utf-8")  # 메모가 없어도 헤더는 전송
+
+    logger.info(f"사용자 ID {user_id} 메모 내보내기 완료: {count}개 ({export_format})")
+
+# gzip 압축 스트림
+async def gzip_stream(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31: gzip 헤더 포함
+    async for chunk in chunks:
+        # 배치마다 flush 하여 압축 중에도 바로 전송
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
@@ -0,0 +1,185 @@
+import os
+import csv
+import json
+import zlib
+import codecs
+import tempfile
+import logging
+from typing import AsyncIterator
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException
+from models import Memo, utcnow
+from schemas import MemoCreate, MemoImportResult, MemoImportError
+from service.memo_batch import MAX_TITLE_LENGTH, MAX_CONTENT_LENGTH
+from service.change_feed import reserve_change_seq
+
+logger = logging.getLogger(__name__)
+
+# 메모 가져오기 (NDJSON / CSV 업로드를 스트림으로 읽어 청크 단위로 일괄 INSERT)
+# PostgreSQL 은 COPY, 그 외 DB 는 executemany 사용
+IMPORT_CHUNK_SIZE = int(os.getenv("MEMO_IMPORT_CHUNK_SIZE", "5000"))  # 한 번에 저장할 행 수
+IMPORT_MAX_ROWS = int(os.getenv("MEMO_IMPORT_MAX_ROWS", "100000"))  # 요청 1건당 최대 행 수
+IMPORT_MAX_ERRORS = 100  # 응답에 포함할 최대 오류 수
+IMPORT_MAX_LINE_LENGTH = int(os.getenv("MEMO_IMPORT_MAX_LINE_LENGTH", "8192"))  # 한 줄(CSV 는 한 행) 최대 길이(문자), 메모 한 건은 약 1.1KB
+IMPORT_SPOOL_MEMORY = int(os.getenv("MEMO_IMPORT_SPOOL_MEMORY", str(8 * 1024 * 1024)))  # 검사한 행을 메모리에 둘 최대 크기, 넘으면 임시 파일 사용
+IMPORT_MAX_BYTES = int(os.getenv("MEMO_IMPORT_MAX_BYTES", str(64 * 1024 * 1024)))  # 요청 1건당 최대 본문 크기(압축 해제 후)
+DECOMPRESS_STEP = 64 * 1024  # 한 번에 압축 해제할 최대 크기 (압축 폭탄 방지)
+
+def line_too_long() -> HTTPException:
+    return HTTPException(status_code=413, detail=f"한 줄은 최대 {IMPORT_MAX_LINE_LENGTH}자까지 가져올 수 있습니다.")
+
+# 업로드 본문을 크기 제한을 확인하며 읽기 (gzip 은 DECOMPRESS_STEP 씩 나누어 압축 해제)
+async def read_body(chunks: AsyncIterator[bytes], gzipped: bool = False) -> AsyncIterator[bytes]:
+    decompressor = zlib.decompressobj(47) if gzipped else None  # wbits=47: gzip/zlib 자동 감지
+    total = 0
+    async for chunk in chunks:
+        while chunk:
+            if decompressor:
+                data = decompressor.decompress(chunk, DECOMPRESS_STEP)
+                chunk = decompressor.unconsumed_tail  # 남은 입력은 다음 반복에서 이어서 해제
+            else:
+                data, chunk = chunk, b""
+            total += len(data)
+            if total > IMPORT_MAX_BYTES:
+                raise HTTPException(status_code=413, detail=f"업로드 크기는 최대 {IMPORT_MAX_BYTES // (1024 * 1024)}MB 입니다.")
+            if data:
+                yield data
+
+# 업로드 본문을 줄 단위로 읽기 (gzip 압축 업로드 지원), (줄 번호, 줄) 반환
+async def read_lines(chunks: AsyncIterator[bytes], gzipped: bool = False) -> AsyncIterator[tuple[int, str]]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")  # BOM 제거
+    buffer = ""
+    line_no = 0
+    async for data in read_body(chunks, gzipped):
+        buffer += decoder.decode(data)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            if len(line) > IMPORT_MAX_LINE_LENGTH:
+                raise line_too_long()
+            line_no += 1
+            yield line_no, line.rstrip("\r")
+        if len(buffer) > IMPORT_MAX_LINE_LENGTH:
+            raise line_too_long()  # 줄바꿈 없이 계속 이어지는 본문
+    buffer += decoder.decode(b"", final=True)
+    if len(buffer) > IMPORT_MAX_LINE_LENGTH:
+        raise line_too_long()
+    if buffer:
+        yield line_no + 1, buffer.rstrip("\r")
+
+# NDJSON: 한 줄에 JSON 객체 하나, (줄 번호, 데이터 또는 오류 메시지) 반환
+async def parse_ndjson(lines: AsyncIterator[tuple[int, str]]) -> AsyncIterator[tuple[int, dict | str]]:
+    async for line_no, line in lines:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_no, f"JSON 형식 오류: {e.msg}"
+            continue
+        yield line_no, record if isinstance(record, dict) else "JSON 객체가 아닙니다."
+
+# CSV: 첫 줄은 헤더 (title, content 필수, 그 외 컬럼은 무시)
+# 따옴표 안의 줄바꿈을 처리하기 위해 따옴표 수가 짝수가 될 때까지 줄을 모아서 한 행으로 파싱
+async def parse_csv(lines: AsyncIterator[tuple[int, str]]) -> AsyncIterator[tuple[int, dict | str]]:
+    header = None
+    pending, start = [], 0
+    async for line_no, line in lines:
+        if not pending:
+            start = line_no
+        pending.append(line)
+        record = "\n".join(pending)
+        if len(record) > IMPORT_MAX_LINE_LENGTH:
+            raise line_too_long()  # 따옴표 안에서 여러 줄로 이어지는 행
+        if record.count('"') % 2:
+            continue  # 따옴표가 닫히지 않음, 다음 줄과 이어서 파싱
+        pending = []
+        if not record.strip():
+            continue
+
+        values = next(csv.reader([record]))
+        if header is None:
+            header = [name.strip().lower() for name in values]
+            if "title" not in header or "content" not in header:
+                raise HTTPException(status_code=400, detail="CSV 첫 줄에 title, content 컬럼이 있어야 합니다.")
+            continue
+        yield start, dict(zip(header, values))
+
+    if pending:
+        yield start, "닫히지 않은 따옴표가 있습니다."
+
+# 한 행 검사 (MemoCreate 스키마 + 길이 제한), 오류 메시지 반환
+def validate_row(record: dict) -> tuple[MemoCreate | None, str | None]:
+    try:
+        memo = MemoCreate.model_validate({"title": record.get("title"), "content": record.get("content")})
+    except ValidationError as e:
+        return None, "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+    if not memo.title or not memo.content:
+        return None, "제목과 내용을 입력해 주세요."
+    if len(memo.title) > MAX_TITLE_LENGTH:
+        return None, f"제목은 {MAX_TITLE_LENGTH}자 이하여야 합니다."
+    if len(memo.content) > MAX_CONTENT_LENGTH:
+        return None, f"내용은 {MAX_CONTENT_LENGTH}자 이하여야 합니다."
+    return memo, None
+
+# 청크 저장 (PostgreSQL: COPY, 그 외: executemany)
+async def insert_chunk(db: AsyncSession, user_id: int, memos: list[MemoCreate]):
+    first_seq = await reserve_change_seq(db, user_id, len(memos))
+    now = utcnow()
+    rows = [
+        {"user_id": user_id, "title": memo.title, "content": memo.content, "created_at": now, "updated_at": now, "change_seq": first_seq + i}
+        for i, memo in enumerate(memos)
+    ]
+    if db.bind.dialect.name == "postgresql":
+        # COPY 는 컬럼 기본값(Python 측)을 적용하지 않으므로 모든 값을 직접 전달
+        conn = await db.connection()
+        raw = await conn.get_raw_connection()
+        columns = list(rows[0])
+        await raw.driver_connection.copy_records_to_table(
+            "memo", records=[tuple(row[column] for column in columns) for row in rows], columns=columns
+        )
+    else:
+        await db.execute(insert(Memo), rows)
+
+# 가져오기 실행 (commit 은 호출한 쪽에서 수행, 하나의 트랜잭션으로 모두 저장하거나 모두 취소)
+# 업로드를 끝까지 읽고 검사한 행은 임시 저장한 뒤 저장 시작
+# (변경 번호 예약이 사용자 행을 잠그므로, 느린 업로드를 읽는 동안 같은 사용자의 다른 쓰기를 막지 않도록)
+async def import_memos(db: AsyncSession, user_id: int, chunks: AsyncIterator[bytes], import_format: str,
+                       gzipped: bool = False, chunk_size: int = IMPORT_CHUNK_SIZE) -> MemoImportResult:
+    parser = parse_csv if import_format == "csv" else parse_ndjson
+    valid = failed = 0
+    errors = []
+
+    with tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_MEMORY, mode="w+", encoding="utf-8") as spool:
+        # 1. 읽기 + 검사 (DB 사용 안 함)
+        async for line_no, record in parser(read_lines(chunks, gzipped)):
+            memo, error = (None, record) if isinstance(record, str) else validate_row(record)
+            if error:
+                failed += 1
+                if len(errors) < IMPORT_MAX_ERRORS:
+                    errors.append(MemoImportError(line=line_no, error=error))
+                continue
+
+            if valid >= IMPORT_MAX_ROWS:
+                raise HTTPException(status_code=413, detail=f"한 번에 최대 {IMPORT_MAX_ROWS}개의 메모만 가져올 수 있습니다.")
+            spool.write(json.dumps([memo.title, memo.content], ensure_ascii=False) + "\n")
+            valid += 1
+
+        # 2. 청크 단위 일괄 저장
+        spool.seek(0)
+        imported = 0
+        batch = []
+        for line in spool:
+            title, content = json.loads(line)
+            batch.append(MemoCreate.model_construct(title=title, content=content))  # 이미 검사한 행
+            if len(batch) >= chunk_size:
+                await insert_chunk(db, user_id, batch)
+                imported += len(batch)
+                batch = []
+        if batch:
+            await insert_chunk(db, user_id, batch)
+            imported += len(batch)
+
+    logger.info(f"사용자 ID {user_id} 메모 가져오기: 성공 {imported}, 실패 {failed} ({import_format})")
+    return MemoImportResult(imported=imported, failed=failed, errors=errors)
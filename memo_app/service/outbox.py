@@ -0,0 +1,87 @@
+import json
+import os
+import random
+import logging
+from datetime import timedelta
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+from models import EmailOutbox, utcnow
+from service.email_class import EmailServiceWelcome, EmailServiceBye, EmailServiceFindId, EmailServiceSendTempPW, EmailServiceSendNewPW
+
+logger = logging.getLogger(__name__)
+
+# 이메일 발송 대기열 (outbox)
+# 웹 요청은 대기열에 행만 추가하고, 실제 SMTP 발송은 outbox_worker.py 가 담당
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "20"))  # 한 번에 가져올 이메일 수
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "5"))  # 최대 발송 시도 횟수
+OUTBOX_RETRY_BASE = float(os.getenv("OUTBOX_RETRY_BASE", "30"))  # 재시도 기본 대기 시간(초), 시도마다 2배
+
+# 이메일 종류별 발송 함수
+EMAIL_SENDERS = {
+    "welcome": lambda to, payload: EmailServiceWelcome().send_email(receiver_email=to),
+    "bye": lambda to, payload: EmailServiceBye().send_email(receiver_email=to),
+    "find_id": lambda to, payload: EmailServiceFindId().send_email(receiver_email=to, username=payload["username"]),
+    "temp_pw": lambda to, payload: EmailServiceSendTempPW().send_email(
+        receiver_email=to, username=payload["username"], temp_password=payload["temp_password"]),
+    "changed_pw": lambda to, payload: EmailServiceSendNewPW().send_email(receiver_email=to, username=payload["username"]),
+}
+
+# 대기열에 이메일 추가 (commit 은 호출한 쪽에서 사용자 변경과 함께 수행)
+def enqueue_email(db, kind: str, recipient: str, **payload) -> EmailOutbox:
+    if kind not in EMAIL_SENDERS:
+        raise ValueError(f"알 수 없는 이메일 종류: {kind}")
+    entry = EmailOutbox(kind=kind, recipient=recipient, payload=json.dumps(payload) if payload else None)
+    db.add(entry)
+    return entry
+
+# 발송 대상 가져오기 (다른 워커가 처리 중인 행은 건너뜀)
+def claim_batch(db: Session, batch_size: int = OUTBOX_BATCH_SIZE) -> list[EmailOutbox]:
+    query = (
+        select(EmailOutbox)
+        .where(EmailOutbox.status == "pending", EmailOutbox.next_attempt_at <= utcnow())
+        .order_by(EmailOutbox.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)  # SELECT ... FOR UPDATE SKIP LOCKED (SQLite 에서는 무시)
+    )
+    return list(db.scalars(query).all())
+
+# 이메일 1건 발송 및 결과 기록
+def deliver(entry: EmailOutbox):
+    entry.attempts += 1
+    try:
+        EMAIL_SENDERS[entry.kind](entry.recipient, json.loads(entry.payload) if entry.payload else {})
+    except Exception as e:
+        entry.last_error = str(e)[:500]
+        if entry.attempts >= OUTBOX_MAX_ATTEMPTS:
+            entry.status = "failed"
+            entry.payload = None  # 임시 비밀번호 등 민감 정보 삭제
+            logger.error(f"이메일 발송 최종 실패 (ID {entry.id}, {entry.kind}): {e}")
+        else:
+            # 지수 백오프 + 지터
+            delay = OUTBOX_RETRY_BASE * (2 ** (entry.attempts - 1)) * random.uniform(0.5, 1.5)
+            entry.next_attempt_at = utcnow() + timedelta(seconds=delay)
+            logger.warning(f"이메일 발송 실패 (ID {entry.id}, {entry.attempts}회), {delay:.0f}초 후 재시도: {e}")
+        return False
+
+    entry.status = "sent"
+    entry.sent_at = utcnow()
+    entry.last_error = None
+    entry.payload = None  # 임시 비밀번호 등 민감 정보 삭제
+    return True
+
+# 대기열 1회 처리, 처리한 건수 반환
+def process_batch(db: Session, batch_size: int = OUTBOX_BATCH_SIZE) -> int:
+    entries = claim_batch(db, batch_size)
+    for entry in entries:
+        deliver(entry)
+    db.commit()  # 발송 결과 저장 + 행 잠금 해제
+    return len(entries)
+
+# 대기열 현황 (상태별 건수, 가장 오래된 대기 건의 생성 시각)
+async def outbox_stats(db) -> dict:
+    rows = await db.execute(select(EmailOutbox.status, func.count()).group_by(EmailOutbox.status))
+    oldest = await db.scalar(select(func.min(EmailOutbox.created_at)).where(EmailOutbox.status == "pending"))
+    return {
+        "counts": {status: count for status, count in rows.all()},
+        "oldest_pending_at": oldest.isoformat() if oldest else None,
+    }
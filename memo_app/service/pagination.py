@@ -0,0 +1,43 @@
+import base64
+import json
+from fastapi import HTTPException
+
+# 페이지 크기 설정
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# 페이지 크기 보정 (1 ~ MAX_PAGE_SIZE)
+def clamp_limit(limit: int | None) -> int:
+    if not limit or limit < 1:
+        return DEFAULT_PAGE_SIZE
+    return min(limit, MAX_PAGE_SIZE)
+
+# 커서 인코딩: 클라이언트에는 불투명한 문자열로 전달
+def encode_cursor(values: dict) -> str:
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+# 커서 디코딩: 잘못된 커서는 400 반환
+def decode_cursor(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+    if not isinstance(values, dict):
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+    return values
+
+# id 기반 커서에서 id 추출
+def cursor_id(cursor: str) -> int:
+    value = decode_cursor(cursor).get("id")
+    if not isinstance(value, int):
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+    return value
+
+# 변경 번호 커서에서 번호 추출
+def cursor_seq(cursor: str) -> int:
+    value = decode_cursor(cursor).get("seq")
+    if not isinstance(value, int) or value < 0:
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+    return value
@@ -0,0 +1,54 @@
+import argparse
+import statistics
+import time
+from passlib.hash import bcrypt
+
+# bcrypt 비용(rounds) 산정 도구
+# 서버에서 rounds 별 해시 시간을 측정하고, 목표 시간 이하에서 가장 높은 rounds 를 추천
+# 사용법: python -m service.password_calibration --target-ms 250
+
+MIN_ROUNDS = 10  # OWASP 권장 최소값
+MAX_ROUNDS = 16
+
+# rounds 별 해시 시간 측정 (중앙값, 밀리초)
+def measure(rounds: int, samples: int) -> float:
+    hasher = bcrypt.using(rounds=rounds)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        hasher.hash("calibration-password")
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+# 목표 시간에 맞는 rounds 추천
+def calibrate(target_ms: float, samples: int = 3) -> tuple[int, dict]:
+    results = {}
+    recommended = MIN_ROUNDS
+    for rounds in range(MIN_ROUNDS, MAX_ROUNDS + 1):
+        elapsed = measure(rounds, samples)
+        results[rounds] = elapsed
+        if elapsed > target_ms:
+            break  # rounds 가 1 증가할 때마다 시간이 2배가 되므로 더 측정할 필요 없음
+        recommended = rounds
+    return recommended, results
+
+def main():
+    parser = argparse.ArgumentParser(description="bcrypt 비용(rounds) 산정")
+    parser.add_argument("--target-ms", type=float, default=250, help="로그인 1회당 목표 해시 시간(밀리초)")
+    parser.add_argument("--samples", type=int, default=3, help="rounds 별 측정 횟수")
+    args = parser.parse_args()
+
+    recommended, results = calibrate(args.target_ms, args.samples)
+    for rounds, elapsed in results.items():
+        marker = " <- 추천" if rounds == recommended else ""
+        print(f"rounds={rounds:2d}: {elapsed:8.1f} ms{marker}")
+
+    if results[recommended] > args.target_ms:
+        print(f"최소 rounds({MIN_ROUNDS})도 목표 시간을 초과합니다. 목표 시간 또는 서버 사양을 확인하세요.")
+
+    # 해시 1회당 시간으로 해시 스레드 1개가 처리할 수 있는 초당 로그인 수 추정
+    print(f"예상 처리량: 해시 스레드당 초당 약 {1000 / results[recommended]:.1f}회 로그인")
+    print(f"\n.env 설정: BCRYPT_ROUNDS={recommended}")
+
+if __name__ == "__main__":
+    main()
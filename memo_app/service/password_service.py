@@ -0,0 +1,86 @@
+import os
+import time
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException
+from dependencies import pwd_context
+
+logger = logging.getLogger(__name__)
+
+# 비밀번호 해시/검증 전용 스레드 풀 설정
+# bcrypt 는 해시 계산 중 GIL 을 해제하므로 스레드 풀로도 이벤트 루프를 막지 않고 병렬 처리 가능
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))  # 동시 해시 작업 수
+PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", "32"))  # 대기 가능한 작업 수 (초과 시 503)
+
+class PasswordHasher:
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, max_queue: int = PASSWORD_HASH_QUEUE):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self.in_flight = 0  # 실행 중 + 대기 중인 작업 수
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait = 0.0  # 누적 대기 시간(초)
+        self.total_run = 0.0  # 누적 해시 계산 시간(초)
+        self.max_latency = 0.0  # 최대 처리 시간(대기 + 계산, 초)
+
+    # 스레드 풀에서 실행, 대기열이 가득 차면 즉시 거절
+    async def _run(self, func, *args):
+        if self.in_flight >= self.workers + self.max_queue:
+            self.rejected += 1
+            logger.warning(f"비밀번호 해시 작업 거절: 대기열 초과 ({self.in_flight})")
+            raise HTTPException(status_code=503, detail="요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해 주세요.",
+                                headers={"Retry-After": "1"})
+
+        self.in_flight += 1
+        submitted = time.perf_counter()
+
+        def timed():
+            started = time.perf_counter()
+            return started, func(*args)
+
+        try:
+            started, result = await asyncio.get_running_loop().run_in_executor(self._executor, timed)
+        finally:
+            self.in_flight -= 1
+
+        finished = time.perf_counter()
+        self.completed += 1
+        self.total_wait += started - submitted
+        self.total_run += finished - started
+        self.max_latency = max(self.max_latency, finished - submitted)
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._run(pwd_context.hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str | None) -> bool:
+        if not hashed_password:  # 비밀번호가 없는 소셜 로그인 계정
+            return False
+        return await self._run(pwd_context.verify, plain_password, hashed_password)
+
+    # 검증 + 재해시 필요 여부 확인, 해시 설정(방식/비용)이 바뀐 경우 새 해시 반환
+    async def verify_and_update(self, plain_password: str, hashed_password: str | None) -> tuple[bool, str | None]:
+        if not hashed_password:
+            return False, None
+        return await self._run(pwd_context.verify_and_update, plain_password, hashed_password)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queued": max(self.in_flight - self.workers, 0),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self.total_wait / self.completed * 1000, 3) if self.completed else 0.0,
+            "avg_run_ms": round(self.total_run / self.completed * 1000, 3) if self.completed else 0.0,
+            "max_latency_ms": round(self.max_latency * 1000, 3),
+        }
+
+# 애플리케이션 전역 해시 서비스
+password_hasher = PasswordHasher()
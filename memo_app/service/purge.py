@@ -0,0 +1,91 @@
+import os
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy import select, delete, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import User, Memo, utcnow
+from service.user_deletion import delete_user_memos, MEMO_DELETE_CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+# 삭제된 메모/탈퇴한 사용자 영구 삭제
+# 요청 처리 중에는 deleted_at 만 기록하고, 보관 기간이 지난 행은 purge_worker.py 가 나누어 삭제
+DELETE_RETENTION_DAYS = float(os.getenv("DELETE_RETENTION_DAYS", "7"))  # 복구 가능 기간(일)
+PURGE_BATCH_SIZE = int(os.getenv("PURGE_BATCH_SIZE", "1000"))  # 한 번에 삭제할 행 수
+PURGE_BATCH_PAUSE = float(os.getenv("PURGE_BATCH_PAUSE", "0.5"))  # 배치 사이 대기 시간(초), DB 부하 분산
+
+# 이 시각 이전에 삭제된 행은 복구 불가, 영구 삭제 대상
+def retention_cutoff() -> datetime:
+    return utcnow() - timedelta(days=DELETE_RETENTION_DAYS)
+
+# 보관 기간이 지난 메모 삭제, 삭제한 건수 반환
+# 삭제한 메모의 마지막 변경 번호를 사용자별로 users.purged_seq 에 기록 (같은 트랜잭션)
+# 이보다 이전 커서로 변경 내역을 조회하면 삭제 알림을 받을 수 없으므로 전체를 다시 동기화해야 함
+async def purge_memos(db: AsyncSession, batch_size: int = PURGE_BATCH_SIZE, pause: float = PURGE_BATCH_PAUSE) -> int:
+    total = 0
+    while True:
+        rows = (await db.execute(
+            select(Memo.id, Memo.user_id, Memo.change_seq).where(Memo.deleted_at < retention_cutoff()).limit(batch_size)
+        )).all()
+        purged_seq = {}
+        for row in rows:
+            purged_seq[row.user_id] = max(purged_seq.get(row.user_id, 0), row.change_seq)
+
+        if rows:
+            await db.execute(
+                delete(Memo).where(Memo.id.in_([row.id for row in rows])).execution_options(synchronize_session=False)
+            )
+            for user_id, seq in purged_seq.items():
+                await db.execute(update(User).where(User.id == user_id, User.purged_seq < seq).values(purged_seq=seq))
+        await db.commit()
+        total += len(rows)
+        if len(rows) < batch_size:
+            return total
+        await asyncio.sleep(pause)
+
+# 보관 기간이 지난 사용자 한 명의 메모와 사용자 삭제, 삭제했으면 True
+# 메모는 청크 단위로 나누어 커밋하고 (큰 계정도 잠금을 오래 잡지 않음) 사용자 행은 마지막에 조건부 DELETE 로 삭제
+# 보관 기간이 지난 계정은 복구할 수 없으므로 (restore_deleted_user 가 기간을 다시 확인) 메모 일부만 지워진 상태도 안전하고,
+# 도중에 실패하면 사용자 행이 남아 있어 다음 실행 때 나머지를 삭제
+async def purge_user(db: AsyncSession, user_id: int, chunk_size: int = MEMO_DELETE_CHUNK_SIZE) -> bool:
+    expired = (User.id == user_id, User.deleted_at < retention_cutoff())
+    try:
+        if await db.scalar(select(User.id).where(*expired)) is None:
+            await db.rollback()
+            return False  # 그 사이 복구된 사용자
+        await delete_user_memos(db, user_id, chunk_size)
+        deleted = await db.scalar(delete(User).where(*expired).returning(User.id))
+        await db.commit()
+        return deleted is not None
+    except Exception:
+        await db.rollback()
+        raise
+
+# 보관 기간 내 탈퇴한 사용자 복구, 복구했으면 True
+# 조건부 UPDATE 로 처리하여 삭제 워커가 잠근 사용자는 삭제가 끝날 때까지 기다린 뒤 복구하지 않음
+async def restore_deleted_user(db: AsyncSession, user_id: int) -> bool:
+    restored = await db.scalar(
+        update(User)
+        .where(User.id == user_id, User.deleted_at >= retention_cutoff())
+        .values(deleted_at=None)
+        .returning(User.id)
+    )
+    return restored is not None
+
+# 보관 기간이 지난 사용자와 메모 삭제, 삭제한 사용자 수 반환
+async def purge_users(db: AsyncSession, batch_size: int = PURGE_BATCH_SIZE, pause: float = PURGE_BATCH_PAUSE) -> int:
+    total = 0
+    while True:
+        user_ids = (await db.scalars(
+            select(User.id).where(User.deleted_at < retention_cutoff()).order_by(User.id).limit(batch_size)
+        )).all()
+        await db.commit()  # 조회 트랜잭션 종료 (사용자별 삭제는 각자 트랜잭션)
+
+        for user_id in user_ids:
+            if await purge_user(db, user_id):
+                total += 1
+            await asyncio.sleep(pause)
+
+        if len(user_ids) < batch_size:
+            return total
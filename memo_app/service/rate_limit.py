@@ -0,0 +1,139 @@
+import os
+import math
+import time
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from fastapi import HTTPException, Request
+
+logger = logging.getLogger(__name__)
+
+# 로그인/계정 찾기 요청 제한 (토큰 버킷)
+# bcrypt 검증, 비밀번호 해시, SMTP 발송 전에 요청을 거절하여 CPU/메일 서버를 보호
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() in ("1", "true", "yes")
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL")  # 설정 시 워커 간 공유 (redis 패키지 필요)
+RATE_LIMIT_TRUST_PROXY = os.getenv("RATE_LIMIT_TRUST_PROXY", "false").lower() in ("1", "true", "yes")  # X-Forwarded-For 사용 여부
+
+# 버킷 설정: capacity 회까지 연속 허용, period 초마다 capacity 회 충전
+@dataclass(frozen=True)
+class RateLimit:
+    capacity: int
+    period: float
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / self.period  # 초당 충전 토큰 수
+
+# 라우트별 제한 (IP 기준, 사용자 이름/이메일 기준)
+RATE_LIMITS = {
+    "login": {"ip": RateLimit(20, 60), "account": RateLimit(5, 60)},
+    "send-username": {"ip": RateLimit(5, 600), "account": RateLimit(3, 3600)},
+    "reset-password": {"ip": RateLimit(5, 600), "account": RateLimit(3, 3600)},
+}
+
+# 인메모리 백엔드 (워커 단위)
+class MemoryBackend:
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # key -> (남은 토큰, 마지막 갱신 시각)
+
+    # 토큰 1개 사용, (허용 여부, 재시도까지 남은 초) 반환
+    async def take(self, key: str, limit: RateLimit) -> tuple[bool, float]:
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (limit.capacity, now))
+        tokens = min(limit.capacity, tokens + (now - updated) * limit.rate)
+
+        if tokens >= 1:
+            allowed, retry_after = True, 0.0
+            tokens -= 1
+        else:
+            allowed, retry_after = False, (1 - tokens) / limit.rate
+
+        self._buckets[key] = (tokens, now)
+        # 오래된 버킷 제거 (메모리 상한)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return allowed, retry_after
+
+# Redis 백엔드 (워커/서버 간 공유), 원자적 처리를 위해 Lua 스크립트 사용
+REDIS_TOKEN_BUCKET = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local data = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(data[1]) or capacity
+local ts = tonumber(data[2]) or now
+tokens = math.min(capacity, tokens + (now - ts) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    retry_after = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(retry_after)}
+"""
+
+class RedisBackend:
+    def __init__(self, client, prefix: str = "ratelimit:"):
+        self.client = client  # redis.asyncio.Redis 호환 클라이언트
+        self.prefix = prefix
+        self._script = client.register_script(REDIS_TOKEN_BUCKET)
+
+    async def take(self, key: str, limit: RateLimit) -> tuple[bool, float]:
+        allowed, retry_after = await self._script(keys=[self.prefix + key], args=[limit.capacity, limit.rate])
+        return bool(int(allowed)), float(retry_after)
+
+# 설정에 따라 백엔드 생성
+def create_backend():
+    if RATE_LIMIT_REDIS_URL:
+        import redis.asyncio as redis  # 공유 백엔드 사용 시에만 필요
+        return RedisBackend(redis.from_url(RATE_LIMIT_REDIS_URL))
+    return MemoryBackend()
+
+class RateLimiter:
+    def __init__(self, backend=None):
+        self.backend = backend or create_backend()
+        self.rejected = 0
+
+    # 다른 백엔드로 교체 (테스트, 공유 저장소 사용 시)
+    def set_backend(self, backend):
+        self.backend = backend
+
+    # 요청 허용 여부 확인, 초과 시 429 + Retry-After
+    async def check(self, request: Request, route: str, account: str | None = None):
+        if not RATE_LIMIT_ENABLED:
+            return
+
+        limits = RATE_LIMITS[route]
+        keys = [(f"{route}:ip:{client_ip(request)}", limits["ip"])]
+        if account:
+            keys.append((f"{route}:account:{account.strip().lower()}", limits["account"]))
+
+        for key, limit in keys:
+            try:
+                allowed, retry_after = await self.backend.take(key, limit)
+            except Exception as e:
+                # 공유 저장소 장애 시 요청은 허용 (로그인 자체가 막히지 않도록)
+                logger.error(f"요청 제한 확인 실패: {e}")
+                return
+            if not allowed:
+                self.rejected += 1
+                logger.warning(f"요청 제한 초과: {key}")
+                raise HTTPException(status_code=429, detail="요청이 너무 많습니다. 잠시 후 다시 시도해 주세요.",
+                                    headers={"Retry-After": str(math.ceil(retry_after))})
+
+# 요청한 클라이언트 IP
+def client_ip(request: Request) -> str:
+    if RATE_LIMIT_TRUST_PROXY:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+# 애플리케이션 전역 요청 제한기
+rate_limiter = RateLimiter()
@@ -0,0 +1,95 @@
+import re
+import logging
+from sqlalchemy import text, select, func, literal_column, table, column
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import Memo
+
+logger = logging.getLogger(__name__)
+
+# 메모 전문 검색 (PostgreSQL: tsvector + GIN 인덱스, SQLite: FTS5 가상 테이블)
+# 한국어는 형태소 분석 사전이 없으므로 'simple' 설정 + 접두어 검색 사용 ("메모" 로 "메모를" 검색 가능)
+
+# PostgreSQL: title/content 로부터 자동 계산되는 검색 컬럼 (생성/수정 시 DB 가 자동 갱신, 제목 가중치 A > 내용 B)
+PG_SEARCH_DDL = [
+    "ALTER TABLE memo ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(content, '')), 'B')) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_memo_search_vector ON memo USING GIN (search_vector)",
+]
+
+# SQLite: memo 테이블을 원본으로 하는 FTS5 인덱스 + 동기화 트리거
+SQLITE_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS memo_fts USING fts5(title, content, content='memo', content_rowid='id')",
+    """CREATE TRIGGER IF NOT EXISTS memo_fts_ai AFTER INSERT ON memo BEGIN
+        INSERT INTO memo_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS memo_fts_ad AFTER DELETE ON memo BEGIN
+        INSERT INTO memo_fts(memo_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS memo_fts_au AFTER UPDATE OF title, content ON memo BEGIN
+        INSERT INTO memo_fts(memo_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO memo_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END""",
+]
+
+# 검색 인덱스 생성 (애플리케이션 시작 시 1회 실행, 이미 있으면 무시)
+def setup_search_index(conn: Connection):
+    dialect = conn.dialect.name
+
+    if dialect == "postgresql":
+        for ddl in PG_SEARCH_DDL:
+            conn.execute(text(ddl))
+    elif dialect == "sqlite":
+        exists = conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'memo_fts'")).first()
+        for ddl in SQLITE_SEARCH_DDL:
+            conn.execute(text(ddl))
+        if not exists:
+            # 인덱스를 새로 만든 경우 기존 메모를 색인
+            conn.execute(text("INSERT INTO memo_fts(memo_fts) VALUES ('rebuild')"))
+    else:
+        logger.warning(f"전문 검색을 지원하지 않는 데이터베이스입니다: {dialect}")
+
+# FTS5 가상 테이블 (SQLite 조인용)
+memo_fts = table("memo_fts", column("rowid"))
+
+# 검색어를 단어 단위로 분리 (특수문자 제거)
+def search_terms(q: str) -> list[str]:
+    return re.findall(r"\w+", q)[:10]
+
+# 메모 검색 (관련도 순), 결과 Memo 목록 반환
+async def search_memos(db: AsyncSession, user_id: int, q: str, offset: int, limit: int) -> list[Memo]:
+    terms = search_terms(q)
+    if not terms:
+        return []
+
+    dialect = db.bind.dialect.name
+
+    if dialect == "postgresql":
+        # 'a:* & b:*' 형태의 tsquery (모든 단어를 접두어로 포함)
+        tsquery = func.to_tsquery(literal_column("'simple'::regconfig"), " & ".join(f"{term}:*" for term in terms))
+        vector = literal_column("memo.search_vector")
+        query = (
+            select(Memo)
+            .where(Memo.user_id == user_id, Memo.deleted_at.is_(None), vector.op("@@")(tsquery))
+            .order_by(func.ts_rank_cd(vector, tsquery).desc(), Memo.id.desc())
+        )
+    elif dialect == "sqlite":
+        # '"a"* "b"*' 형태의 FTS5 질의 (모든 단어를 접두어로 포함), 제목 일치에 가중치
+        match = " ".join('"' + term.replace('"', '""') + '"*' for term in terms)
+        query = (
+            select(Memo)
+            .join(memo_fts, memo_fts.c.rowid == Memo.id)
+            .where(Memo.user_id == user_id, Memo.deleted_at.is_(None), literal_column("memo_fts").op("MATCH")(match))
+            .order_by(func.bm25(literal_column("memo_fts"), 2.0, 1.0), Memo.id.desc())
+        )
+    else:
+        # 전문 검색 미지원 DB: 부분 일치 검색
+        query = select(Memo).where(Memo.user_id == user_id, Memo.deleted_at.is_(None))
+        for term in terms:
+            pattern = f"%{term}%"
+            query = query.where(Memo.title.ilike(pattern) | Memo.content.ilike(pattern))
+        query = query.order_by(Memo.id.desc())
+
+    return list((await db.scalars(query.offset(offset).limit(limit))).all())
@@ -0,0 +1,126 @@
+import os
+import gzip
+import hashlib
+import logging
+import mimetypes
+from dataclasses import dataclass, field
+from starlette.datastructures import Headers
+from starlette.responses import Response, PlainTextResponse
+from starlette.types import Receive, Scope, Send
+
+try:
+    import brotli  # 선택 사항: 설치되어 있으면 br 압축본도 생성
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# 정적 파일 (CSS/JS) 제공
+# 시작 시 파일 내용 해시로 이름을 붙이고 (css/memos.css -> css/memos.<hash>.css) gzip/br 압축본을 미리 만들어 메모리에 보관
+# 해시가 붙은 주소는 내용이 바뀌면 주소도 바뀌므로 1년 동안 캐시 (immutable)
+STATIC_DIRECTORY = os.getenv("STATIC_DIRECTORY", "static")
+STATIC_URL_PREFIX = "/static/"
+STATIC_HASH_LENGTH = 12
+STATIC_IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+STATIC_COMPRESS_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")  # 압축할 파일 종류
+
+@dataclass
+class StaticAsset:
+    media_type: str
+    etag: str
+    variants: dict[str, bytes] = field(default_factory=dict)  # 인코딩 -> 본문 ("identity", "gzip", "br")
+
+# 요청의 Accept-Encoding 에 맞는 압축본 선택 (br > gzip > 원본)
+def choose_encoding(accept_encoding: str, available) -> str:
+    accepted = set()
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip())
+    for encoding in ("br", "gzip"):
+        if encoding in available and (encoding in accepted or "*" in accepted):
+            return encoding
+    return "identity"
+
+class StaticAssets:
+    def __init__(self, directory: str = STATIC_DIRECTORY):
+        self.directory = directory
+        self.manifest: dict[str, str] = {}  # 원래 경로 -> 해시가 붙은 경로
+        self.assets: dict[str, StaticAsset] = {}  # 요청 경로 (원래 경로, 해시 경로 모두) -> 파일
+        self.load()
+
+    # 정적 파일을 읽어 해시 이름, 압축본 생성
+    def load(self):
+        manifest, assets = {}, {}
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                full_path = os.path.join(root, name)
+                path = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+                with open(full_path, "rb") as f:
+                    data = f.read()
+
+                digest = hashlib.sha256(data).hexdigest()[:STATIC_HASH_LENGTH]
+                stem, ext = os.path.splitext(path)
+                hashed_path = f"{stem}.{digest}{ext}"
+                media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+                if media_type.startswith("text/") or media_type == "application/javascript":
+                    media_type += "; charset=utf-8"
+
+                asset = StaticAsset(media_type=media_type, etag=f'"{digest}"', variants={"identity": data})
+                if media_type.startswith(STATIC_COMPRESS_TYPES):
+                    compressed = {"gzip": gzip.compress(data, compresslevel=9, mtime=0)}
+                    if brotli is not None:
+                        compressed["br"] = brotli.compress(data, quality=11)
+                    # 원본보다 작은 경우에만 사용
+                    asset.variants.update({encoding: body for encoding, body in compressed.items() if len(body) < len(data)})
+
+                manifest[path] = hashed_path
+                assets[path] = assets[hashed_path] = asset
+
+        self.manifest, self.assets = manifest, assets
+        logger.info(f"정적 파일 {len(manifest)}개 로드 (압축: gzip{', br' if brotli else ''})")
+
+    # 템플릿에서 사용하는 정적 파일 주소 (해시가 붙은 이름)
+    def url(self, path: str) -> str:
+        return STATIC_URL_PREFIX + self.manifest.get(path, path)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        path = scope["path"].removeprefix(scope.get("root_path", "")).lstrip("/")  # 마운트 위치 이후 경로
+        asset = self.assets.get(path)
+        if scope["method"] not in ("GET", "HEAD"):
+            response = PlainTextResponse("Method Not Allowed", status_code=405)
+        elif asset is None:
+            response = PlainTextResponse("Not Found", status_code=404)
+        else:
+            response = self.asset_response(asset, immutable=path not in self.manifest, request_headers=Headers(scope=scope))
+        await response(scope, receive, send)
+
+    def asset_response(self, asset: StaticAsset, immutable: bool, request_headers: Headers) -> Response:
+        encoding = choose_encoding(request_headers.get("accept-encoding", ""), asset.variants)
+        etag = asset.etag if encoding == "identity" else f'{asset.etag[:-1]}-{encoding}"'  # 압축본마다 다른 ETag
+        headers = {
+            "ETag": etag,
+            "Vary": "Accept-Encoding",
+            # 해시 주소는 영구 캐시, 원래 이름으로 요청하면 매번 ETag 로 확인
+            "Cache-Control": f"public, max-age={STATIC_IMMUTABLE_MAX_AGE}, immutable" if immutable else "no-cache",
+        }
+        if etag in request_headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(asset.variants[encoding], media_type=asset.media_type, headers=headers)
+
+    def stats(self) -> dict:
+        return {
+            "files": len(self.manifest),
+            "brotli": brotli is not None,
+            "bytes": {
+                encoding: sum(len(self.assets[path].variants.get(encoding, b"")) for path in self.manifest)
+                for encoding in ("identity", "gzip", "br")
+            },
+        }
+
+# 애플리케이션 전역 정적 파일
+static_assets = StaticAssets()
@@ -0,0 +1,87 @@
+import os
+import time
+import logging
+from threading import Lock
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
+from service.static_assets import static_assets
+
+logger = logging.getLogger(__name__)
+
+# 애플리케이션 전역 템플릿 (모든 라우터가 같은 Jinja2 환경과 템플릿 캐시 공유)
+# 운영 환경에서는 렌더링할 때마다 템플릿 파일 변경 여부를 확인(stat)하지 않고, 시작 시 모두 미리 컴파일
+TEMPLATES_DIRECTORY = os.getenv("TEMPLATES_DIRECTORY", "templates")
+TEMPLATES_AUTO_RELOAD = os.getenv("TEMPLATES_AUTO_RELOAD", "false").lower() in ("1", "true", "yes")  # 개발 중에만 true
+TEMPLATES_BYTECODE_CACHE_DIR = os.getenv("TEMPLATES_BYTECODE_CACHE_DIR")  # 컴파일 결과 저장 위치 (없으면 임시 디렉터리)
+
+# 템플릿별 컴파일/렌더링 시간
+class TemplateStats:
+    def __init__(self):
+        self._items = {}  # 템플릿 이름 -> {"compile_ms", "renders", "total_ms", "max_ms"}
+        self._lock = Lock()
+
+    def _item(self, name: str) -> dict:
+        return self._items.setdefault(name, {"compile_ms": None, "renders": 0, "total_ms": 0.0, "max_ms": 0.0})
+
+    def record_compile(self, name: str, seconds: float):
+        with self._lock:
+            self._item(name)["compile_ms"] = round(seconds * 1000, 3)
+
+    def record_render(self, name: str, seconds: float):
+        ms = seconds * 1000
+        with self._lock:
+            item = self._item(name)
+            item["renders"] += 1
+            item["total_ms"] += ms
+            item["max_ms"] = max(item["max_ms"], ms)
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                name: {
+                    "compile_ms": item["compile_ms"],
+                    "renders": item["renders"],
+                    "avg_ms": round(item["total_ms"] / item["renders"], 3) if item["renders"] else None,
+                    "max_ms": round(item["max_ms"], 3),
+                }
+                for name, item in sorted(self._items.items())
+            }
+
+class AppTemplates(Jinja2Templates):
+    def __init__(self, directory: str = TEMPLATES_DIRECTORY, auto_reload: bool = TEMPLATES_AUTO_RELOAD):
+        env = Environment(
+            loader=FileSystemLoader(directory),
+            autoescape=True,  # Jinja2Templates 기본 설정과 동일
+            auto_reload=auto_reload,
+            bytecode_cache=FileSystemBytecodeCache(TEMPLATES_BYTECODE_CACHE_DIR),  # 재시작 시 파싱/컴파일 생략
+        )
+        env.globals["static_url"] = static_assets.url  # 해시가 붙은 정적 파일 주소
+        super().__init__(env=env)
+        self.render_stats = TemplateStats()
+
+    # 모든 템플릿을 미리 컴파일하여 캐시에 올림 (첫 요청의 컴파일 지연 제거)
+    def precompile(self):
+        started = time.perf_counter()
+        names = self.env.list_templates(extensions=["html"])
+        for name in names:
+            compile_started = time.perf_counter()
+            self.env.get_template(name)
+            self.render_stats.record_compile(name, time.perf_counter() - compile_started)
+        logger.info(f"템플릿 {len(names)}개 컴파일 완료 ({(time.perf_counter() - started) * 1000:.1f}ms, auto_reload={self.env.auto_reload})")
+
+    # 렌더링 시간 기록
+    def TemplateResponse(self, *args, **kwargs):
+        started = time.perf_counter()
+        response = super().TemplateResponse(*args, **kwargs)
+        self.render_stats.record_render(response.template.name, time.perf_counter() - started)
+        return response
+
+    def stats(self) -> dict:
+        return {
+            "auto_reload": self.env.auto_reload,
+            "cached": len(self.env.cache) if self.env.cache is not None else 0,
+            "templates": self.render_stats.summary(),
+        }
+
+# 애플리케이션 전역 템플릿 객체
+templates = AppTemplates()
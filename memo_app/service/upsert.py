@@ -0,0 +1,31 @@
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# INSERT ... ON CONFLICT (업서트)
+# 조회 후 삽입(SELECT → INSERT) 대신 한 문장으로 처리하여 왕복 횟수를 줄이고 동시 요청 간 경쟁 상태 제거
+# 앱 전체가 RETURNING 을 사용하므로 지원 DB 는 PostgreSQL 과 SQLite 뿐
+INSERT_BY_DIALECT = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+# DB 에 맞는 insert (on_conflict_do_nothing / on_conflict_do_update 사용 가능)
+def dialect_insert(db: AsyncSession, model):
+    dialect = db.bind.dialect.name
+    if dialect not in INSERT_BY_DIALECT:
+        raise RuntimeError(f"지원하지 않는 데이터베이스입니다: {dialect} (PostgreSQL, SQLite 만 지원)")
+    return INSERT_BY_DIALECT[dialect](model)
+
+# 유일 키가 겹치는 행이 없을 때만 삽입, 삽입한 행의 returning 값 반환 (겹치면 None)
+# 유일 키 외의 제약 위반은 IntegrityError 그대로 발생
+async def insert_if_absent(db: AsyncSession, model, values: dict, index_elements: list, returning):
+    return await db.scalar(
+        dialect_insert(db, model).values(**values).on_conflict_do_nothing(index_elements=index_elements).returning(returning)
+    )
+
+# 유일 키가 겹치는 행이 있으면 set_ 으로 수정, 없으면 삽입, 결과 행의 returning 값 반환
+async def insert_or_update(db: AsyncSession, model, values: dict, index_elements: list, set_: dict, returning):
+    return await db.scalar(
+        dialect_insert(db, model).values(**values)
+        .on_conflict_do_update(index_elements=index_elements, set_=set_).returning(returning)
+    )
@@ -0,0 +1,91 @@
+import os
+import time
+from collections import OrderedDict
+from threading import Lock
+
+# 로그인 사용자 조회 캐시 (프로세스 단위 TTL + LRU)
+# 워커마다 별도 캐시이므로, 다른 워커에서의 변경은 최대 TTL 동안 반영되지 않을 수 있음
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))  # 캐시 유지 시간(초)
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "1024"))  # 최대 캐시 항목 수
+
+class UserCache:
+    def __init__(self, ttl: float = USER_CACHE_TTL, maxsize: int = USER_CACHE_SIZE):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._items = OrderedDict()  # key -> (만료 시각, user)
+        self._keys_by_user = {}  # user.id -> {key, ...} (사용자 단위 무효화용)
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None or item[0] < time.monotonic():
+                if item is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)  # 최근 사용 항목으로 이동
+            self.hits += 1
+            return item[1]
+
+    def set(self, key, user):
+        with self._lock:
+            if key in self._items:
+                self._remove(key)
+            self._items[key] = (time.monotonic() + self.ttl, user)
+            self._keys_by_user.setdefault(user.id, set()).add(key)
+            # 가장 오래 사용되지 않은 항목부터 제거
+            while len(self._items) > self.maxsize:
+                oldest = next(iter(self._items))
+                self._remove(oldest)
+                self.evictions += 1
+
+    # 사용자 삭제, 비밀번호 변경, 소셜 계정 연동 시 호출
+    def invalidate(self, user_id: int):
+        with self._lock:
+            for key in list(self._keys_by_user.get(user_id, ())):
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._keys_by_user.clear()
+
+    def _remove(self, key):
+        _, user = self._items.pop(key)
+        keys = self._keys_by_user.get(user.id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[user.id]
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._items),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+        }
+
+# 세션 정보로 캐시 키 생성 (일반 로그인: 사용자 ID, 소셜 로그인: 제공자 + 소셜 ID)
+def session_cache_key(session) -> tuple | None:
+    user_id = session.get("id")
+    if user_id:
+        return ("id", user_id)
+
+    social_id = session.get("social_id")
+    provider = session.get("provider")
+    if social_id and provider:
+        return (provider, social_id)
+
+    return None
+
+# 애플리케이션 전역 캐시
+user_cache = UserCache()
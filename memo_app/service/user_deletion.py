@@ -0,0 +1,28 @@
+import os
+import logging
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import Memo
+
+logger = logging.getLogger(__name__)
+
+# 회원 탈퇴 시 메모 일괄 삭제
+# 메모를 ORM 객체로 불러오지 않고 DELETE 문으로 삭제하여 메모 수와 무관하게 메모리 사용량 일정
+MEMO_DELETE_CHUNK_SIZE = int(os.getenv("MEMO_DELETE_CHUNK_SIZE", "5000"))  # 한 번에 삭제할 메모 수
+
+# 사용자의 메모 삭제, 삭제한 건수 반환
+# 메모가 많은 경우 청크 단위로 나누어 커밋 (한 트랜잭션이 오래 잠금을 잡지 않도록)
+# 마지막 청크는 커밋하지 않으므로 호출한 쪽에서 사용자 삭제와 함께 커밋
+async def delete_user_memos(db: AsyncSession, user_id: int, chunk_size: int = MEMO_DELETE_CHUNK_SIZE) -> int:
+    total = 0
+    while True:
+        chunk = select(Memo.id).where(Memo.user_id == user_id).order_by(Memo.id).limit(chunk_size)
+        result = await db.execute(
+            delete(Memo).where(Memo.id.in_(chunk.scalar_subquery())).execution_options(synchronize_session=False)
+        )
+        total += result.rowcount
+        if result.rowcount < chunk_size:
+            break
+        await db.commit()
+        logger.info(f"사용자 ID {user_id}: 메모 {total}개 삭제 중")
+    return total
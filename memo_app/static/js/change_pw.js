@@ -0,0 +1,48 @@
+function submitChangePWForm(event) {
+    event.preventDefault();  // 기본 제출 이벤트 방지
+
+    const username = document.getElementById('username').value;
+    const currentpw = document.getElementById('current-pw').value;
+    const newpw = document.getElementById('new-pw').value;
+    const confirmpw = document.getElementById('new-pw-confirm').value;
+    const messageDiv = document.getElementById('find-id-message');
+
+    if (currentpw == newpw) {
+        alert( "새 비밀번호는 현재 비밀번호와 달라야 합니다.");
+        return ;
+    }
+
+    if (newpw != confirmpw) {
+        alert( "새 비밀번호가 서로 일치하지 않습니다.");
+        return ;
+    }          
+
+    fetch('/change_pw', {
+        method: 'PUT',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify({ 
+            username: username,
+            current_password: currentpw,
+            new_password: newpw,
+            new_password_confirm: confirmpw
+        })
+    })
+    .then(response => response.json().then(body => ({
+        status: response.status, body: body
+    })))
+    .then(result => {
+        if (result.status == 200) {
+            alert(result.body.message); // 성공 팝업
+            document.getElementById('changePWForm').reset(); // 비밀번호 변경 모든 칸 초기화
+            //window.location.href = '/'; // 메인 페이지로 리다이렉트
+        } else {
+                throw new Error(result.body.detail || '비밀번호 변경에 실패하였습니다.');
+            } 
+    })
+    .catch(error => {
+        console.error('Error', error);
+        alert(error.message) // 실패 팝업
+    });
+}
@@ -0,0 +1,64 @@
+function submitFormID(event) {
+    event.preventDefault();  // 기본 제출 이벤트 방지
+
+    const email = document.getElementById('find-id-email').value;
+    const messageDiv = document.getElementById('find-id-message');
+
+    fetch('/send-username', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify({ email: email })
+    })
+    .then(response => {
+        if (!response.ok) {
+            return response.json().then(err => {
+                throw new Error(err.detail || '이메일 전송에 실패했습니다.');
+            });
+        }
+        return response.json();
+    })
+    .then(data => {
+        document.getElementById('find-id-form').reset(); // 폼 초기화
+        messageDiv.innerText = data.message;
+        messageDiv.style.color = '#28a745'; // 성공 메시지 색상
+    })
+    .catch(error => {
+        messageDiv.innerText = error.message;
+        messageDiv.style.color = '#dc3545'; // 에러 메시지 색상
+    });
+}
+
+function submitFormPW(event) {
+    event.preventDefault();  // 기본 제출 이벤트 방지
+
+    const username = document.getElementById('find-pw-username').value;
+    const email = document.getElementById('find-pw-email').value;
+    const messageDiv = document.getElementById('find-pw-message');
+
+    fetch('/reset-password', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify({ username: username, email: email })
+    })
+    .then(response => {
+        if (!response.ok) {
+            return response.json().then(err => {
+                throw new Error(err.detail || '이메일 전송에 실패했습니다.');
+            });
+        }
+        return response.json();
+    })
+    .then(data => {
+        document.getElementById('find-pw-form').reset(); // 폼 초기화
+        messageDiv.innerText = data.message;
+        messageDiv.style.color = '#28a745'; // 성공 메시지 색상
+    })
+    .catch(error => {
+        messageDiv.innerText = error.message;
+        messageDiv.style.color = '#dc3545'; // 에러 메시지 색상
+    });
+}
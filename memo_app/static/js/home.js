@@ -0,0 +1,60 @@
+function submitLoginForm(event) {
+    event.preventDefault();
+    const formData = new FormData(event.target);
+    const data = {
+        username: formData.get('username'),
+        password: formData.get('password')
+    };
+    fetch('/login', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify(data)
+    })
+    .then(response => response.json().then(body => ({
+        status: response.status, body: body})))
+    .then(result => {
+        if (result.status == 200) {
+            alert(result.body.message); // 로그인 성공 메시지를 팝업으로 표시
+            window.location.href = '/memos'; // 메모 페이지로 리다이렉트
+        } else {
+            throw new Error(result.body.detail || '로그인이 실패하였습니다.'); // 로그인 실패 시 에러 발생 (서버 제공 에러 또는 기본 메시지)
+        }
+    })
+    .catch((error) => {
+        console.error('Error:', error);
+        alert(error.message); // 에러 메시지를 팝업으로 표시
+    });
+}
+
+function submitSignupForm(event) {
+    event.preventDefault();
+    const formData = new FormData(event.target);
+    const data = {
+        username: formData.get('username'),
+        email: formData.get('email'),
+        password: formData.get('password')
+    };
+    fetch('/signup', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify(data)
+    })
+    .then(response => response.json().then(body => ({
+        status: response.status, body: body})))
+    .then(result => {
+        if (result.status == 200) {
+            alert(result.body.message); // 회원가입 성공 메시지를 팝업으로 표시
+            window.location.href = '/'; // 메인 페이지로 리다이렉트
+        } else {
+            throw new Error(result.body.detail || '회원가입이 실패하였습니다.'); // 회원가입 실패 시 에러 발생 (서버 제공 에러 또는 기본 메시지)
+        }
+    })
+    .catch((error) => {
+        console.error('Error:', error);
+        alert(error.message); // 에러 메시지를 팝업으로 표시
+    });
+}
@@ -0,0 +1,296 @@
+function createMemo() {
+    var title = document.getElementById('new-title').value;
+    var content = document.getElementById('new-content').value;
+
+    fetch('/memos', {
+        method:'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'Accept': 'text/html', // 생성된 메모 카드 HTML 만 받음
+        },
+        body: JSON.stringify({ title: title, content: content})
+    })
+    .then(response => {
+        if (!response.ok) throw new Error('메모 생성 실패: ' + response.status);
+        return response.text();
+    })
+    .then(html => {
+        // 새로고침 없이 목록에 추가
+        insertMemoCards(html);
+        document.getElementById('new-title').value = '';
+        document.getElementById('new-content').value = '';
+    })
+    .catch((error) => {
+        console.error('Error:', error);
+    });
+}
+
+function toggleEdit(id) {
+    var titleEl = document.getElementById('title-' +  id);
+    var contentEl = document.getElementById('content-' + id);
+    var isReadOnly = titleEl.readOnly;
+
+    titleEl.readOnly = !isReadOnly;
+    contentEl.readOnly = !isReadOnly;
+
+    if (!isReadOnly) {
+        updateMemo(id);
+    }
+}
+
+function updateMemo(id) {
+    var titleEl = document.getElementById('title-' + id);
+    var title = titleEl.value;
+    var content = document.getElementById('content-' + id).value;
+
+    fetch('/memos/' + id, {
+        method: 'PUT',
+        headers: {
+            'Content-Type': 'application/json',
+            'If-Match': '"' + titleEl.dataset.version + '"', // 마지막으로 받은 버전
+        },
+        body: JSON.stringify({ title: title, content: content })
+    })
+    .then(response => {
+        if (response.status === 412) {
+            // 다른 곳에서 먼저 수정됨
+            alert('다른 곳에서 수정되었습니다. 새로고침 후 다시 시도해 주세요.');
+            throw new Error('version conflict');
+        }
+        return response.json();
+    })
+    .then(data => {
+        console.log(data);
+        if (data.version) titleEl.dataset.version = data.version;
+        alert('메모가 업데이트 되었습니다.');
+    })
+    .catch((error) => {
+        console.error('Error:', error);
+    });
+}
+
+function deleteMemo(id) {
+    if (!confirm('메모를 삭제하시겠습니까?')) return;
+
+    fetch('/memos/' + id, {
+        method: 'DELETE',
+    })
+    .then(response => response.json())
+    .then(data => {
+        console.log(data);
+        if (data.message) applyMemoChange({ id: id, deleted: true }); // 새로고침 없이 목록에서 제거
+    })
+    .catch((error) => {
+        console.error('Error:', error);
+    });
+}
+
+// 선택한 메모 일괄 삭제 (한 번의 요청)
+function deleteSelectedMemos() {
+    var ids = Array.from(document.querySelectorAll('.memo-select:checked')).map(el => Number(el.value));
+    if (ids.length === 0) {
+        alert('삭제할 메모를 선택해 주세요.');
+        return;
+    }
+    if (!confirm(ids.length + '개의 메모를 삭제하시겠습니까?')) return;
+
+    fetch('/memos/batch', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({ operations: ids.map(id => ({ op: 'delete', id: id })) })
+    })
+    .then(response => response.json())
+    .then(data => {
+        console.log(data);
+        (data.results || []).filter(result => result.status === 200)
+            .forEach(result => applyMemoChange({ id: result.id, deleted: true }));
+    })
+    .catch((error) => {
+        console.error('Error:', error);
+    });
+}
+
+function logout() {
+    fetch('/logout', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        }
+    })
+    .then(response => response.json())
+    .then(data => {
+        console.log(data);
+        window.location.href = '/'; // 로그아웃 후 홈페이지로 리다이렉트
+    })
+    .catch((error) => {
+        console.error('Error:', error);
+    });
+}
+
+function deleteUser(id) {
+    // 계정 삭제 확인
+    if (!confirm('정말로 계정을 삭제하시겠습니까?')) return;
+
+    fetch('/users/' + id, {
+        method: 'DELETE',
+        headers: {
+            'Content-Type': 'application/json'
+        }
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            console.log(data);
+            alert('계정이 성공적으로 삭제되었습니다.');
+            window.location.href = '/'; // 로그아웃 후 홈페이지로 리다이렉트
+        } else {
+            alert('삭제 실패: ' + (data.message || '알 수 없는 오류'));
+        }
+    })
+    .catch((error) => {
+        console.error('Error:', error);
+        alert('서버 오류가 발생했습니다.');
+    });
+}
+
+// 비활동 시 자동 로그아웃 설정
+let timer;
+let countdown = 10 * 60 // 10분(초단위)
+
+function startTimer() {
+    timer = setInterval(() => {
+        countdown--;
+
+    const minutes = String(Math.floor(countdown / 60)).padStart(2, '0');
+    const seconds = String(countdown % 60).padStart(2, '0');
+    document.getElementById('logout-timer').textContent = `${minutes}:${seconds}`;
+
+    if (countdown <= 0) {
+        clearTimeout(timer);
+        alert("10분 동안 활동이 없어 자동 로그아웃됩니다.");
+        fetch('/logout', {method: 'POST'})
+            .then(() => window.location.href = '/login');
+        }
+    }, 1000);
+}
+
+function resetTimer() {
+    countdown = 10 * 60; // 다시 10분으로 리셋
+}
+
+// 서버에서 렌더링한 메모 카드 HTML 조각을 ID 순서 위치에 추가
+// (아직 불러오지 않은 구간의 메모는 무한 스크롤이 가져오므로 건너뜀)
+function insertMemoCards(html) {
+    var template = document.createElement('template');
+    template.innerHTML = html;
+    var list = document.getElementById('memo-list');
+    var hasMore = !!document.getElementById('memo-sentinel').dataset.nextCursor;
+    Array.from(template.content.children).forEach(card => {
+        var id = Number(card.id.replace('memo-', ''));
+        var existing = document.getElementById(card.id);
+        if (existing) {
+            existing.replaceWith(card);
+            return;
+        }
+        var next = Array.from(list.children).find(el => Number(el.id.replace('memo-', '')) > id);
+        if (next) {
+            list.insertBefore(card, next);
+        } else if (!hasMore) {
+            list.appendChild(card);
+        }
+    });
+}
+
+// 메모 변경 반영 (직접 요청한 결과, 다른 탭/기기에서 온 실시간 알림 공통)
+function applyMemoChange(change) {
+    var card = document.getElementById('memo-' + change.id);
+    if (change.deleted) {
+        if (card) card.remove();
+        return;
+    }
+    if (card) {
+        var titleEl = document.getElementById('title-' + change.id);
+        // 이미 반영된 변경이거나 편집 중이면 건너뜀 (편집 중 저장은 버전 확인으로 412)
+        if (Number(titleEl.dataset.version) >= change.version || !titleEl.readOnly) return;
+        titleEl.value = change.title;
+        titleEl.dataset.version = change.version;
+        document.getElementById('content-' + change.id).value = change.content;
+        return;
+    }
+    // 새 메모/복구된 메모: 해당 메모 카드 HTML 조각만 받아서 추가
+    fetch('/memos/' + change.id + '/fragment')
+    .then(response => response.ok ? response.text() : '')
+    .then(insertMemoCards)
+    .catch((error) => {
+        console.error('Error:', error);
+    });
+}
+
+// 실시간 알림 구독 (Server-Sent Events, 끊기면 브라우저가 자동 재연결)
+function subscribeMemoEvents() {
+    if (!window.EventSource) return;
+    var events = new EventSource('/memos/events');
+    events.addEventListener('memo', e => applyMemoChange(JSON.parse(e.data)));
+    // 놓친 변경이 너무 많은 경우 목록 다시 불러오기
+    events.addEventListener('resync', () => window.location.reload());
+}
+
+// 다음 페이지 메모 불러오기
+// 실패하면 바로 다시 요청하지 않고, 대기 시간(실패마다 2배) 이후의 다음 스크롤/화면 진입 때 재시도
+let loadingMemos = false;
+let memoRetryDelay = 0;
+let memoRetryAt = 0;
+
+function memoSentinelVisible() {
+    return document.getElementById('memo-sentinel').getBoundingClientRect().top < window.innerHeight;
+}
+
+function loadMoreMemos() {
+    var sentinel = document.getElementById('memo-sentinel');
+    var cursor = sentinel.dataset.nextCursor;
+    if (!cursor || loadingMemos || Date.now() < memoRetryAt) return;
+
+    loadingMemos = true;
+    fetch('/memos/page/fragment?after=' + encodeURIComponent(cursor))
+    .then(response => {
+        if (!response.ok) throw new Error('메모 조회 실패: ' + response.status);
+        sentinel.dataset.nextCursor = response.headers.get('X-Next-Cursor') || '';
+        return response.text();
+    })
+    .then(html => {
+        // 다음 페이지 메모 카드 HTML 을 목록 끝에 추가
+        document.getElementById('memo-list').insertAdjacentHTML('beforeend', html);
+        memoRetryDelay = 0;
+        loadingMemos = false;
+        // 화면이 아직 채워지지 않았다면 이어서 로드
+        if (memoSentinelVisible()) loadMoreMemos();
+    })
+    .catch((error) => {
+        console.error('Error:', error);
+        memoRetryDelay = Math.min(memoRetryDelay ? memoRetryDelay * 2 : 1000, 30000);
+        memoRetryAt = Date.now() + memoRetryDelay;
+        loadingMemos = false;
+    });
+}
+
+window.onload = () => {
+    startTimer();
+    subscribeMemoEvents();
+
+    // 무한 스크롤 설정
+    var observer = new IntersectionObserver(entries => {
+        if (entries.some(entry => entry.isIntersecting)) loadMoreMemos();
+    });
+    observer.observe(document.getElementById('memo-sentinel'));
+    // 불러오기 실패 후 목록 끝이 계속 보이는 경우 다음 스크롤 때 재시도
+    window.addEventListener('scroll', () => {
+        if (memoRetryAt && memoSentinelVisible()) loadMoreMemos();
+    }, { passive: true });
+};
+
+// 사용자 활동 감지
+document.onmousemove = resetTimer;
+document.onkeypress = resetTimer;
+document.ontouchstart = resetTimer;
@@ -0,0 +1,23 @@
+import os
+import pytest
+
+# 테스트는 SQLite 파일 DB 사용 (모듈 import 전에 설정)
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_memo_app.db")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+# 테스트마다 새 SQLite DB (테이블 생성 후 세션 팩토리 반환)
+@pytest.fixture
+async def session_factory(tmp_path):
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+    from database import Base
+    import models  # noqa: F401 (테이블 등록)
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
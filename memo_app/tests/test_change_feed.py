@@ -0,0 +1,103 @@
+from datetime import timedelta
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import update
+from models import User, Memo, utcnow
+from service import purge
+from service.change_feed import fetch_changes, reserve_change_seq
+from service.pagination import encode_cursor
+from service.purge import purge_memos
+
+pytestmark = pytest.mark.anyio
+
+
+async def add_memo(db, user_id, title):
+    memo = Memo(user_id=user_id, title=title, content="c", change_seq=await reserve_change_seq(db, user_id))
+    db.add(memo)
+    await db.commit()
+    return memo
+
+
+async def delete_memo(db, memo, deleted_at):
+    await db.execute(
+        update(Memo).where(Memo.id == memo.id)
+        .values(deleted_at=deleted_at, change_seq=await reserve_change_seq(db, memo.user_id))
+    )
+    await db.commit()
+
+
+@pytest.fixture
+async def user_id(session_factory):
+    async with session_factory() as db:
+        user = User(username="feed", email="feed@example.com")
+        db.add(user)
+        await db.commit()
+        return user.id
+
+
+async def test_cursor_before_purge_expires(session_factory, user_id):
+    async with session_factory() as db:
+        kept = await add_memo(db, user_id, "kept")
+        gone = await add_memo(db, user_id, "gone")
+        synced = await fetch_changes(db, user_id)  # 두 메모를 받은 클라이언트
+        await delete_memo(db, gone, utcnow() - timedelta(days=purge.DELETE_RETENTION_DAYS + 1))
+
+        assert await purge_memos(db, pause=0) == 1
+
+        with pytest.raises(HTTPException) as e:
+            await fetch_changes(db, user_id, since=synced.next_since)
+        assert e.value.status_code == 410
+
+        # 처음부터 다시 받으면 남은 메모만 오고, 새 커서는 정상 동작
+        resynced = await fetch_changes(db, user_id)
+        assert [item.id for item in resynced.items] == [kept.id]
+        assert (await fetch_changes(db, user_id, since=resynced.next_since)).items == []
+
+
+async def test_cursor_after_tombstone_survives_purge(session_factory, user_id):
+    async with session_factory() as db:
+        await add_memo(db, user_id, "kept")
+        gone = await add_memo(db, user_id, "gone")
+        await delete_memo(db, gone, utcnow() - timedelta(days=purge.DELETE_RETENTION_DAYS + 1))
+        seen = await fetch_changes(db, user_id, since=encode_cursor({"seq": 0}))  # 삭제 알림까지 받은 클라이언트
+        assert seen.items[-1].deleted
+
+        await purge_memos(db, pause=0)
+        db.expunge_all()  # SQLite 는 삭제된 메모의 ID 를 다시 사용
+        added = await add_memo(db, user_id, "new")
+
+        changes = await fetch_changes(db, user_id, since=seen.next_since)
+        assert [item.id for item in changes.items] == [added.id]
+
+
+async def test_recent_deletes_do_not_expire_cursor(session_factory, user_id):
+    async with session_factory() as db:
+        memo = await add_memo(db, user_id, "recent")
+        await delete_memo(db, memo, utcnow())
+
+        assert await purge_memos(db, pause=0) == 0
+        changes = await fetch_changes(db, user_id, since=encode_cursor({"seq": 0}))
+        assert changes.items[-1].deleted
+
+
+async def test_full_sync_paginates_after_purge(session_factory, user_id):
+    async with session_factory() as db:
+        memos = [await add_memo(db, user_id, f"m{i}") for i in range(30)]
+        await delete_memo(db, memos[0], utcnow() - timedelta(days=purge.DELETE_RETENTION_DAYS + 1))
+        assert await purge_memos(db, pause=0) == 1
+
+        page = await fetch_changes(db, user_id, limit=20)
+        assert len(page.items) == 20 and page.has_more
+        received = [item.id for item in page.items]
+
+        # 전체 조회 중 수정/삭제된 메모는 마지막 페이지 이후 증분 조회로 전달
+        await delete_memo(db, memos[25], utcnow())
+        edited = await add_memo(db, user_id, "during sync")
+
+        page = await fetch_changes(db, user_id, since=page.next_since, limit=20)
+        assert not page.has_more
+        received += [item.id for item in page.items]
+        assert received == [memo.id for memo in memos[1:] if memo is not memos[25]]
+
+        changes = await fetch_changes(db, user_id, since=page.next_since)
+        assert [(item.id, item.deleted) for item in changes.items] == [(memos[25].id, True), (edited.id, False)]
@@ -0,0 +1,68 @@
+import gzip
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+from service.compression import CompressionMiddleware
+
+BODY = "메모 " * 500
+
+
+async def chunks():
+    for _ in range(3):
+        yield BODY
+
+
+def make_client():
+    app = Starlette(routes=[
+        Route("/large", lambda request: PlainTextResponse(BODY)),
+        Route("/small", lambda request: PlainTextResponse("ok")),
+        Route("/stream", lambda request: StreamingResponse(chunks(), media_type="text/plain")),
+        Route("/events", lambda request: StreamingResponse(chunks(), media_type="text/event-stream")),
+        Route("/encoded", lambda request: Response(gzip.compress(BODY.encode()), headers={"Content-Encoding": "gzip"}, media_type="text/plain")),
+    ])
+    app.add_middleware(CompressionMiddleware)
+    return TestClient(app)
+
+
+@pytest.fixture
+def client():
+    with make_client() as client:
+        yield client
+
+
+def test_compresses_large_response(client):
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(BODY.encode())
+    assert response.text == BODY
+
+
+def test_skips_small_response(client):
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.text == "ok"
+
+
+def test_compresses_stream_without_content_length(client):
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.text == BODY * 3
+
+
+@pytest.mark.parametrize("path", ["/events", "/encoded"])
+def test_passes_through_excluded_responses(client, path):
+    response = client.get(path, headers={"Accept-Encoding": "gzip"})
+    assert response.headers.get("content-encoding") == ("gzip" if path == "/encoded" else None)
+    assert response.text == (BODY if path == "/encoded" else BODY * 3)
+    assert "vary" not in response.headers
+
+
+def test_identity_adds_vary(client):
+    response = client.get("/large", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.text == BODY
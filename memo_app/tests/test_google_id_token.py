@@ -0,0 +1,104 @@
+import time
+import httpx
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from service import google_id_token
+from service.google_id_token import GoogleKeyCache, IdTokenError, verify_id_token
+from service.http_client import OAuthHttpClients
+
+pytestmark = pytest.mark.anyio
+
+CLIENT_ID = "client-id.apps.googleusercontent.com"
+JWKS_URI = "https://www.googleapis.com/oauth2/v3/certs"
+
+
+def new_key(kid):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+    return private_key, {**jwk, "kid": kid, "alg": "RS256", "use": "sig"}
+
+
+def sign(private_key, kid, **overrides):
+    now = int(time.time())
+    claims = {"iss": "https://accounts.google.com", "sub": "1234", "aud": CLIENT_ID, "email": "user@example.com",
+              "iat": now, "exp": now + 3600, **overrides}
+    return jwt.encode(claims, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+# 구글 discovery / JWKS 엔드포인트 대역 (httpx.MockTransport)
+class StubGoogle:
+    def __init__(self, *jwks):
+        self.jwks = list(jwks)
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(str(request.url))
+        if str(request.url) == google_id_token.GOOGLE_DISCOVERY_URL:
+            return httpx.Response(200, json={"jwks_uri": JWKS_URI}, headers={"Cache-Control": "public, max-age=3600"})
+        return httpx.Response(200, json={"keys": self.jwks}, headers={"Cache-Control": "public, max-age=3600"})
+
+
+@pytest.fixture
+def key():
+    return new_key("key-1")
+
+
+@pytest.fixture
+def google(key):
+    return StubGoogle(key[1])
+
+
+@pytest.fixture
+async def key_cache(google):
+    http = OAuthHttpClients()
+    http._clients["google"] = httpx.AsyncClient(transport=httpx.MockTransport(google))
+    yield GoogleKeyCache(http=http)
+    await http.close()
+
+
+async def test_valid_token(key, key_cache):
+    claims = await verify_id_token(sign(key[0], "key-1"), audience=CLIENT_ID, key_cache=key_cache)
+    assert claims["sub"] == "1234"
+
+    # 두 번째 검증은 캐시한 키 사용
+    await verify_id_token(sign(key[0], "key-1"), audience=CLIENT_ID, key_cache=key_cache)
+    assert key_cache.refreshes == 1
+
+
+@pytest.mark.parametrize("overrides", [
+    {"aud": "other-client"},
+    {"iss": "https://evil.example.com"},
+    {"exp": int(time.time()) - 3600, "iat": int(time.time()) - 7200},
+])
+async def test_rejects_invalid_claims(key, key_cache, overrides):
+    with pytest.raises(IdTokenError):
+        await verify_id_token(sign(key[0], "key-1", **overrides), audience=CLIENT_ID, key_cache=key_cache)
+
+
+async def test_rejects_token_signed_by_other_key(key, key_cache):
+    other_key, _ = new_key("key-1")
+    with pytest.raises(IdTokenError):
+        await verify_id_token(sign(other_key, "key-1"), audience=CLIENT_ID, key_cache=key_cache)
+
+
+async def test_unknown_kid_refetches_keys(key, google, key_cache, monkeypatch):
+    monkeypatch.setattr(google_id_token, "MIN_REFRESH_INTERVAL", 0)
+    await verify_id_token(sign(key[0], "key-1"), audience=CLIENT_ID, key_cache=key_cache)
+
+    # 구글이 키를 교체: 캐시에 없는 kid 는 JWKS 를 다시 조회
+    rotated_key, rotated_jwk = new_key("key-2")
+    google.jwks.append(rotated_jwk)
+    claims = await verify_id_token(sign(rotated_key, "key-2"), audience=CLIENT_ID, key_cache=key_cache)
+    assert claims["sub"] == "1234"
+    assert key_cache.refreshes == 2
+    assert google.requests.count(JWKS_URI) == 2
+
+
+async def test_unknown_kid_refetch_is_rate_limited(key, google, key_cache):
+    await verify_id_token(sign(key[0], "key-1"), audience=CLIENT_ID, key_cache=key_cache)
+
+    for _ in range(3):
+        with pytest.raises(IdTokenError):
+            await verify_id_token(sign(key[0], "forged"), audience=CLIENT_ID, key_cache=key_cache)
+    assert key_cache.refreshes == 1
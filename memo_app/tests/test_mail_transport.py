@@ -0,0 +1,118 @@
+import socket
+import asyncio
+import smtplib
+import pytest
+from email.message import EmailMessage
+from aiosmtpd.controller import Controller
+from service.mail_transport import SMTPTransport
+
+# 수신자에 따라 응답을 바꾸는 SMTP 서버
+class StubHandler:
+    def __init__(self):
+        self.received = []
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith("refused"):
+            return "550 5.1.1 mailbox unavailable"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        if any(rcpt.startswith("slow") for rcpt in envelope.rcpt_tos):
+            self.received.append(envelope)
+            await asyncio.sleep(1)  # 메일을 받은 뒤 응답 지연 (클라이언트 타임아웃)
+            return "250 OK"
+        if any(rcpt.startswith("reject-data") for rcpt in envelope.rcpt_tos):
+            return "554 5.6.0 message rejected"
+        self.received.append(envelope)
+        return "250 OK"
+
+@pytest.fixture
+def smtp_server():
+    handler = StubHandler()
+    with socket.socket() as sock:  # 빈 포트 찾기
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    yield handler, port
+    controller.stop()
+
+def make_transport(port, timeout=10):
+    return SMTPTransport(host="127.0.0.1", port=port, use_ssl=False, username="", password="", pool_size=1, timeout=timeout)
+
+def message(to):
+    msg = EmailMessage()
+    msg["From"] = "app@example.com"
+    msg["To"] = to
+    msg["Subject"] = "test"
+    msg.set_content("hello")
+    return msg
+
+def test_reuses_connection(smtp_server):
+    handler, port = smtp_server
+    transport = make_transport(port)
+    transport.send(message("a@example.com"))
+    transport.send(message("b@example.com"))
+    assert len(handler.received) == 2
+    assert transport.stats()["connections_opened"] == 1
+    transport.close()
+
+def test_recipient_refused_is_not_retried(smtp_server):
+    handler, port = smtp_server
+    transport = make_transport(port)
+    transport.send(message("a@example.com"))
+
+    with pytest.raises(smtplib.SMTPRecipientsRefused):
+        transport.send(message("refused@example.com"))
+
+    # 5xx 는 재연결/재발송하지 않고, 기존 연결은 계속 사용
+    stats = transport.stats()
+    assert stats["reconnects"] == 0
+    assert stats["connections_opened"] == 1
+    transport.send(message("c@example.com"))
+    assert transport.stats()["connections_opened"] == 1
+    transport.close()
+
+def test_data_rejected_is_not_retried(smtp_server):
+    handler, port = smtp_server
+    transport = make_transport(port)
+
+    with pytest.raises(smtplib.SMTPDataError):
+        transport.send(message("reject-data@example.com"))
+
+    stats = transport.stats()
+    assert stats["reconnects"] == 0
+    assert stats["connections_opened"] == 1
+    assert handler.received == []
+    transport.close()
+
+def test_reconnects_after_server_disconnect(smtp_server):
+    handler, port = smtp_server
+    transport = make_transport(port)
+    transport.send(message("a@example.com"))
+
+    # 유휴 연결을 닫아 끊어진 연결을 흉내 (SMTPServerDisconnected)
+    conn, _ = transport._idle[0]
+    conn.close()
+    transport.send(message("b@example.com"))
+
+    stats = transport.stats()
+    assert stats["reconnects"] == 1
+    assert stats["connections_opened"] == 2
+    assert len(handler.received) == 2
+    transport.close()
+
+def test_timeout_after_data_is_not_resent(smtp_server):
+    handler, port = smtp_server
+    transport = make_transport(port, timeout=0.3)
+
+    # DATA 이후 타임아웃: 서버가 이미 받았을 수 있으므로 재발송하지 않음
+    with pytest.raises(smtplib.SMTPServerDisconnected):
+        transport.send(message("slow@example.com"))
+
+    stats = transport.stats()
+    assert stats["reconnects"] == 0
+    assert stats["connections_opened"] == 1
+    assert len(handler.received) == 1
+    transport.close()
@@ -0,0 +1,113 @@
+import json
+import asyncio
+import pytest
+from service import memo_events as events
+from service.memo_events import MemoEventBroker, RedisBackend, RESYNC_EVENT
+
+pytestmark = pytest.mark.anyio
+
+
+# redis.asyncio Pub/Sub 대역: 채널 메시지를 큐로 전달하고, 연결 끊김과 구독 실패를 흉내 냄
+class FakePubSub:
+    def __init__(self, redis):
+        self.redis = redis
+        self.queue = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        if self.redis.subscribe_failures:
+            self.redis.subscribe_failures -= 1
+            raise ConnectionError("redis unavailable")
+        self.redis.subscribers.append(self)
+
+    async def listen(self):
+        while True:
+            item = await self.queue.get()
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    async def aclose(self):
+        if self in self.redis.subscribers:
+            self.redis.subscribers.remove(self)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.subscribers = []
+        self.subscribe_failures = 0
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+    async def publish(self, channel, data):
+        for pubsub in self.subscribers:
+            pubsub.queue.put_nowait({"type": "message", "data": data})
+
+    def disconnect(self):
+        for pubsub in list(self.subscribers):
+            pubsub.queue.put_nowait(ConnectionError("connection reset"))
+
+    async def aclose(self):
+        pass
+
+
+async def wait_for(condition):
+    for _ in range(200):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("timed out")
+
+
+@pytest.fixture
+async def broker(monkeypatch):
+    monkeypatch.setattr(events, "MEMO_EVENTS_RECONNECT_BASE", 0.01)
+    redis = FakeRedis()
+    broker = MemoEventBroker(RedisBackend(redis))
+    await broker.start()
+    yield broker, redis
+    await broker.close()
+
+
+async def test_delivers_published_messages(broker):
+    broker, redis = broker
+    async with broker.subscribe(1) as queue:
+        await broker.publish_resync(1)
+        assert await asyncio.wait_for(queue.get(), 1) == RESYNC_EVENT
+
+
+async def test_resubscribes_and_resyncs_after_disconnect(broker):
+    broker, redis = broker
+    async with broker.subscribe(1) as first, broker.subscribe(2) as second:
+        redis.subscribe_failures = 2  # 두 번 실패 후 재구독
+        redis.disconnect()
+        await wait_for(lambda: broker.backend.reconnects == 1)
+
+        # 끊긴 동안 놓친 알림이 있을 수 있으므로 모든 구독자에게 resync
+        assert first.get_nowait() == RESYNC_EVENT
+        assert second.get_nowait() == RESYNC_EVENT
+
+        # 재연결 후 발행한 알림은 정상 전달
+        await redis.publish("memo-events", json.dumps({"user_id": 1, "message": "after"}))
+        assert await asyncio.wait_for(first.get(), 1) == "after"
+        assert broker.stats()["reconnects"] == 1
+
+
+async def test_replay_after_subscribe_skips_duplicates():
+    broker = MemoEventBroker(events.MemoryBackend())
+    await broker.start()
+    memo = lambda seq: events.format_event("memo", "{}", seq)
+
+    async def replay():
+        # 구독 후 조회 전에 커밋된 변경: 조회 결과와 실시간 알림 양쪽에 포함
+        await broker.backend.publish(1, memo(5))
+        return [memo(4), memo(5)]
+
+    stream = broker.stream(1, replay)
+    received = [await stream.__anext__() for _ in range(3)]
+    await broker.backend.publish(1, memo(6))
+    received.append(await asyncio.wait_for(stream.__anext__(), 1))
+    await stream.aclose()
+
+    assert received[1:] == [memo(4), memo(5), memo(6)]
+    assert broker.stats()["connections"] == 0
@@ -0,0 +1,115 @@
+import gzip
+import json
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select, func
+from models import User, Memo
+from service import memo_import
+from service.memo_import import read_lines, import_memos
+
+pytestmark = pytest.mark.anyio
+
+
+async def stream(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+async def collect(lines):
+    return [line async for line in lines]
+
+
+def ndjson(count, content="내용"):
+    return "".join(json.dumps({"title": f"t{i}", "content": content}, ensure_ascii=False) + "\n" for i in range(count)).encode()
+
+
+async def test_reads_lines_across_chunks():
+    body = "﻿a\r\nb".encode() + "\nc".encode()
+    assert await collect(read_lines(stream(body[:3], body[3:7], body[7:]))) == [(1, "a"), (2, "b"), (3, "c")]
+
+
+async def test_reads_gzip_in_bounded_steps(monkeypatch):
+    monkeypatch.setattr(memo_import, "DECOMPRESS_STEP", 16)
+    body = ndjson(50)
+    lines = await collect(read_lines(stream(gzip.compress(body)), gzipped=True))
+    assert len(lines) == 50
+    assert json.loads(lines[-1][1])["title"] == "t49"
+
+
+async def test_rejects_long_line(monkeypatch):
+    monkeypatch.setattr(memo_import, "IMPORT_MAX_LINE_LENGTH", 100)
+    with pytest.raises(HTTPException) as e:
+        await collect(read_lines(stream(b"x" * 60, b"x" * 60)))
+    assert e.value.status_code == 413
+
+
+async def test_rejects_long_csv_record(monkeypatch):
+    monkeypatch.setattr(memo_import, "IMPORT_MAX_LINE_LENGTH", 100)
+    body = b'title,content\nt,"' + b"x\n" * 60
+    with pytest.raises(HTTPException) as e:
+        await collect(memo_import.parse_csv(read_lines(stream(body))))
+    assert e.value.status_code == 413
+
+
+async def test_rejects_gzip_bomb(monkeypatch):
+    monkeypatch.setattr(memo_import, "IMPORT_MAX_BYTES", 1024 * 1024)
+    bomb = gzip.compress(b"\n" * (16 * 1024 * 1024))  # 약 16KB 가 16MB 로 풀림
+    seen = 0
+    with pytest.raises(HTTPException) as e:
+        async for data in memo_import.read_body(stream(bomb), gzipped=True):
+            assert len(data) <= memo_import.DECOMPRESS_STEP
+            seen += len(data)
+    assert e.value.status_code == 413
+    assert seen <= 1024 * 1024
+
+
+async def test_import_row_limit(session_factory, monkeypatch):
+    monkeypatch.setattr(memo_import, "IMPORT_MAX_ROWS", 3)
+    async with session_factory() as db:
+        user = User(username="importer", email="importer@example.com")
+        db.add(user)
+        await db.commit()
+        user_id = user.id
+
+        result = await import_memos(db, user_id, stream(ndjson(3)), "ndjson", chunk_size=2)
+        assert result.imported == 3
+        await db.commit()
+
+        with pytest.raises(HTTPException) as e:
+            await import_memos(db, user_id, stream(ndjson(4)), "ndjson", chunk_size=2)
+        assert e.value.status_code == 413
+        await db.rollback()
+        assert await db.scalar(select(func.count()).select_from(Memo).where(Memo.user_id == user_id)) == 3
+
+
+async def test_upload_is_read_before_any_write(session_factory, monkeypatch):
+    # 느린 업로드를 읽는 동안에는 사용자 행을 잠그는 저장(변경 번호 예약)을 시작하지 않음
+    finished = False
+    writes = []
+
+    async def upload():
+        nonlocal finished
+        body = ndjson(5)
+        for i in range(0, len(body), 20):
+            yield body[i:i + 20]
+        finished = True
+
+    insert_chunk = memo_import.insert_chunk
+
+    async def tracking_insert_chunk(db, user_id, memos):
+        writes.append(finished)
+        await insert_chunk(db, user_id, memos)
+
+    monkeypatch.setattr(memo_import, "insert_chunk", tracking_insert_chunk)
+    monkeypatch.setattr(memo_import, "IMPORT_SPOOL_MEMORY", 10)  # 임시 파일 사용
+    async with session_factory() as db:
+        user = User(username="slow", email="slow@example.com")
+        db.add(user)
+        await db.commit()
+
+        result = await import_memos(db, user.id, upload(), "ndjson", chunk_size=2)
+        await db.commit()
+        assert result.imported == 5
+        assert writes == [True, True, True]
+        titles = (await db.scalars(select(Memo.title).where(Memo.user_id == user.id).order_by(Memo.id))).all()
+        assert titles == [f"t{i}" for i in range(5)]
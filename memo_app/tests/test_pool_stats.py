@@ -0,0 +1,25 @@
+import sqlite3
+import pytest
+from sqlalchemy import exc
+from database import TimedQueuePool
+
+
+def test_counts_only_pool_timeouts():
+    stats = TimedQueuePool.stats
+    timeouts = stats.timeouts
+
+    pool = TimedQueuePool(lambda: sqlite3.connect(":memory:"), pool_size=1, max_overflow=0, timeout=0.01)
+    conn = pool.connect()
+    with pytest.raises(exc.TimeoutError):
+        pool.connect()
+    conn.close()
+    assert stats.timeouts == timeouts + 1
+
+    # DB 연결 실패는 풀 대기 시간 초과로 집계하지 않음
+    def refuse():
+        raise sqlite3.OperationalError("connection refused")
+
+    broken = TimedQueuePool(refuse, pool_size=1, max_overflow=0, timeout=0.01)
+    with pytest.raises(sqlite3.OperationalError):
+        broken.connect()
+    assert stats.timeouts == timeouts + 1
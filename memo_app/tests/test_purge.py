@@ -0,0 +1,98 @@
+from datetime import timedelta
+import pytest
+from sqlalchemy import select, func
+from models import User, Memo, utcnow
+from service import purge
+from service.purge import purge_user, purge_users, restore_deleted_user
+
+pytestmark = pytest.mark.anyio
+
+EXPIRED = timedelta(days=purge.DELETE_RETENTION_DAYS + 1)
+
+
+async def add_user(db, username, deleted_at, memos=3):
+    user = User(username=username, email=f"{username}@example.com", deleted_at=deleted_at)
+    db.add(user)
+    await db.flush()
+    db.add_all(Memo(user_id=user.id, title=f"t{i}", content="c") for i in range(memos))
+    await db.commit()
+    return user.id
+
+
+async def memo_count(db, user_id):
+    return await db.scalar(select(func.count()).select_from(Memo).where(Memo.user_id == user_id))
+
+
+async def test_purges_expired_user_and_memos(session_factory):
+    async with session_factory() as db:
+        expired = await add_user(db, "expired", utcnow() - EXPIRED)
+        recent = await add_user(db, "recent", utcnow())
+
+        assert await purge_users(db, pause=0) == 1
+        assert await db.get(User, expired) is None
+        assert await memo_count(db, expired) == 0
+        assert await memo_count(db, recent) == 3
+
+
+async def test_user_restored_after_selection_is_not_purged(session_factory):
+    async with session_factory() as db:
+        user_id = await add_user(db, "alice", utcnow() - EXPIRED)
+
+    # 워커가 ID 를 조회한 뒤, 삭제 전에 다른 세션에서 복구
+    async with session_factory() as other:
+        await other.execute(User.__table__.update().where(User.id == user_id).values(deleted_at=None))
+        await other.commit()
+
+    async with session_factory() as db:
+        assert await purge_user(db, user_id) is False
+        assert (await db.get(User, user_id)).deleted_at is None
+        assert await memo_count(db, user_id) == 3
+
+
+async def test_restore_after_purge_finds_nothing(session_factory):
+    async with session_factory() as db:
+        user_id = await add_user(db, "bob", utcnow() - EXPIRED)
+        assert await purge_user(db, user_id) is True
+
+        assert await restore_deleted_user(db, user_id) is False
+        await db.commit()
+        assert await memo_count(db, user_id) == 0
+
+
+async def test_expired_user_cannot_be_restored(session_factory):
+    async with session_factory() as db:
+        user_id = await add_user(db, "carol", utcnow() - EXPIRED)
+        assert await restore_deleted_user(db, user_id) is False
+
+
+async def test_purges_memos_in_chunks(session_factory):
+    async with session_factory() as db:
+        user_id = await add_user(db, "erin", utcnow() - EXPIRED, memos=5)
+        assert await purge_user(db, user_id, chunk_size=2) is True
+        assert await db.get(User, user_id) is None
+        assert await memo_count(db, user_id) == 0
+
+
+async def test_failed_purge_keeps_user_for_next_run(session_factory, monkeypatch):
+    async with session_factory() as db:
+        user_id = await add_user(db, "dave", utcnow() - EXPIRED, memos=5)
+
+        # 메모 청크 삭제 후 사용자 삭제 단계에서 실패
+        scalar = db.scalar
+
+        async def failing_scalar(statement, *args, **kwargs):
+            if statement.is_delete and statement.table.name == User.__tablename__:
+                raise RuntimeError("connection lost")
+            return await scalar(statement, *args, **kwargs)
+
+        monkeypatch.setattr(db, "scalar", failing_scalar)
+        with pytest.raises(RuntimeError):
+            await purge_user(db, user_id, chunk_size=2)
+
+    # 커밋한 청크만 삭제되고 마지막 청크와 사용자 행은 남음, 다음 실행에서 나머지 삭제
+    async with session_factory() as db:
+        assert await db.get(User, user_id) is not None
+        assert await memo_count(db, user_id) == 1
+        assert await restore_deleted_user(db, user_id) is False
+        assert await purge_user(db, user_id, chunk_size=2) is True
+        assert await memo_count(db, user_id) == 0
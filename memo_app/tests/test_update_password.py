@@ -0,0 +1,34 @@
+import pytest
+from models import User
+from service import email_service
+from service.email_service import update_user_password
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def hashed(monkeypatch):
+    calls = []
+
+    async def fake_hash(password):
+        calls.append(password)
+        return "hashed:" + password
+
+    monkeypatch.setattr(email_service.password_hasher, "hash", fake_hash)
+    return calls
+
+
+async def test_unknown_user_is_not_hashed(session_factory, hashed):
+    async with session_factory() as db:
+        assert await update_user_password(db, "temp", User.username == "nobody", User.email == "nobody@example.com") is None
+    assert hashed == []
+
+
+async def test_matching_user_is_updated(session_factory, hashed):
+    async with session_factory() as db:
+        db.add(User(username="frank", email="frank@example.com"))
+        await db.commit()
+
+        user = await update_user_password(db, "temp", User.username == "frank", User.email == "frank@example.com")
+        assert user.hashed_password == "hashed:temp"
+    assert hashed == ["temp"]
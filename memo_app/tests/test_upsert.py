@@ -0,0 +1,47 @@
+import pytest
+from sqlalchemy import select, func
+from sqlalchemy.exc import IntegrityError
+from models import User
+from service import upsert
+from service.upsert import insert_if_absent, insert_or_update
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_insert_if_absent(session_factory):
+    async with session_factory() as db:
+        values = {"username": "alice", "email": "alice@example.com"}
+        user_id = await insert_if_absent(db, User, values, index_elements=[User.username], returning=User.id)
+        assert user_id is not None
+
+        again = await insert_if_absent(db, User, {**values, "email": "other@example.com"}, index_elements=[User.username], returning=User.id)
+        assert again is None
+
+        # username 외의 유일 제약 위반은 그대로 발생
+        with pytest.raises(IntegrityError):
+            await insert_if_absent(db, User, {"username": "bob", "email": "alice@example.com"}, index_elements=[User.username], returning=User.id)
+        await db.rollback()
+
+
+async def test_insert_or_update(session_factory):
+    async with session_factory() as db:
+        values = {"username": "erin", "email": "erin@example.com", "google_id": "g-1"}
+        created = await insert_or_update(db, User, values, index_elements=[User.email], set_={"google_id": "g-1"}, returning=User)
+        assert created.google_id == "g-1"
+
+        linked = await insert_or_update(
+            db, User, {"username": None, "email": "erin@example.com", "kakao_id": "k-1"},
+            index_elements=[User.email], set_={"kakao_id": "k-1"}, returning=User,
+        )
+        assert linked.id == created.id
+        await db.commit()
+
+        user = (await db.scalars(select(User).execution_options(populate_existing=True))).one()
+        assert (user.username, user.google_id, user.kakao_id) == ("erin", "g-1", "k-1")
+
+
+async def test_unsupported_dialect_fails_clearly(session_factory, monkeypatch):
+    monkeypatch.setattr(upsert, "INSERT_BY_DIALECT", {})
+    async with session_factory() as db:
+        with pytest.raises(RuntimeError):
+            await insert_if_absent(db, User, {"username": "gina", "email": "gina@example.com"}, index_elements=[User.username], returning=User.id)